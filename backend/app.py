@@ -16,8 +16,11 @@ import os
 import sys
 from flask import Flask
 from whitenoise import WhiteNoise
-from config import DEBUG
+from config import DEBUG, DB_REQUEST_STATS, MODEL_BUNDLE_EXPORT_ON_BOOT
+from db.request_scope import init_request_scope
+from db.request_stats import init_request_stats
 from routes import register_blueprints
+from services.predictions_service import PredictionsService
 
 # Configuración de logging
 logging.basicConfig(
@@ -62,6 +65,19 @@ if not IS_DEVELOPMENT:
 # Registrar blueprints (rutas)
 register_blueprints(app)
 
+# Round trips, filas y tiempo de BD por request (Server-Timing + log); antes que
+# init_request_scope para que el commit final quede contabilizado
+if DB_REQUEST_STATS:
+    init_request_stats(app)
+
+# Una conexión y una transacción por request, compartidas por los servicios
+init_request_scope(app)
+
+# Exportar el bundle del modelo en el master (gunicorn --preload) antes de forkear:
+# los workers lo abren con mmap y comparten sus páginas
+if MODEL_BUNDLE_EXPORT_ON_BOOT:
+    PredictionsService.ensure_model_bundle()
+
 # Handlers para errores
 @app.errorhandler(404)
 def not_found(error):
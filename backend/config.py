@@ -12,12 +12,46 @@ DEBUG = os.environ.get('FLASK_ENV') != 'production'
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-key-not-for-production')
 
 # Database
+# Backend de los servicios: oracle (Autonomous DB) o sqlite (archivo local en DATABASE_PATH)
+DB_BACKEND = os.environ.get('DB_BACKEND', 'oracle').lower()
 DATABASE_PATH = os.environ.get('DATABASE_PATH', 'vocational_test.db')
+# SQLite: espera máxima por el lock de escritura antes de fallar con "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
 
 # Oracle Autonomous DB
 ORACLE_USER = os.environ.get('ORACLE_USER', 'ADMIN')
 ORACLE_PASSWORD = os.environ.get('ORACLE_PASSWORD', '')
 ORACLE_CONNECTION_STRING = os.environ.get('ORACLE_CONNECTION_STRING', '')
+# Pool de conexiones (uno por worker de gunicorn): tamaño y crecimiento
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', '2'))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', '10'))
+DB_POOL_INCREMENT = int(os.environ.get('DB_POOL_INCREMENT', '1'))
+# Pool lleno: wait (esperar), timedwait (esperar DB_POOL_WAIT_TIMEOUT_MS), nowait (error) o forceget (abrir igual)
+DB_POOL_GETMODE = os.environ.get('DB_POOL_GETMODE', 'timedwait').lower()
+DB_POOL_WAIT_TIMEOUT_MS = int(os.environ.get('DB_POOL_WAIT_TIMEOUT_MS', '5000'))
+# Segundos que una conexión libre puede quedar abierta por encima de DB_POOL_MIN (0 = sin límite)
+DB_POOL_TIMEOUT_SECONDS = int(os.environ.get('DB_POOL_TIMEOUT_SECONDS', '300'))
+# Límites de espera contra Oracle: abrir una conexión nueva (s) y cada llamada a la BD (ms, 0 = sin límite)
+DB_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('DB_CONNECT_TIMEOUT_SECONDS', '5'))
+DB_CALL_TIMEOUT_MS = int(os.environ.get('DB_CALL_TIMEOUT_MS', '10000'))
+# Circuit breaker del pool: se abre si fallan >= DB_BREAKER_FAILURE_RATE de las últimas
+# DB_BREAKER_WINDOW llamadas (mínimo DB_BREAKER_MIN_CALLS) y prueba de nuevo tras DB_BREAKER_OPEN_SECONDS
+DB_BREAKER_ENABLED = os.environ.get('DB_BREAKER_ENABLED', 'true').lower() == 'true'
+DB_BREAKER_WINDOW = int(os.environ.get('DB_BREAKER_WINDOW', '20'))
+DB_BREAKER_MIN_CALLS = int(os.environ.get('DB_BREAKER_MIN_CALLS', '5'))
+DB_BREAKER_FAILURE_RATE = float(os.environ.get('DB_BREAKER_FAILURE_RATE', '0.5'))
+DB_BREAKER_OPEN_SECONDS = float(os.environ.get('DB_BREAKER_OPEN_SECONDS', '15'))
+# Datos de referencia cacheados (carreras, afirmaciones): se refrescan tras este TTL y,
+# si la BD no responde, se siguen sirviendo los últimos conocidos (0 = sin refresco)
+REFERENCE_CACHE_TTL_SECONDS = int(os.environ.get('REFERENCE_CACHE_TTL_SECONDS', '3600'))
+# Sentencias preparadas en cache por conexión
+DB_STMT_CACHE_SIZE = int(os.environ.get('DB_STMT_CACHE_SIZE', '50'))
+# Una conexión y una transacción por request HTTP, compartidas por los servicios (commit al final)
+DB_REQUEST_SCOPE = os.environ.get('DB_REQUEST_SCOPE', 'true').lower() == 'true'
+# Round trips, filas y tiempo de BD por request: header Server-Timing y una línea de log por request
+DB_REQUEST_STATS = os.environ.get('DB_REQUEST_STATS', 'true').lower() == 'true'
+# Cada worker de gunicorn abre DB_POOL_MIN conexiones y carga los caches de referencia antes de atender
+WORKER_WARMUP_ENABLED = os.environ.get('WORKER_WARMUP_ENABLED', 'true').lower() == 'true'
 
 # Oracle Cloud Infrastructure (OCI) Object Storage
 OCI_PREAUTH_URL = os.environ.get('OCI_PREAUTH_URL_WRITE', os.environ.get('OCI_PREAUTH_URL', ''))
@@ -27,6 +61,57 @@ OCI_PREAUTH_URL_READ = os.environ.get('OCI_PREAUTH_URL_READ', '')
 # Carrera default schema en Oracle
 ORACLE_SCHEMA = 'ALEJO'
 
+# Administradores: correos (separados por coma) con acceso a endpoints restringidos
+ADMIN_EMAILS = frozenset(
+    email.strip().lower()
+    for email in os.environ.get('ADMIN_EMAILS', '').split(',')
+    if email.strip()
+)
+
+# Predicciones
+PREDICTION_BATCH_MAX_USERS = int(os.environ.get('PREDICTION_BATCH_MAX_USERS', '1000'))
+PREDICTION_CACHE_MAX_BYTES = int(os.environ.get('PREDICTION_CACHE_MAX_BYTES', str(8 * 1024 * 1024)))
+PREDICTION_CACHE_ROUND_DECIMALS = 3
+PREDICTION_PROFILE_CACHE_MAX_USERS = int(os.environ.get('PREDICTION_PROFILE_CACHE_MAX_USERS', '5000'))
+PREDICTION_PROFILE_CACHE_TTL_SECONDS = int(os.environ.get('PREDICTION_PROFILE_CACHE_TTL_SECONDS', '300'))
+# Antigüedad máxima del índice MATCH_OCUPACION_CARRERA en memoria (0 = sin recarga automática)
+MATCH_INDEX_MAX_AGE_SECONDS = int(os.environ.get('MATCH_INDEX_MAX_AGE_SECONDS', '3600'))
+# Backend de vecinos más cercanos: auto, exact, holland, balltree o lsh (ver services/ann_backends.py)
+PREDICTION_BACKEND = os.environ.get('PREDICTION_BACKEND', 'auto').lower()
+# Random projection LSH: tablas y bits (hiperplanos) por tabla
+LSH_TABLES = int(os.environ.get('LSH_TABLES', '10'))
+LSH_BITS = int(os.environ.get('LSH_BITS', '18'))
+# Índice Holland (backend auto): se usa desde esta cantidad de ocupaciones (0 = desactivado)
+HOLLAND_INDEX_MIN_OCCUPATIONS = int(os.environ.get('HOLLAND_INDEX_MIN_OCCUPATIONS', '20000'))
+# Letras del código Holland que un candidato debe compartir con el usuario (1-3)
+HOLLAND_MIN_SHARED = int(os.environ.get('HOLLAND_MIN_SHARED', '2'))
+# Con menos candidatos se recorre el modelo completo
+HOLLAND_MIN_CANDIDATES = int(os.environ.get('HOLLAND_MIN_CANDIDATES', '200'))
+# Puntaje de ocupaciones: pesos de cosine, euclidean y holland (ver services/ensemble_scoring.py)
+PREDICTION_SCORING = os.environ.get('PREDICTION_SCORING', 'cosine=1')
+# Prueba A/B: regla alternativa y porcentaje de usuarios que la reciben (0 = desactivada)
+PREDICTION_SCORING_B = os.environ.get('PREDICTION_SCORING_B', '')
+PREDICTION_SCORING_B_PERCENT = int(os.environ.get('PREDICTION_SCORING_B_PERCENT', '0'))
+# Test adaptativo: tamaño del top que debe estabilizarse y respuestas mínimas antes de cortar
+ADAPTIVE_TEST_TOP_K = int(os.environ.get('ADAPTIVE_TEST_TOP_K', '3'))
+ADAPTIVE_TEST_MIN_ANSWERS = int(os.environ.get('ADAPTIVE_TEST_MIN_ANSWERS', '12'))
+# Respuestas pendientes plausibles: ±spread del promedio ya respondido en la categoría (0 = rango 1-5)
+ADAPTIVE_TEST_ANSWER_SPREAD = float(os.environ.get('ADAPTIVE_TEST_ANSWER_SPREAD', '1.0'))
+# Simulación what-if: máximo de variantes del perfil por request
+WHAT_IF_MAX_VARIANTS = int(os.environ.get('WHAT_IF_MAX_VARIANTS', '400'))
+
+# Bundle del modelo en disco (mmap compartido entre workers de gunicorn)
+MODEL_BUNDLE_ENABLED = os.environ.get('MODEL_BUNDLE_ENABLED', 'true').lower() == 'true'
+MODEL_BUNDLE_DIR = os.environ.get(
+    'MODEL_BUNDLE_DIR',
+    str(Path(DATABASE_PATH).resolve().parent / 'model_bundle')
+)
+# Exportar el bundle desde Oracle al arrancar el master (antes de forkear workers)
+MODEL_BUNDLE_EXPORT_ON_BOOT = os.environ.get('MODEL_BUNDLE_EXPORT_ON_BOOT', 'false').lower() == 'true'
+MODEL_BUNDLE_MAX_AGE_SECONDS = int(os.environ.get('MODEL_BUNDLE_MAX_AGE_SECONDS', '86400'))
+# Cada cuánto un worker verifica si hay un bundle nuevo publicado o el índice de carreras venció
+MODEL_RELOAD_CHECK_SECONDS = int(os.environ.get('MODEL_RELOAD_CHECK_SECONDS', '30'))
+
 # App settings
 ADVISORY_START_HOUR = 9
 ADVISORY_END_HOUR = 17
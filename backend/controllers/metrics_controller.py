@@ -0,0 +1,51 @@
+"""
+Controlador de métricas operativas
+Expone endpoint /api/metrics (solo administradores)
+"""
+import logging
+from flask import jsonify, session
+from db.db_config import pool_metrics
+from services.warmup import last_warmup
+from utils.auth import is_admin
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsController:
+    """Controlador de métricas del proceso"""
+
+    @staticmethod
+    def get_metrics():
+        """
+        Endpoint GET /api/metrics (solo administradores)
+        Histogramas del pool de conexiones Oracle del worker que atiende el
+        request: espera en acquire(), tiempo con la conexión tomada y
+        conexiones ocupadas/abiertas en cada acquire(). Cada worker de
+        gunicorn tiene su propio pool y sus propias métricas (campo 'pid').
+        'warmup': tiempos del calentamiento al iniciar ese worker (o None).
+        """
+        try:
+            if 'usuario' not in session:
+                return jsonify({
+                    'success': False,
+                    'message': 'Usuario no autenticado'
+                }), 401
+
+            if not is_admin(session['usuario']):
+                return jsonify({
+                    'success': False,
+                    'message': 'Acceso restringido a administradores'
+                }), 403
+
+            return jsonify({
+                'success': True,
+                'db_pool': pool_metrics(),
+                'warmup': last_warmup()
+            }), 200
+
+        except Exception as e:
+            logger.error(f"Error obteniendo métricas: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': 'Error obteniendo métricas'
+            }), 500
@@ -3,9 +3,13 @@ Controlador para predicciones de carreras
 Expone endpoint /api/predict-careers
 """
 import logging
-from flask import request, jsonify, session
+import uuid
+from flask import Response, request, jsonify, session
+from config import PREDICTION_BATCH_MAX_USERS
+from services import what_if
 from services.predictions_service import PredictionsService
-from utils.errors import DatabaseError
+from utils.auth import is_admin
+from utils.errors import DatabaseError, ValidationError
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +32,16 @@ class PredictionsController:
                 'similarity': float
             },
             'suggested_careers': [list],
+            'ranked_careers_peru': [{'id', 'nombre', 'score', 'ocupaciones'}, ...],
+            'top_occupations': [{'id', 'name', 'similarity', 'score',
+                                 'scores': {'cosine', 'euclidean', 'holland'}, ...}, ...],
             'user_profile': {
                 'R': float,
                 'I': float,
                 ...
-            }
+            },
+            'model_version': str,
+            'scoring': {'rule': 'a' | 'b', 'weights': {...}}
         }
         """
         try:
@@ -52,8 +61,15 @@ class PredictionsController:
             
             logger.info(f"Predicción de carreras para usuario {usuario_id}")
             
+            # Revisión de respuestas de la sesión (cambia al guardar/resetear respuestas)
+            # Permite reutilizar el perfil cacheado en recargas de /predicciones
+            answers_rev = session.get('answers_rev')
+            if not answers_rev:
+                answers_rev = uuid.uuid4().hex
+                session['answers_rev'] = answers_rev
+            
             # Realizar predicción
-            result = PredictionsService.predict_careers(usuario_id)
+            result = PredictionsService.predict_careers(usuario_id, answers_rev=answers_rev)
             
             if result['success']:
                 return jsonify(result), 200
@@ -74,21 +90,326 @@ class PredictionsController:
             }), 500
 
     @staticmethod
-    def get_occupations():
+    def predict_careers_anonymous():
         """
-        Endpoint GET /api/occupations
-        Retorna todas las ocupaciones con sus posibles carreras
-        desde MODELO_CONVERSIONES
+        Endpoint POST /api/predict-careers/anonymous
+        Predicción sin sesión a partir de las respuestas del test completo
+        (kioscos de ferias vocacionales): se calcula en memoria con el modelo
+        cacheado y no se guarda nada en la BD
+        
+        Body:
+        {
+            "answers": [
+                {"afirmacion_id": 1, "riasec_id": 5},
+                {"afirmacion_id": 2, "riasec_id": 4},
+                ...
+            ]
+        }
+        
+        Retorna: la misma respuesta que /api/predict-careers
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            answers = data.get('answers')
+            
+            if not isinstance(answers, list) or not answers:
+                return jsonify({
+                    'success': False,
+                    'message': 'Se requiere la lista de respuestas del test'
+                }), 400
+            
+            # Validar estructura de respuestas
+            for answer in answers:
+                if not isinstance(answer, dict) or 'afirmacion_id' not in answer or 'riasec_id' not in answer:
+                    return jsonify({
+                        'success': False,
+                        'message': 'Estructura inválida: se requieren afirmacion_id y riasec_id'
+                    }), 400
+                
+                # Validar que riasec_id sea entre 1 y 5
+                if not isinstance(answer['riasec_id'], int) or answer['riasec_id'] < 1 or answer['riasec_id'] > 5:
+                    return jsonify({
+                        'success': False,
+                        'message': 'El puntaje RIASEC debe estar entre 1 y 5'
+                    }), 400
+            
+            result = PredictionsService.predict_from_answers(answers)
+            
+            if result['success']:
+                return jsonify(result), 200
+            else:
+                return jsonify(result), 500
+                
+        except ValidationError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        except Exception as e:
+            logger.error(f"Error inesperado en predict_careers_anonymous: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': 'Error inesperado'
+            }), 500
+
+    @staticmethod
+    def predict_careers_batch():
+        """
+        Endpoint POST /api/predict-careers/batch (solo administradores)
+        Predice carreras para un lote de usuarios (p.ej. una promoción escolar)
+        en una sola pasada
+        
+        Body:
+        {
+            "usuario_ids": [12, 15, 31, ...]
+        }
+        
+        Retorna:
+        {
+            'success': bool,
+            'total': int,
+            'results': [ {usuario_id, occupation, top_occupations, ...}, ... ],
+            'missing': [IDs sin respuestas guardadas]
+        }
+        """
+        try:
+            if 'usuario' not in session:
+                return jsonify({
+                    'success': False,
+                    'message': 'Usuario no autenticado'
+                }), 401
+            
+            if not is_admin(session['usuario']):
+                return jsonify({
+                    'success': False,
+                    'message': 'Acceso restringido a administradores'
+                }), 403
+            
+            data = request.get_json(silent=True) or {}
+            usuario_ids = data.get('usuario_ids')
+            
+            if not isinstance(usuario_ids, list) or not usuario_ids:
+                return jsonify({
+                    'success': False,
+                    'message': 'Se requiere una lista no vacía de usuario_ids'
+                }), 400
+            
+            if not all(isinstance(uid, int) and not isinstance(uid, bool) for uid in usuario_ids):
+                return jsonify({
+                    'success': False,
+                    'message': 'Los usuario_ids deben ser enteros'
+                }), 400
+            
+            # Quitar duplicados conservando el orden
+            usuario_ids = list(dict.fromkeys(usuario_ids))
+            
+            if len(usuario_ids) > PREDICTION_BATCH_MAX_USERS:
+                return jsonify({
+                    'success': False,
+                    'message': f'Máximo {PREDICTION_BATCH_MAX_USERS} usuarios por lote'
+                }), 400
+            
+            logger.info(f"Predicción en lote para {len(usuario_ids)} usuarios")
+            
+            result = PredictionsService.predict_careers_batch(usuario_ids)
+            
+            if result['success']:
+                return jsonify(result), 200
+            else:
+                return jsonify(result), 500
+                
+        except Exception as e:
+            logger.error(f"Error inesperado en predict_careers_batch: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': 'Error inesperado'
+            }), 500
+
+    @staticmethod
+    def predict_what_if():
+        """
+        Endpoint POST /api/predict-careers/what-if
+        Simula cómo cambia el top de ocupaciones al variar el perfil RIASEC
+        (todas las variantes en una sola pasada sobre el modelo)
+        
+        Body:
+        {
+            "profile": {"R": 3.5, "I": 4, ...},        (opcional; por defecto el perfil guardado)
+            "usuario_id": 12,                           (opcional, solo administradores)
+            "perturbations": [{"S": 1}, {"A": -0.5}],   (cambios relativos)
+            "grid": {"S": [1, 2, 3, 4, 5]}              (valores absolutos, hasta 2 dimensiones;
+                                                         también {"min": 1, "max": 5, "step": 0.5})
+        }
+        
+        Retorna:
+        {
+            'success': bool,
+            'model_version': str,
+            'base': {'profile': {...}, 'top_occupations': [...]},
+            'variants': [ {changes, profile, top_occupations (con base_rank),
+                           entered, left, changed}, ... ]
+        }
         """
         try:
-            occupations = PredictionsService.get_all_occupations()
+            if 'usuario' not in session:
+                return jsonify({
+                    'success': False,
+                    'message': 'Usuario no autenticado'
+                }), 401
+            
+            data = request.get_json(silent=True) or {}
+            
+            if 'profile' in data:
+                base_profile = what_if.parse_profile(data['profile'])
+            else:
+                usuario_id = session['usuario'].get('id')
+                answers_rev = session.get('answers_rev')
+                if 'usuario_id' in data:
+                    # Consejeros: simular sobre el perfil guardado de un alumno
+                    if not is_admin(session['usuario']):
+                        return jsonify({
+                            'success': False,
+                            'message': 'Acceso restringido a administradores'
+                        }), 403
+                    usuario_id = data['usuario_id']
+                    answers_rev = None
+                    if not isinstance(usuario_id, int) or isinstance(usuario_id, bool):
+                        return jsonify({
+                            'success': False,
+                            'message': 'usuario_id debe ser entero'
+                        }), 400
+                base_profile = PredictionsService.get_user_code_profile(usuario_id, answers_rev)
+            
+            result = PredictionsService.predict_what_if(
+                base_profile,
+                perturbations=data.get('perturbations'),
+                grid=data.get('grid')
+            )
+            return jsonify(result), 200
+            
+        except ValidationError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        except DatabaseError as e:
+            logger.error(f"Error en predict_what_if: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': 'No se pudo obtener el perfil RIASEC del usuario'
+            }), 400
+        except Exception as e:
+            logger.error(f"Error inesperado en predict_what_if: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': 'Error inesperado'
+            }), 500
+
+    @staticmethod
+    def refresh_match_index():
+        """
+        Endpoint POST /api/predict-careers/refresh-index (solo administradores)
+        Recarga el índice en memoria de MATCH_OCUPACION_CARRERA sin reiniciar
+        el worker (los demás workers lo recargan al vencer MATCH_INDEX_MAX_AGE_SECONDS
+        o al tomar un bundle nuevo publicado con reload-model)
+        """
+        try:
+            if 'usuario' not in session:
+                return jsonify({
+                    'success': False,
+                    'message': 'Usuario no autenticado'
+                }), 401
+            
+            if not is_admin(session['usuario']):
+                return jsonify({
+                    'success': False,
+                    'message': 'Acceso restringido a administradores'
+                }), 403
+            
+            index = PredictionsService.refresh_match_index()
             
             return jsonify({
                 'success': True,
-                'total': len(occupations),
-                'occupations': occupations
+                'message': 'Índice de carreras recargado',
+                'version': index.version,
+                'occupations': len(index.occupation_ids),
+                'matches': len(index.career_pos)
             }), 200
             
+        except DatabaseError as e:
+            logger.error(f"Error recargando índice de carreras: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': 'Error recargando índice de carreras'
+            }), 500
+
+    @staticmethod
+    def reload_model():
+        """
+        Endpoint POST /api/predict-careers/reload-model (solo administradores)
+        Recarga el modelo de ocupaciones y el índice de carreras desde Oracle
+        en segundo plano y lo publica como bundle nuevo; los demás workers lo
+        toman en su siguiente verificación (MODEL_RELOAD_CHECK_SECONDS).
+        
+        Body opcional:
+        {
+            'wait': bool  # esperar a que termine la recarga
+        }
+        """
+        try:
+            if 'usuario' not in session:
+                return jsonify({
+                    'success': False,
+                    'message': 'Usuario no autenticado'
+                }), 401
+            
+            if not is_admin(session['usuario']):
+                return jsonify({
+                    'success': False,
+                    'message': 'Acceso restringido a administradores'
+                }), 403
+            
+            data = request.get_json(silent=True) or {}
+            status = PredictionsService.reload_model(wait=bool(data.get('wait')))
+            
+            if data.get('wait'):
+                message = 'Modelo recargado'
+            elif status['started']:
+                message = 'Recarga del modelo iniciada'
+            else:
+                message = 'Ya hay una recarga del modelo en curso'
+            
+            return jsonify({
+                'success': True,
+                'message': message,
+                **status
+            }), 200 if data.get('wait') else 202
+            
+        except DatabaseError as e:
+            logger.error(f"Error recargando el modelo: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': 'Error recargando el modelo'
+            }), 500
+
+    @staticmethod
+    def get_occupations():
+        """
+        Endpoint GET /api/occupations
+        Retorna todas las ocupaciones con sus posibles carreras
+        desde MODELO_CONVERSIONES.
+        El cuerpo JSON se serializa una vez por versión del modelo y se sirve
+        con ETag: si el cliente envía If-None-Match vigente responde 304.
+        """
+        try:
+            catalog = PredictionsService.get_occupation_catalog()
+            
+            response = Response(catalog.json_body, mimetype='application/json')
+            response.set_etag(catalog.etag)
+            # El navegador revalida siempre (barato: 304 sin cuerpo)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response.make_conditional(request)
+            
         except Exception as e:
             logger.error(f"Error en get_occupations: {str(e)}")
             return jsonify({
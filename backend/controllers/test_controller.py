@@ -3,7 +3,9 @@ Controlador para el test vocacional
 Procesa requests, valida datos y llama servicios
 """
 import logging
+import uuid
 from flask import request, jsonify, session
+from services.predictions_service import PredictionsService
 from services.test_service import TestService
 from utils.validators import validate_email, validate_name
 from utils.errors import ValidationError, DatabaseError
@@ -146,6 +148,9 @@ class TestController:
             # Borrar todas las respuestas
             TestService.reset_user_answers(usuario_id)
             
+            # Nueva revisión de respuestas: invalida el perfil cacheado en todos los workers
+            session['answers_rev'] = uuid.uuid4().hex
+            
             logger.info(f"Test reseteado para usuario {usuario_id}")
             
             return jsonify({
@@ -172,8 +177,13 @@ class TestController:
                 {"afirmacion_id": 1, "riasec_id": 5},
                 {"afirmacion_id": 2, "riasec_id": 4},
                 ...
-            ]
+            ],
+            "adaptive": true    (opcional: test adaptativo)
         }
+        
+        Con "adaptive" la respuesta incluye 'adaptive': {stop, answered, total,
+        stable, order_stable, top_occupations}; stop=true indica que el top de
+        ocupaciones ya no puede cambiar con las preguntas pendientes
         """
         try:
             # Verificar que el usuario esté logueado
@@ -216,12 +226,25 @@ class TestController:
             
             # Guardar respuestas
             try:
-                TestService.save_answers_batch(usuario_id, answers)
+                saved = TestService.save_answers_batch(usuario_id, answers)
                 
-                return jsonify({
+                # Nueva revisión de respuestas: invalida el perfil cacheado en todos los workers
+                session['answers_rev'] = uuid.uuid4().hex
+                
+                result = {
                     'success': True,
                     'message': f'{len(answers)} respuesta(s) guardada(s) exitosamente'
-                }), 200
+                }
+                
+                if data.get('adaptive') is True:
+                    # Las respuestas ya están guardadas: un error acá no debe fallar el guardado
+                    try:
+                        result['adaptive'] = PredictionsService.evaluate_early_stop(usuario_id, saved['totals'])
+                    except Exception as e:
+                        logger.warning(f"No se pudo evaluar el corte adaptativo: {str(e)}")
+                        result['adaptive'] = None
+                
+                return jsonify(result), 200
                 
             except DatabaseError as e:
                 logger.error(f"Error guardando respuestas: {str(e)}")
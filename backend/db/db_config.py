@@ -6,9 +6,36 @@ Usa el patrón oficial de oracledb con pool de conexiones
 
 import os
 import logging
+import threading
+import time
+from contextlib import ExitStack
 from pathlib import Path
 from dotenv import load_dotenv
+from flask import has_request_context
 import oracledb
+from config import (
+    DB_BACKEND,
+    DB_REQUEST_SCOPE,
+    DB_POOL_MIN,
+    DB_POOL_MAX,
+    DB_POOL_INCREMENT,
+    DB_POOL_GETMODE,
+    DB_POOL_WAIT_TIMEOUT_MS,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_STMT_CACHE_SIZE,
+    DB_CONNECT_TIMEOUT_SECONDS,
+    DB_CALL_TIMEOUT_MS,
+    DB_BREAKER_ENABLED,
+    DB_BREAKER_WINDOW,
+    DB_BREAKER_MIN_CALLS,
+    DB_BREAKER_FAILURE_RATE,
+    DB_BREAKER_OPEN_SECONDS
+)
+from db import queries
+from db.request_stats import instrument
+from utils.circuit_breaker import CircuitBreaker
+from utils.errors import DatabaseUnavailableError
+from utils.metrics import Counter, Histogram, LATENCY_BUCKETS_MS
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +50,48 @@ ORACLE_CONFIG = {
     'connection_string': os.environ.get('ORACLE_CONNECTION_STRING', ''),
 }
 
+POOL_GETMODES = {
+    'wait': oracledb.POOL_GETMODE_WAIT,
+    'timedwait': oracledb.POOL_GETMODE_TIMEDWAIT,
+    'nowait': oracledb.POOL_GETMODE_NOWAIT,
+    'forceget': oracledb.POOL_GETMODE_FORCEGET,
+}
+
 # Pool global (lazy initialization)
 _pool = None
+_pool_lock = threading.Lock()
+
+# Métricas del pool en este proceso: espera en acquire(), tiempo con la
+# conexión tomada y conexiones ocupadas/abiertas al momento de cada acquire()
+_acquire_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+_hold_ms = Histogram(LATENCY_BUCKETS_MS)
+_busy_at_acquire = Histogram(range(DB_POOL_MAX + 1))
+_opened_at_acquire = Histogram(range(DB_POOL_MAX + 1))
+_acquire_errors = Counter()
+
+# Con la BD caída o sin conexiones libres, OracleConnection falla de inmediato
+# (DatabaseUnavailableError) en lugar de bloquear cada thread hasta el timeout
+_breaker = CircuitBreaker(
+    'oracle',
+    window=DB_BREAKER_WINDOW,
+    min_calls=DB_BREAKER_MIN_CALLS,
+    failure_rate=DB_BREAKER_FAILURE_RATE,
+    open_seconds=DB_BREAKER_OPEN_SECONDS
+) if DB_BREAKER_ENABLED else None
+
+
+def _pool_getmode():
+    if DB_POOL_GETMODE not in POOL_GETMODES:
+        logger.warning(f"DB_POOL_GETMODE inválido '{DB_POOL_GETMODE}', usando 'wait' "
+                       f"(opciones: {', '.join(POOL_GETMODES)})")
+        return oracledb.POOL_GETMODE_WAIT
+    return POOL_GETMODES[DB_POOL_GETMODE]
 
 
 def _get_pool():
     """
     Obtiene o crea el pool de conexiones
-    Patrón oficial de oracledb
+    Patrón oficial de oracledb; tamaño, modo de espera y timeouts desde config.py
     """
     global _pool
     
@@ -40,26 +101,130 @@ def _get_pool():
     if not ORACLE_CONFIG['connection_string']:
         raise ValueError("ORACLE_CONNECTION_STRING no está configurada")
     
-    # Crear pool con parámetros optimizados (patrón oficial - thin mode)
-    _pool = oracledb.create_pool(
-        user=ORACLE_CONFIG['user'],
-        password=ORACLE_CONFIG['password'],
-        dsn=ORACLE_CONFIG['connection_string'],
-        min=2,           # Mínimo 2 conexiones en el pool
-        max=10,          # Máximo 10 conexiones
-        increment=1      # Agregar 1 conexión cuando sea necesario
-    )
+    with _pool_lock:
+        # Otro thread del worker pudo crearlo mientras se esperaba el lock
+        if _pool is not None:
+            return _pool
+        
+        # Crear pool (patrón oficial - thin mode)
+        _pool = oracledb.create_pool(
+            user=ORACLE_CONFIG['user'],
+            password=ORACLE_CONFIG['password'],
+            dsn=ORACLE_CONFIG['connection_string'],
+            min=DB_POOL_MIN,
+            max=DB_POOL_MAX,
+            increment=DB_POOL_INCREMENT,
+            getmode=_pool_getmode(),
+            wait_timeout=DB_POOL_WAIT_TIMEOUT_MS,
+            timeout=DB_POOL_TIMEOUT_SECONDS,
+            stmtcachesize=DB_STMT_CACHE_SIZE,
+            tcp_connect_timeout=DB_CONNECT_TIMEOUT_SECONDS
+        )
     
-    logger.info("✅ Pool de conexiones Oracle inicializado")
+    logger.info(f"✅ Pool de conexiones Oracle inicializado "
+                f"(min={DB_POOL_MIN}, max={DB_POOL_MAX}, getmode={DB_POOL_GETMODE})")
     return _pool
 
 
+def pool_metrics() -> dict:
+    """
+    Configuración, estado actual e histogramas del pool de este proceso
+
+    Returns:
+        dict con pid, config, pool (opened/busy actuales o None si aún no se
+        creó), breaker (estado del circuit breaker o None si está desactivado),
+        acquire_errors y los histogramas acquire_wait_ms, hold_ms,
+        busy_at_acquire y opened_at_acquire
+    """
+    pool = _pool
+    return {
+        'pid': os.getpid(),
+        'config': {
+            'min': DB_POOL_MIN,
+            'max': DB_POOL_MAX,
+            'increment': DB_POOL_INCREMENT,
+            'getmode': DB_POOL_GETMODE,
+            'wait_timeout_ms': DB_POOL_WAIT_TIMEOUT_MS,
+            'timeout_seconds': DB_POOL_TIMEOUT_SECONDS,
+            'stmtcachesize': DB_STMT_CACHE_SIZE,
+            'connect_timeout_seconds': DB_CONNECT_TIMEOUT_SECONDS,
+            'call_timeout_ms': DB_CALL_TIMEOUT_MS
+        },
+        'pool': {'opened': pool.opened, 'busy': pool.busy} if pool is not None else None,
+        'breaker': _breaker.snapshot() if _breaker is not None else None,
+        'acquire_errors': _acquire_errors.value,
+        'acquire_wait_ms': _acquire_wait_ms.snapshot(),
+        'hold_ms': _hold_ms.snapshot(),
+        'busy_at_acquire': _busy_at_acquire.snapshot(),
+        'opened_at_acquire': _opened_at_acquire.snapshot()
+    }
+
+
+def close_pool():
+    """
+    Cierra el pool de conexiones si existe.
+    Necesario antes de forkear workers (gunicorn --preload) si el master
+    usó la BD: las conexiones no deben compartirse entre procesos.
+    """
+    global _pool
+    
+    if _pool is None:
+        return
+    
+    try:
+        _pool.close(force=True)
+    except oracledb.Error as e:
+        logger.warning(f"Error cerrando pool de conexiones: {str(e)}")
+    finally:
+        _pool = None
+    
+    logger.info("Pool de conexiones Oracle cerrado")
+
+
+def warm_pool() -> int:
+    """
+    Abre las DB_POOL_MIN conexiones del pool de este proceso y verifica cada
+    una con un round trip (ping), antes de que llegue el primer request.
+    Se toman todas a la vez para que no se repita la misma conexión.
+    Con SQLite abre la conexión del thread (y aplica el esquema).
+
+    Returns:
+        conexiones verificadas
+    """
+    if DB_BACKEND == 'sqlite':
+        from db.sqlite_backend import SQLiteConnection
+        with SQLiteConnection() as conn:
+            with conn.cursor() as cursor:
+                queries.PING.execute(cursor).fetchone()
+        return 1
+
+    with ExitStack() as stack:
+        connections = [stack.enter_context(OracleConnection()) for _ in range(max(DB_POOL_MIN, 1))]
+        for conn in connections:
+            conn.ping()
+    return len(connections)
+
+
+def _connection_lost(conn, exc: BaseException) -> bool:
+    """Si el uso de la conexión falló por la BD (red, timeout, sesión muerta) y no por la sentencia"""
+    if isinstance(exc, (oracledb.OperationalError, oracledb.InterfaceError)):
+        return True
+    if isinstance(exc, oracledb.Error) and exc.args and getattr(exc.args[0], 'is_session_dead', False):
+        return True
+    is_healthy = getattr(conn, 'is_healthy', None)
+    return is_healthy is not None and not is_healthy()
+
+
 # Context manager para uso automático de conexión (patrón oficial)
 class OracleConnection:
     """
     Context manager para conexiones Oracle
     Usa el patrón oficial: pool.acquire() con context manager
     
+    Cada uso cuenta para el circuit breaker: falla si no se obtuvo conexión
+    o si se perdió durante el bloque; con el circuito abierto se lanza
+    DatabaseUnavailableError sin tocar el pool.
+    
     Uso:
         with OracleConnection() as conn:
             with conn.cursor() as cursor:
@@ -67,16 +232,76 @@ class OracleConnection:
     """
     
     def __enter__(self):
-        self.pool = _get_pool()
-        self.conn = self.pool.acquire()
+        self.conn = None
+        if _breaker is not None and not _breaker.allow():
+            raise DatabaseUnavailableError(
+                f"Base de datos no disponible (reintento en {_breaker.retry_in():.0f}s)"
+            )
+        started = time.perf_counter()
+        try:
+            self.pool = _get_pool()
+            self.conn = self.pool.acquire()
+        except oracledb.Error as e:
+            _acquire_errors.inc()
+            if _breaker is not None:
+                _breaker.record_failure()
+            logger.warning(f"No se obtuvo conexión del pool tras "
+                           f"{(time.perf_counter() - started) * 1000:.1f} ms: {str(e)}")
+            raise DatabaseUnavailableError(f"No se obtuvo conexión a la base de datos: {str(e)}") from e
+        except Exception:
+            if _breaker is not None:
+                _breaker.release_probe()
+            raise
+        # Ninguna llamada puede retener el thread más que DB_CALL_TIMEOUT_MS
+        self.conn.call_timeout = DB_CALL_TIMEOUT_MS
+        self._acquired_at = time.perf_counter()
+        _acquire_wait_ms.observe((self._acquired_at - started) * 1000)
+        _busy_at_acquire.observe(self.pool.busy)
+        _opened_at_acquire.observe(self.pool.opened)
         return self.conn
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.conn:
+            if _breaker is not None:
+                if _connection_lost(self.conn, exc_val):
+                    _breaker.record_failure()
+                else:
+                    _breaker.record_success()
             self.conn.close()
+            _hold_ms.observe((time.perf_counter() - self._acquired_at) * 1000)
         return False
 
 
+def backend_connection():
+    """
+    Context manager de una conexión propia del backend configurado (DB_BACKEND)
+    Dentro de un request se contabiliza en sus stats (db/request_stats.py)
+    """
+    if DB_BACKEND == 'sqlite':
+        from db.sqlite_backend import SQLiteConnection
+        return instrument(SQLiteConnection())
+    return instrument(OracleConnection())
+
+
+def get_connection():
+    """
+    Context manager de conexión para los servicios
+
+    Dentro de un request HTTP (DB_REQUEST_SCOPE) es la conexión compartida del
+    request, confirmada al terminarlo (ver db/request_scope.py); fuera de un
+    request, una conexión propia del backend configurado.
+
+    Uso:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                queries.PING.execute(cursor)
+    """
+    if DB_REQUEST_SCOPE and has_request_context():
+        from db.request_scope import RequestConnection
+        return RequestConnection()
+    return backend_connection()
+
+
 def test_connection():
     """
     Prueba la conexión a Oracle Autonomous Database (patrón oficial)
@@ -93,8 +318,7 @@ def test_connection():
         # Usar patrón oficial con context manager
         with OracleConnection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT 1 FROM DUAL")
-                result = cursor.fetchone()
+                result = queries.PING.execute(cursor).fetchone()
                 if result:
                     print(f"✅ CONEXIÓN EXITOSA!")
                     print(f"   Query result: {result[0]}\n")
@@ -0,0 +1,26 @@
+-- Perfil RIASEC materializado por usuario
+-- Suma y cantidad de respuestas por categoría, mantenidas incrementalmente
+-- en la misma transacción que el MERGE de USUARIO_AFIRMACION_RPTA.
+-- La lectura del perfil pasa a ser un acceso por clave primaria.
+CREATE TABLE ALEJO.USUARIO_PERFIL_RIASEC (
+    USUARIO_ID NUMBER NOT NULL,
+    CATEGORY_NAME VARCHAR2(50) NOT NULL,
+    SUMA NUMBER DEFAULT 0 NOT NULL,
+    CANTIDAD NUMBER DEFAULT 0 NOT NULL,
+    FECHA_ACTUALIZACION TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT PK_USUARIO_PERFIL_RIASEC PRIMARY KEY (USUARIO_ID, CATEGORY_NAME),
+    CONSTRAINT FK_UPR_USUARIO FOREIGN KEY (USUARIO_ID) REFERENCES ALEJO.USUARIO(ID)
+) ORGANIZATION INDEX;
+
+-- Carga inicial desde las respuestas existentes
+INSERT INTO ALEJO.USUARIO_PERFIL_RIASEC (USUARIO_ID, CATEGORY_NAME, SUMA, CANTIDAD)
+SELECT uar.USUARIO_ID,
+       cr.CATEGORY_NAME,
+       SUM(uar.RIASEC_ID),
+       COUNT(*)
+FROM ALEJO.USUARIO_AFIRMACION_RPTA uar
+JOIN ALEJO.AFIRMACIONES af ON uar.AFIRMACION_ID = af.ID
+JOIN ALEJO.CATEGORIAS_RIASEC cr ON af.FK_RIASEC = cr.ID
+GROUP BY uar.USUARIO_ID, cr.CATEGORY_NAME;
+
+COMMIT;
@@ -0,0 +1,613 @@
+"""
+Catálogo de sentencias SQL de los servicios
+Cada sentencia tiene nombre, texto ya renderizado (esquema sustituido una sola
+vez, al importar) y su propio ajuste de fetch:
+
+    arraysize       filas por round trip en fetchall/fetchmany
+    prefetchrows    filas que viajan junto con la respuesta del execute
+    numbers/columns tipo Python de las columnas NUMBER (float, int), convertido
+                    por el driver con un output type handler en lugar de
+                    float()/int() por valor en el servicio
+
+El texto SQL es siempre el mismo para cada sentencia, así que Oracle (y el
+statement cache de cada conexión, DB_STMT_CACHE_SIZE) la reutiliza.
+
+Dialectos: con DB_BACKEND=sqlite el cursor (db/sqlite_backend.py) declara
+dialect = 'sqlite' y se ejecuta la variante `sqlite` de la sentencia (o el
+mismo texto si es SQL estándar); el ajuste de fetch es solo de Oracle.
+
+Uso:
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            rows = queries.CAREERS_ALL.execute(cursor).fetchall()
+"""
+import textwrap
+import oracledb
+from config import ORACLE_SCHEMA
+
+# En SQLite las tablas viven en la base principal: {schema}.TABLA -> main.TABLA
+SQLITE_SCHEMA = 'main'
+
+# Sentencias por nombre (Query.name -> Query)
+QUERIES = {}
+# Nombre por texto SQL de cualquier dialecto (contabilidad por request, db/request_stats.py)
+QUERY_NAMES = {}
+
+# IDs por query en la carga de perfiles en lote (Oracle admite hasta 1000 en un IN)
+PROFILE_BATCH_SIZE = 200
+
+# Categorías RIASEC y afirmaciones del test (filas fijas de un usuario)
+RIASEC_CATEGORIES = 6
+TEST_QUESTIONS = 42
+
+
+class Query:
+    """
+    Sentencia SQL con nombre y ajuste de fetch
+
+    Atributos:
+        name: nombre estable (p.ej. 'careers.all'), también usado en logs
+        sql: texto con el esquema ya sustituido
+        arraysize, prefetchrows: None = valores por defecto del driver
+        numbers: tipo de todas las columnas NUMBER (float, int o None = sin handler)
+        columns: dict {COLUMNA: tipo} que prevalece sobre numbers
+        sqlite_sql: texto para SQLite (el de Oracle si no se indica variante)
+        lock: la sentencia bloquea filas (FOR UPDATE); en SQLite se abre la
+              transacción con BEGIN IMMEDIATE antes de ejecutarla
+    """
+
+    def __init__(self, name: str, sql: str, arraysize: int = None, prefetchrows: int = None,
+                 numbers: type = None, columns: dict = None, sqlite: str = None, lock: bool = False):
+        if name in QUERIES:
+            raise ValueError(f"Sentencia duplicada en el catálogo: {name}")
+        self.name = name
+        self.sql = textwrap.dedent(sql).strip().format(schema=ORACLE_SCHEMA)
+        self.sqlite_sql = textwrap.dedent(sqlite or sql).strip().format(schema=SQLITE_SCHEMA)
+        self.lock = lock
+        QUERY_NAMES[self.sql] = QUERY_NAMES[self.sqlite_sql] = name
+        self.arraysize = arraysize
+        self.prefetchrows = prefetchrows
+        self.numbers = numbers
+        self.columns = {column.upper(): target for column, target in (columns or {}).items()}
+        self.output_type_handler = self._number_handler if numbers or self.columns else None
+        QUERIES[name] = self
+
+    def _number_handler(self, cursor, metadata):
+        """Output type handler: NUMBER -> float (BINARY_DOUBLE) o int según la columna"""
+        if metadata.type_code is not oracledb.DB_TYPE_NUMBER:
+            return None
+        target = self.columns.get(metadata.name, self.numbers)
+        if target is float:
+            return cursor.var(oracledb.DB_TYPE_BINARY_DOUBLE, arraysize=cursor.arraysize)
+        if target is int:
+            return cursor.var(int, arraysize=cursor.arraysize)
+        return None
+
+    def _prepare(self, cursor) -> None:
+        # El cursor puede reutilizarse para otra sentencia: restablecer siempre
+        cursor.arraysize = self.arraysize or oracledb.defaults.arraysize
+        cursor.prefetchrows = self.prefetchrows if self.prefetchrows is not None else oracledb.defaults.prefetchrows
+        cursor.outputtypehandler = self.output_type_handler
+
+    def execute(self, cursor, params=None):
+        """Ejecuta la sentencia con el ajuste de fetch; devuelve el cursor"""
+        if getattr(cursor, 'dialect', None) == 'sqlite':
+            if self.lock:
+                cursor.begin_immediate()
+            cursor.execute(self.sqlite_sql, params or {})
+            return cursor
+        self._prepare(cursor)
+        cursor.execute(self.sql, params or {})
+        return cursor
+
+    def executemany(self, cursor, rows: list):
+        """Ejecuta la sentencia (DML) una vez por fila de binds en un solo round trip"""
+        if getattr(cursor, 'dialect', None) == 'sqlite':
+            cursor.executemany(self.sqlite_sql, rows)
+            return cursor
+        self._prepare(cursor)
+        cursor.executemany(self.sql, rows)
+        return cursor
+
+    def __repr__(self) -> str:
+        return f"Query({self.name!r})"
+
+
+def _single_row(name: str, sql: str, **kwargs) -> Query:
+    """Lookup por clave: una fila (el prefetch por defecto de 2 evita un segundo round trip)"""
+    return Query(name, sql, arraysize=1, **kwargs)
+
+
+def _fixed_rows(name: str, sql: str, rows: int, **kwargs) -> Query:
+    """Resultado de tamaño conocido: todas las filas llegan con el execute"""
+    return Query(name, sql, arraysize=rows + 1, prefetchrows=rows + 1, **kwargs)
+
+
+# ─── General ────────────────────────────────────────────────
+
+PING = _single_row('db.ping', "SELECT 1 FROM DUAL", sqlite="SELECT 1")
+
+# Unidad de trabajo por request (db/request_scope.py): el commit de un servicio
+# marca un savepoint; un error posterior vuelve a él sin perder lo anterior
+SAVEPOINT = Query('db.savepoint', "SAVEPOINT request_unit")
+ROLLBACK_TO_SAVEPOINT = Query('db.rollback_to_savepoint', "ROLLBACK TO SAVEPOINT request_unit")
+
+
+# ─── Usuarios ───────────────────────────────────────────────
+
+USER_EMAIL_EXISTS = _single_row('users.email_exists', """
+    SELECT CORREO FROM {schema}.USUARIO WHERE CORREO = :correo
+""")
+
+USER_INSERT = Query('users.insert', """
+    INSERT INTO {schema}.USUARIO (NOMBRE, APELLIDO, CORREO, PASSWORD)
+    VALUES (:nombre, :apellido, :correo, :password)
+""")
+
+USER_BY_EMAIL = _single_row('users.by_email', """
+    SELECT ID, NOMBRE, APELLIDO, CORREO, PASSWORD
+    FROM {schema}.USUARIO WHERE CORREO = :correo
+""", numbers=int)
+
+
+# ─── Carreras ───────────────────────────────────────────────
+
+CAREERS_PAGE = Query('careers.page', """
+    SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL,
+           COUNT(*) OVER() AS TOTAL_COUNT
+    FROM {schema}.CARRERAS_NUEVO
+    ORDER BY CARRERA
+    OFFSET :offset ROWS FETCH NEXT :per_page ROWS ONLY
+""", arraysize=50, prefetchrows=51, columns={'ID': int, 'TOTAL_COUNT': int}, sqlite="""
+    SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL,
+           COUNT(*) OVER() AS TOTAL_COUNT
+    FROM {schema}.CARRERAS_NUEVO
+    ORDER BY CARRERA
+    LIMIT :per_page OFFSET :offset
+""")
+
+CAREER_BY_ID = _single_row('careers.by_id', """
+    SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL
+    FROM {schema}.CARRERAS_NUEVO
+    WHERE ID = :career_id
+""", columns={'ID': int})
+
+CAREERS_ALL = Query('careers.all', """
+    SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL
+    FROM {schema}.CARRERAS_NUEVO
+    ORDER BY CARRERA
+""", arraysize=500, prefetchrows=500, columns={'ID': int})
+
+CAREER_SKILLS = Query('careers.skills', """
+    SELECT S.NOMBRE FROM {schema}.SKILLS S
+    INNER JOIN {schema}.CARRERAS_SKILLS CS ON S.ID = CS.FK_SKILLS
+    WHERE CS.FK_CARRERA = :career_id
+    ORDER BY S.NOMBRE
+""", arraysize=100, prefetchrows=100)
+
+CAREER_TASKS = Query('careers.tasks', """
+    SELECT T.NOMBRE FROM {schema}.TAREAS T
+    INNER JOIN {schema}.CARRERA_TAREAS CT ON T.ID = CT.FK_TAREA
+    WHERE CT.FK_CARRERA = :career_id
+    ORDER BY T.NOMBRE
+""", arraysize=100, prefetchrows=100)
+
+CAREERS_ALL_SKILLS = Query('careers.all_skills', """
+    SELECT CS.FK_CARRERA, S.NOMBRE
+    FROM {schema}.CARRERAS_SKILLS CS
+    INNER JOIN {schema}.SKILLS S ON S.ID = CS.FK_SKILLS
+    ORDER BY CS.FK_CARRERA, S.NOMBRE
+""", arraysize=2000, prefetchrows=2000, numbers=int)
+
+CAREERS_ALL_TASKS = Query('careers.all_tasks', """
+    SELECT CT.FK_CARRERA, T.NOMBRE
+    FROM {schema}.CARRERA_TAREAS CT
+    INNER JOIN {schema}.TAREAS T ON T.ID = CT.FK_TAREA
+    ORDER BY CT.FK_CARRERA, T.NOMBRE
+""", arraysize=2000, prefetchrows=2000, numbers=int)
+
+
+# ─── Asesorías ──────────────────────────────────────────────
+
+ADVISORS_ALL = Query('advisory.advisors', """
+    SELECT a.ID, a.NOMBRE, a.APELLIDO,
+           c.ID AS CARRERA_ID, c.CARRERA AS CARRERA_NOMBRE
+    FROM {schema}.ASESORES a
+    LEFT JOIN {schema}.CARRERAS_NUEVO c
+      ON a.FK_CARRERA = c.ID
+    ORDER BY a.NOMBRE
+""", arraysize=200, prefetchrows=200, numbers=int)
+
+ADVISOR_BY_ID = _single_row('advisory.advisor_by_id', """
+    SELECT a.ID, a.NOMBRE, a.APELLIDO,
+           c.ID AS CARRERA_ID, c.CARRERA AS CARRERA_NOMBRE
+    FROM {schema}.ASESORES a
+    LEFT JOIN {schema}.CARRERAS_NUEVO c
+      ON a.FK_CARRERA = c.ID
+    WHERE a.ID = :advisor_id
+""", numbers=int)
+
+BOOKED_SLOTS = Query('advisory.booked_slots', """
+    SELECT TO_CHAR(DIA, 'YYYY-MM-DD'), HORA
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE DIA >= TRUNC(SYSDATE)
+    ORDER BY DIA, HORA
+""", arraysize=500, sqlite="""
+    SELECT DIA, HORA
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE DIA >= date('now', 'localtime')
+    ORDER BY DIA, HORA
+""")
+
+BOOKED_SLOTS_BY_ADVISOR = Query('advisory.booked_slots_by_advisor', """
+    SELECT TO_CHAR(DIA, 'YYYY-MM-DD'), HORA
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_ASESOR = :advisor_id
+      AND DIA >= TRUNC(SYSDATE)
+    ORDER BY DIA, HORA
+""", arraysize=200, sqlite="""
+    SELECT DIA, HORA
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_ASESOR = :advisor_id
+      AND DIA >= date('now', 'localtime')
+    ORDER BY DIA, HORA
+""")
+
+BOOKED_TIMES_BY_DAY = Query('advisory.booked_times_by_day', """
+    SELECT HORA
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_ASESOR = :advisor_id
+      AND TO_CHAR(DIA, 'YYYY-MM-DD') = :fecha
+""", arraysize=20, prefetchrows=20, sqlite="""
+    SELECT HORA
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_ASESOR = :advisor_id
+      AND DIA = :fecha
+""")
+
+ADVISOR_SLOT_TAKEN = _single_row('advisory.advisor_slot_taken', """
+    SELECT COUNT(*)
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_ASESOR = :advisor_id
+      AND TO_CHAR(DIA, 'YYYY-MM-DD') = :fecha
+      AND HORA = :hora
+""", numbers=int, sqlite="""
+    SELECT COUNT(*)
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_ASESOR = :advisor_id
+      AND DIA = :fecha
+      AND HORA = :hora
+""")
+
+USER_SLOT_TAKEN = _single_row('advisory.user_slot_taken', """
+    SELECT COUNT(*)
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_USUARIO = :user_id
+      AND TO_CHAR(DIA, 'YYYY-MM-DD') = :fecha
+      AND HORA = :hora
+""", numbers=int, sqlite="""
+    SELECT COUNT(*)
+    FROM {schema}.ASESORIA_USUARIO
+    WHERE FK_USUARIO = :user_id
+      AND DIA = :fecha
+      AND HORA = :hora
+""")
+
+BOOKING_INSERT = Query('advisory.booking_insert', """
+    INSERT INTO {schema}.ASESORIA_USUARIO
+    (FK_ASESOR, FK_USUARIO, DIA, HORA, LINK)
+    VALUES (:advisor_id, :user_id, TO_DATE(:fecha, 'YYYY-MM-DD'), :hora, :link)
+""", sqlite="""
+    INSERT INTO {schema}.ASESORIA_USUARIO
+    (FK_ASESOR, FK_USUARIO, DIA, HORA, LINK)
+    VALUES (:advisor_id, :user_id, :fecha, :hora, :link)
+""")
+
+USER_BOOKINGS = Query('advisory.user_bookings', """
+    SELECT au.ID,
+           TO_CHAR(au.DIA, 'YYYY-MM-DD') AS DIA,
+           au.HORA,
+           au.LINK,
+           a.NOMBRE AS ASESOR_NOMBRE,
+           a.APELLIDO AS ASESOR_APELLIDO,
+           c.CARRERA AS CARRERA_NOMBRE
+    FROM {schema}.ASESORIA_USUARIO au
+    JOIN {schema}.ASESORES a ON au.FK_ASESOR = a.ID
+    LEFT JOIN {schema}.CARRERAS_NUEVO c ON a.FK_CARRERA = c.ID
+    WHERE au.FK_USUARIO = :user_id
+      AND au.DIA >= TRUNC(SYSDATE)
+    ORDER BY au.DIA, au.HORA
+""", arraysize=20, prefetchrows=20, numbers=int, sqlite="""
+    SELECT au.ID,
+           au.DIA,
+           au.HORA,
+           au.LINK,
+           a.NOMBRE AS ASESOR_NOMBRE,
+           a.APELLIDO AS ASESOR_APELLIDO,
+           c.CARRERA AS CARRERA_NOMBRE
+    FROM {schema}.ASESORIA_USUARIO au
+    JOIN {schema}.ASESORES a ON au.FK_ASESOR = a.ID
+    LEFT JOIN {schema}.CARRERAS_NUEVO c ON a.FK_CARRERA = c.ID
+    WHERE au.FK_USUARIO = :user_id
+      AND au.DIA >= date('now', 'localtime')
+    ORDER BY au.DIA, au.HORA
+""")
+
+BOOKING_DELETE = Query('advisory.booking_delete', """
+    DELETE FROM {schema}.ASESORIA_USUARIO
+    WHERE ID = :booking_id AND FK_USUARIO = :user_id
+""")
+
+
+# ─── Test vocacional ────────────────────────────────────────
+
+AFIRMACION_CATEGORIES = _fixed_rows('test.afirmacion_categories', """
+    SELECT af.ID, cr.CATEGORY_NAME
+    FROM {schema}.AFIRMACIONES af
+    JOIN {schema}.CATEGORIAS_RIASEC cr ON af.FK_RIASEC = cr.ID
+""", TEST_QUESTIONS, numbers=int)
+
+AFIRMACIONES = _fixed_rows('test.afirmaciones', """
+    SELECT ID, AFIRMACION_DSC FROM {schema}.AFIRMACIONES ORDER BY ID
+""", TEST_QUESTIONS, numbers=int)
+
+# Bloquea la fila del usuario y lee sus respuestas previas en un solo round trip
+# (SQLite no tiene bloqueo por fila: BEGIN IMMEDIATE toma el lock de escritura)
+USER_ANSWERS_FOR_UPDATE = _fixed_rows('test.user_answers_for_update', """
+    SELECT uar.AFIRMACION_ID, uar.RIASEC_ID
+    FROM {schema}.USUARIO u
+    LEFT JOIN {schema}.USUARIO_AFIRMACION_RPTA uar ON uar.USUARIO_ID = u.ID
+    WHERE u.ID = :usuario_id
+    FOR UPDATE OF u.ID
+""", TEST_QUESTIONS, numbers=int, lock=True, sqlite="""
+    SELECT uar.AFIRMACION_ID, uar.RIASEC_ID
+    FROM {schema}.USUARIO u
+    LEFT JOIN {schema}.USUARIO_AFIRMACION_RPTA uar ON uar.USUARIO_ID = u.ID
+    WHERE u.ID = :usuario_id
+""")
+
+USER_ANSWERS = _fixed_rows('test.user_answers', """
+    SELECT uar.AFIRMACION_ID, uar.RIASEC_ID
+    FROM {schema}.USUARIO_AFIRMACION_RPTA uar
+    WHERE uar.USUARIO_ID = :usuario_id
+    ORDER BY uar.AFIRMACION_ID
+""", TEST_QUESTIONS, numbers=int)
+
+# MERGE de una respuesta (INSERT o UPDATE según corresponda)
+ANSWER_MERGE = Query('test.answer_merge', """
+    MERGE INTO {schema}.USUARIO_AFIRMACION_RPTA t
+    USING (SELECT :usuario_id as usuario_id,
+                  :afirmacion_id as afirmacion_id,
+                  :riasec_id as riasec_id
+           FROM dual) s
+    ON (t.usuario_id = s.usuario_id AND t.afirmacion_id = s.afirmacion_id)
+    WHEN MATCHED THEN
+        UPDATE SET t.riasec_id = s.riasec_id,
+                   t.estampa = CURRENT_TIMESTAMP
+    WHEN NOT MATCHED THEN
+        INSERT (usuario_id, afirmacion_id, riasec_id, estampa)
+        VALUES (s.usuario_id, s.afirmacion_id, s.riasec_id, CURRENT_TIMESTAMP)
+""", sqlite="""
+    INSERT INTO {schema}.USUARIO_AFIRMACION_RPTA (usuario_id, afirmacion_id, riasec_id, estampa)
+    VALUES (:usuario_id, :afirmacion_id, :riasec_id, CURRENT_TIMESTAMP)
+    ON CONFLICT (usuario_id, afirmacion_id) DO UPDATE
+    SET riasec_id = excluded.riasec_id,
+        estampa = CURRENT_TIMESTAMP
+""")
+
+# Suma/cantidad incremental sobre el perfil materializado USUARIO_PERFIL_RIASEC
+PROFILE_MERGE = Query('test.profile_merge', """
+    MERGE INTO {schema}.USUARIO_PERFIL_RIASEC p
+    USING (SELECT :usuario_id as usuario_id,
+                  :category_name as category_name,
+                  :delta_suma as delta_suma,
+                  :delta_cantidad as delta_cantidad
+           FROM dual) s
+    ON (p.usuario_id = s.usuario_id AND p.category_name = s.category_name)
+    WHEN MATCHED THEN
+        UPDATE SET p.suma = p.suma + s.delta_suma,
+                   p.cantidad = p.cantidad + s.delta_cantidad,
+                   p.fecha_actualizacion = CURRENT_TIMESTAMP
+    WHEN NOT MATCHED THEN
+        INSERT (usuario_id, category_name, suma, cantidad, fecha_actualizacion)
+        VALUES (s.usuario_id, s.category_name, s.delta_suma, s.delta_cantidad, CURRENT_TIMESTAMP)
+""", sqlite="""
+    INSERT INTO {schema}.USUARIO_PERFIL_RIASEC (usuario_id, category_name, suma, cantidad, fecha_actualizacion)
+    VALUES (:usuario_id, :category_name, :delta_suma, :delta_cantidad, CURRENT_TIMESTAMP)
+    ON CONFLICT (usuario_id, category_name) DO UPDATE
+    SET suma = suma + excluded.suma,
+        cantidad = cantidad + excluded.cantidad,
+        fecha_actualizacion = CURRENT_TIMESTAMP
+""")
+
+USER_ANSWERS_DELETE = Query('test.user_answers_delete', """
+    DELETE FROM {schema}.USUARIO_AFIRMACION_RPTA
+    WHERE USUARIO_ID = :usuario_id
+""")
+
+USER_PROFILE_DELETE = Query('test.user_profile_delete', """
+    DELETE FROM {schema}.USUARIO_PERFIL_RIASEC WHERE USUARIO_ID = :usuario_id
+""")
+
+TEST_RESULT_INSERT = Query('test.result_insert', """
+    INSERT INTO {schema}.test_results (name, email, result_career, scores)
+    VALUES (:name, :email, :result_career, :scores)
+""")
+
+
+# ─── Predicciones ───────────────────────────────────────────
+
+# Perfil materializado (suma/cantidad por categoría), mantenido por TestService
+USER_PROFILE = _fixed_rows('predictions.user_profile', """
+    SELECT CATEGORY_NAME, SUMA, CANTIDAD
+    FROM {schema}.USUARIO_PERFIL_RIASEC
+    WHERE USUARIO_ID = :usuario_id AND CANTIDAD > 0
+""", RIASEC_CATEGORIES, numbers=int)
+
+# Bloques de PROFILE_BATCH_SIZE IDs (rellenados con NULL): texto SQL siempre igual
+USER_PROFILES_BATCH = _fixed_rows('predictions.user_profiles_batch', """
+    SELECT USUARIO_ID, CATEGORY_NAME, SUMA, CANTIDAD
+    FROM {schema}.USUARIO_PERFIL_RIASEC
+    WHERE USUARIO_ID IN (%s) AND CANTIDAD > 0
+""" % ','.join(f':u{i}' for i in range(PROFILE_BATCH_SIZE)),
+    PROFILE_BATCH_SIZE * RIASEC_CATEGORIES, numbers=int)
+
+OCCUPATION_MODEL = Query('predictions.occupation_model', """
+    SELECT
+        ID,
+        OCUPACION,
+        REALISTIC,
+        INVESTIGATIVE,
+        ARTISTIC,
+        SOCIAL,
+        ENTERPRISING,
+        CONVENTIONAL,
+        CAST(POSIBLES_CARRERAS AS VARCHAR2(4000)) as POSIBLES_CARRERAS
+    FROM {schema}.MODELO_CONVERSIONES
+    ORDER BY ID
+""", arraysize=5000, prefetchrows=5000, numbers=float, columns={'ID': int}, sqlite="""
+    SELECT ID, OCUPACION, REALISTIC, INVESTIGATIVE, ARTISTIC, SOCIAL,
+           ENTERPRISING, CONVENTIONAL, POSIBLES_CARRERAS
+    FROM {schema}.MODELO_CONVERSIONES
+    ORDER BY ID
+""")
+
+CAREER_MATCHES = Query('predictions.career_matches', """
+    SELECT
+        m.ID_OCUPACION,
+        c.ID,
+        c.CARRERA,
+        m.RELEVANCIA
+    FROM {schema}.MATCH_OCUPACION_CARRERA m
+    JOIN {schema}.CARRERAS_NUEVO c ON m.ID_CARRERA = c.ID
+    ORDER BY m.ID_OCUPACION, m.RELEVANCIA DESC
+""", arraysize=10000, prefetchrows=10000, numbers=int)
+
+
+# ─── NPS ────────────────────────────────────────────────────
+
+NPS_STATUS = _single_row('nps.status', """
+    SELECT TIEMPO_ACUMULADO, ULTIMA_FECHA_VISTO,
+           RESPUESTA_PAGINA, RESPUESTA_TEST,
+           ESTADO, FECHA_RESPUESTA
+    FROM {schema}.USUARIO_NPS
+    WHERE USUARIO_ID = :usuario_id
+""", numbers=int, columns={'TIEMPO_ACUMULADO': float})
+
+NPS_EXISTS = _single_row('nps.exists', """
+    SELECT 1 FROM {schema}.USUARIO_NPS WHERE USUARIO_ID = :usuario_id
+""")
+
+NPS_INSERT = Query('nps.insert', """
+    INSERT INTO {schema}.USUARIO_NPS
+        (USUARIO_ID, TIEMPO_ACUMULADO, ULTIMA_FECHA_VISTO, ESTADO, FECHA_CREACION)
+    VALUES
+        (:usuario_id, 0, CURRENT_TIMESTAMP, 0, CURRENT_TIMESTAMP)
+""")
+
+NPS_TIME = _single_row('nps.time', """
+    SELECT TIEMPO_ACUMULADO, ESTADO FROM {schema}.USUARIO_NPS WHERE USUARIO_ID = :usuario_id
+""", numbers=int, columns={'TIEMPO_ACUMULADO': float})
+
+NPS_TIME_UPDATE = Query('nps.time_update', """
+    UPDATE {schema}.USUARIO_NPS
+    SET TIEMPO_ACUMULADO = :nuevo_tiempo,
+        ULTIMA_FECHA_VISTO = CURRENT_TIMESTAMP
+    WHERE USUARIO_ID = :usuario_id
+""")
+
+NPS_RESPONSES = _single_row('nps.responses', """
+    SELECT RESPUESTA_PAGINA, RESPUESTA_TEST, ESTADO
+    FROM {schema}.USUARIO_NPS
+    WHERE USUARIO_ID = :usuario_id
+""", numbers=int)
+
+# Una sentencia por campo de respuesta (el nombre de columna no admite bind)
+NPS_RESPONSE_UPDATE = {
+    tipo: Query(f'nps.response_update_{tipo}', f"""
+        UPDATE {{schema}}.USUARIO_NPS
+        SET {campo} = :puntuacion,
+            ESTADO = :nuevo_estado,
+            FECHA_RESPUESTA = CURRENT_TIMESTAMP
+        WHERE USUARIO_ID = :usuario_id
+    """)
+    for tipo, campo in (('pagina', 'RESPUESTA_PAGINA'), ('test', 'RESPUESTA_TEST'))
+}
+
+NPS_TEST_ANSWERS = _single_row('nps.test_answers', """
+    SELECT COALESCE(SUM(CANTIDAD), 0) FROM {schema}.USUARIO_PERFIL_RIASEC
+    WHERE USUARIO_ID = :usuario_id
+""", numbers=int)
+
+NPS_ELIGIBILITY = _single_row('nps.eligibility', """
+    SELECT TIEMPO_ACUMULADO, RESPUESTA_PAGINA, RESPUESTA_TEST, ESTADO
+    FROM {schema}.USUARIO_NPS
+    WHERE USUARIO_ID = :usuario_id
+""", numbers=int, columns={'TIEMPO_ACUMULADO': float})
+
+
+# ─── Visitas ────────────────────────────────────────────────
+
+VISIT_BY_VISITOR = _single_row('visits.by_visitor', """
+    SELECT CANTIDAD_VISITAS, ULTIMA_VISITA
+    FROM {schema}.VISITAS
+    WHERE VISITOR_ID = :visitor_id
+""", numbers=int)
+
+VISIT_UPDATE = Query('visits.update', """
+    UPDATE {schema}.VISITAS
+    SET ULTIMA_VISITA = SYSDATE,
+        CANTIDAD_VISITAS = :cantidad_visitas,
+        PAGINA = :pagina,
+        USER_AGENT = :user_agent,
+        IP_ADDRESS = :ip_address,
+        DEVICE_TYPE = :device_type
+    WHERE VISITOR_ID = :visitor_id
+""", sqlite="""
+    UPDATE {schema}.VISITAS
+    SET ULTIMA_VISITA = datetime('now', 'localtime'),
+        CANTIDAD_VISITAS = :cantidad_visitas,
+        PAGINA = :pagina,
+        USER_AGENT = :user_agent,
+        IP_ADDRESS = :ip_address,
+        DEVICE_TYPE = :device_type
+    WHERE VISITOR_ID = :visitor_id
+""")
+
+VISIT_INSERT = Query('visits.insert', """
+    INSERT INTO {schema}.VISITAS
+    (VISITOR_ID, PAGINA, USER_AGENT, IP_ADDRESS, DEVICE_TYPE, PRIMERA_VISITA, ULTIMA_VISITA, CANTIDAD_VISITAS)
+    VALUES (:visitor_id, :pagina, :user_agent, :ip_address, :device_type, SYSDATE, SYSDATE, 1)
+""", sqlite="""
+    INSERT INTO {schema}.VISITAS
+    (VISITOR_ID, PAGINA, USER_AGENT, IP_ADDRESS, DEVICE_TYPE, PRIMERA_VISITA, ULTIMA_VISITA, CANTIDAD_VISITAS)
+    VALUES (:visitor_id, :pagina, :user_agent, :ip_address, :device_type,
+            datetime('now', 'localtime'), datetime('now', 'localtime'), 1)
+""")
+
+VISITOR_INFO = _single_row('visits.visitor_info', """
+    SELECT VISITOR_ID, PRIMERA_VISITA, ULTIMA_VISITA, CANTIDAD_VISITAS, PAGINA, DEVICE_TYPE
+    FROM {schema}.VISITAS
+    WHERE VISITOR_ID = :visitor_id
+""", numbers=int)
+
+VISITS_UNIQUE_VISITORS = _single_row('visits.unique_visitors', """
+    SELECT COUNT(DISTINCT VISITOR_ID) FROM {schema}.VISITAS
+""", numbers=int)
+
+VISITS_TOTAL = _single_row('visits.total', """
+    SELECT SUM(CANTIDAD_VISITAS) FROM {schema}.VISITAS
+""", numbers=int)
+
+VISITS_BY_DEVICE = Query('visits.by_device', """
+    SELECT DEVICE_TYPE, COUNT(DISTINCT VISITOR_ID) as count
+    FROM {schema}.VISITAS
+    GROUP BY DEVICE_TYPE
+""", arraysize=20, prefetchrows=20, numbers=int)
+
+VISITS_BY_PAGE = Query('visits.by_page', """
+    SELECT PAGINA, COUNT(DISTINCT VISITOR_ID) as visitor_count, SUM(CANTIDAD_VISITAS) as total_visits
+    FROM {schema}.VISITAS
+    GROUP BY PAGINA
+    ORDER BY visitor_count DESC
+""", arraysize=200, prefetchrows=200, numbers=int)
@@ -0,0 +1,159 @@
+"""
+Conexión y transacción por request HTTP (unit of work)
+Durante un request, get_connection() devuelve siempre la misma conexión
+(tomada del pool en el primer uso y guardada en flask.g): los servicios
+anidados (p.ej. NpsService.init_nps_record dentro de update_accumulated_time)
+y los varios servicios de un mismo controlador ya no toman una segunda
+conexión mientras retienen otra, así que cada thread usa a lo sumo una.
+
+El commit() de un servicio no confirma todavía: marca un savepoint. Al
+terminar el request se hace un único commit (after_request); si un bloque
+`with get_connection()` termina con una excepción, se vuelve al último
+savepoint, sin perder lo que servicios anteriores ya habían confirmado.
+Lo hecho después del último commit() de un servicio no se confirma (como
+con una conexión propia): el commit final vuelve antes a ese savepoint.
+teardown_request descarta lo pendiente y devuelve la conexión al pool.
+
+Fuera de un request (threads de fondo, scripts) get_connection() sigue
+entregando una conexión propia por bloque.
+"""
+import logging
+from flask import Flask, g, jsonify
+from db import queries
+from db.db_config import backend_connection
+
+logger = logging.getLogger(__name__)
+
+
+def _transaction_in_progress(conn, default: bool) -> bool:
+    return getattr(conn, 'transaction_in_progress', default)
+
+
+class RequestUnitOfWork:
+    """Conexión del request y estado de su transacción"""
+
+    def __init__(self):
+        self._context = backend_connection()
+        self.conn = self._context.__enter__()
+        # Último error que cortó un bloque: el backend decide al liberar si fue
+        # una falla de la BD (circuit breaker) aunque el servicio lo haya atrapado
+        self.error = None
+        self.commit_requested = False
+        self.savepoint = False
+        # Se usó la conexión después del último commit() de un servicio
+        self.pending = False
+
+    def request_commit(self) -> None:
+        """commit() de un servicio: lo hecho hasta aquí se confirma al final del request"""
+        self.commit_requested = True
+        # Sin transacción abierta no hay nada que proteger con un savepoint
+        if _transaction_in_progress(self.conn, True):
+            with self.conn.cursor() as cursor:
+                queries.SAVEPOINT.execute(cursor)
+            self.savepoint = True
+        self.pending = False
+
+    def discard(self) -> None:
+        """Descarta lo hecho desde el último commit() de un servicio"""
+        if self.savepoint:
+            with self.conn.cursor() as cursor:
+                queries.ROLLBACK_TO_SAVEPOINT.execute(cursor)
+        else:
+            self.conn.rollback()
+        self.pending = False
+
+    def commit(self) -> None:
+        if self.commit_requested:
+            # Lo hecho después del último commit() de un servicio no se confirma
+            if self.pending:
+                self.discard()
+            self.conn.commit()
+        self.commit_requested = False
+        self.savepoint = False
+
+    def release(self, exc: BaseException = None) -> None:
+        """Revierte lo no confirmado y devuelve la conexión"""
+        exc = exc or self.error
+        try:
+            if _transaction_in_progress(self.conn, False):
+                self.conn.rollback()
+        finally:
+            self._context.__exit__(type(exc) if exc else None, exc, None)
+
+
+class _UnitSession:
+    """Conexión que ven los servicios: cursor() directo, commit()/rollback() diferidos"""
+
+    def __init__(self, unit: RequestUnitOfWork):
+        self._unit = unit
+
+    def cursor(self):
+        self._unit.pending = True
+        return self._unit.conn.cursor()
+
+    def commit(self) -> None:
+        self._unit.request_commit()
+
+    def rollback(self) -> None:
+        self._unit.discard()
+
+
+class RequestConnection:
+    """
+    Context manager que entrega get_connection() dentro de un request
+
+    Uso (igual que OracleConnection):
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                ...
+            conn.commit()
+    """
+
+    def __enter__(self):
+        unit = g.get('db_unit')
+        if unit is None:
+            unit = RequestUnitOfWork()
+            g.db_unit = unit
+        self.unit = unit
+        return _UnitSession(unit)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.unit.error = exc_val
+            try:
+                self.unit.discard()
+            except Exception as e:
+                logger.warning(f"Error revirtiendo al último savepoint: {str(e)}")
+        return False
+
+
+def _commit_request(response):
+    unit = g.get('db_unit')
+    if unit is None:
+        return response
+    try:
+        unit.commit()
+    except Exception as e:
+        logger.error(f"Error confirmando la transacción del request: {str(e)}")
+        response = jsonify({
+            'success': False,
+            'message': 'Error guardando los cambios'
+        })
+        response.status_code = 500
+    return response
+
+
+def _release_request(exc):
+    unit = g.pop('db_unit', None)
+    if unit is None:
+        return
+    try:
+        unit.release(exc)
+    except Exception as e:
+        logger.warning(f"Error liberando la conexión del request: {str(e)}")
+
+
+def init_request_scope(app: Flask) -> None:
+    """Registra el commit (after_request) y la liberación (teardown) de la conexión del request"""
+    app.after_request(_commit_request)
+    app.teardown_request(_release_request)
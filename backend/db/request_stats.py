@@ -0,0 +1,227 @@
+"""
+Contabilidad de base de datos por request HTTP
+Cada request acumula sus round trips, filas leídas y tiempo en la BD (más la
+espera por una conexión del pool) y los publica:
+
+- En el header Server-Timing (visible en la pestaña Network del navegador):
+      Server-Timing: db;dur=12.4;desc="3 round trips, 212 rows", db-acquire;dur=0.1, app;dur=20.3
+- En una línea de log estructurada (JSON) por request, con el detalle por
+  sentencia del catálogo (Query.name):
+      request {"method": "GET", "path": "/api/careers/all", "status": 200, "ms": 32.8,
+               "db_ms": 12.4, "round_trips": 3, "rows": 212, "statements": {...}}
+
+Solo se instrumentan las conexiones tomadas dentro de un request; fuera de
+uno (threads de fondo, scripts) get_connection() entrega la conexión tal cual.
+
+Round trips: cada execute, executemany, commit y rollback es uno. En Oracle,
+las filas que exceden las que llegaron con el execute (prefetchrows) se
+piden de a arraysize por round trip: se estiman con esos dos valores.
+"""
+import json
+import logging
+import math
+import time
+from flask import Flask, g, has_request_context, request
+from db import queries
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDbStats:
+    """Acumulado de un request: totales y detalle por sentencia"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.rows = 0
+        self.db_ms = 0.0
+        self.acquire_ms = 0.0
+        self.statements = {}
+
+    def record(self, name: str, ms: float, calls: int = 0, round_trips: int = 0, rows: int = 0) -> None:
+        self.round_trips += round_trips
+        self.rows += rows
+        self.db_ms += ms
+        entry = self.statements.get(name)
+        if entry is None:
+            entry = self.statements[name] = {'calls': 0, 'round_trips': 0, 'rows': 0, 'ms': 0.0}
+        entry['calls'] += calls
+        entry['round_trips'] += round_trips
+        entry['rows'] += rows
+        entry['ms'] += ms
+
+
+def current_stats():
+    """RequestDbStats del request en curso (None fuera de un request o con DB_REQUEST_STATS=false)"""
+    return g.get('db_stats') if has_request_context() else None
+
+
+class _TimedCursor:
+    """Cursor que acumula tiempo, round trips y filas en las stats del request"""
+
+    def __init__(self, cursor, stats: RequestDbStats):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_stats', stats)
+        object.__setattr__(self, '_name', None)
+        object.__setattr__(self, '_fetched', 0)
+        object.__setattr__(self, '_fetch_trips', 0)
+
+    # arraysize, prefetchrows, outputtypehandler, dialect, rowcount...
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def _run(self, method, sql: str, args) -> None:
+        name = queries.QUERY_NAMES.get(sql, 'sql')
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_fetched', 0)
+        object.__setattr__(self, '_fetch_trips', 0)
+        started = time.perf_counter()
+        try:
+            method(sql, args)
+        finally:
+            self._stats.record(name, (time.perf_counter() - started) * 1000, calls=1, round_trips=1)
+
+    def execute(self, sql: str, params=None):
+        self._run(self._cursor.execute, sql, params or {})
+        return self
+
+    def executemany(self, sql: str, rows: list):
+        self._run(self._cursor.executemany, sql, rows)
+        return self
+
+    def _fetch_round_trips(self, fetched: int) -> int:
+        if getattr(self._cursor, 'dialect', None) == 'sqlite':
+            return 0
+        extra = fetched - (getattr(self._cursor, 'prefetchrows', 0) or 0)
+        arraysize = getattr(self._cursor, 'arraysize', 0) or 1
+        return math.ceil(extra / arraysize) if extra > 0 else 0
+
+    def _fetch(self, result, started: float, count: int):
+        elapsed = (time.perf_counter() - started) * 1000
+        fetched = self._fetched + count
+        trips = self._fetch_round_trips(fetched)
+        self._stats.record(self._name or 'sql', elapsed, round_trips=trips - self._fetch_trips, rows=count)
+        object.__setattr__(self, '_fetched', fetched)
+        object.__setattr__(self, '_fetch_trips', trips)
+        return result
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        return self._fetch(row, started, 0 if row is None else 1)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        return self._fetch(rows, started, len(rows))
+
+    def fetchmany(self, *args):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args)
+        return self._fetch(rows, started, len(rows))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._cursor.close()
+        return False
+
+
+class _TimedSession:
+    """Conexión cuyos cursores, commit y rollback se contabilizan"""
+
+    def __init__(self, conn, stats: RequestDbStats):
+        self._conn = conn
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self) -> _TimedCursor:
+        return _TimedCursor(self._conn.cursor(), self._stats)
+
+    def _timed(self, name: str, method) -> None:
+        started = time.perf_counter()
+        try:
+            method()
+        finally:
+            self._stats.record(name, (time.perf_counter() - started) * 1000, calls=1, round_trips=1)
+
+    def commit(self) -> None:
+        self._timed('commit', self._conn.commit)
+
+    def rollback(self) -> None:
+        self._timed('rollback', self._conn.rollback)
+
+
+class TimedConnection:
+    """Envuelve el context manager de conexión de un backend (OracleConnection, SQLiteConnection)"""
+
+    def __init__(self, context, stats: RequestDbStats):
+        self._context = context
+        self._stats = stats
+
+    def __enter__(self):
+        started = time.perf_counter()
+        conn = self._context.__enter__()
+        self._stats.acquire_ms += (time.perf_counter() - started) * 1000
+        return _TimedSession(conn, self._stats)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._context.__exit__(exc_type, exc_val, exc_tb)
+
+
+def instrument(context):
+    """Context manager de conexión contabilizado si hay un request en curso"""
+    stats = current_stats()
+    return TimedConnection(context, stats) if stats is not None else context
+
+
+def _start_request() -> None:
+    g.db_stats = RequestDbStats()
+    g.request_started = time.perf_counter()
+
+
+def _publish_request(response):
+    stats = g.get('db_stats')
+    if stats is None or request.endpoint == 'static':
+        return response
+
+    total_ms = (time.perf_counter() - g.request_started) * 1000
+    app_ms = max(total_ms - stats.db_ms - stats.acquire_ms, 0.0)
+    response.headers.add('Server-Timing', ', '.join((
+        f'db;dur={stats.db_ms:.1f};desc="{stats.round_trips} round trips, {stats.rows} rows"',
+        f'db-acquire;dur={stats.acquire_ms:.1f}',
+        f'app;dur={app_ms:.1f}'
+    )))
+
+    record = {
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'ms': round(total_ms, 1),
+        'db_ms': round(stats.db_ms, 1),
+        'acquire_ms': round(stats.acquire_ms, 1),
+        'round_trips': stats.round_trips,
+        'rows': stats.rows,
+        'statements': {
+            name: {**entry, 'ms': round(entry['ms'], 1)}
+            for name, entry in stats.statements.items()
+        }
+    }
+    logger.info(f"request {json.dumps(record, ensure_ascii=False)}")
+    return response
+
+
+def init_request_stats(app: Flask) -> None:
+    """
+    Registra la contabilidad por request
+
+    Debe registrarse antes que init_request_scope: Flask ejecuta los
+    after_request en orden inverso, así el commit final queda contabilizado.
+    """
+    app.before_request(_start_request)
+    app.after_request(_publish_request)
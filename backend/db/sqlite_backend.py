@@ -0,0 +1,182 @@
+"""
+Backend SQLite (DB_BACKEND=sqlite) para despliegues locales sin red
+Misma interfaz que OracleConnection: los servicios ejecutan las sentencias de
+db/queries.py, que eligen su variante SQLite por el dialecto del cursor.
+
+- Una conexión persistente por thread (y por proceso: se reabre tras un fork),
+  con su cache de sentencias preparadas (DB_STMT_CACHE_SIZE)
+- WAL: lectores concurrentes con un escritor, commits sin reescribir la base
+- El esquema (db/sqlite_schema.sql) se aplica una vez por proceso
+
+Uso:
+    with SQLiteConnection() as conn:
+        with conn.cursor() as cursor:
+            rows = queries.CAREERS_ALL.execute(cursor).fetchall()
+"""
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from config import DATABASE_PATH, DB_STMT_CACHE_SIZE, SQLITE_BUSY_TIMEOUT_MS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = Path(__file__).resolve().parent / 'sqlite_schema.sql'
+
+# Columnas declaradas TIMESTAMP se leen como datetime (como en Oracle)
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode()))
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_pid = None
+
+
+def _open() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        DATABASE_PATH,
+        timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        cached_statements=DB_STMT_CACHE_SIZE,
+        check_same_thread=False
+    )
+    conn.execute('PRAGMA journal_mode=WAL')
+    # En WAL, NORMAL solo sincroniza en los checkpoints: durable salvo corte de energía
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+    _ensure_schema(conn)
+    return conn
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    global _schema_pid
+    if _schema_pid == os.getpid():
+        return
+    with _schema_lock:
+        if _schema_pid == os.getpid():
+            return
+        conn.executescript(SCHEMA_PATH.read_text(encoding='utf-8'))
+        _schema_pid = os.getpid()
+    logger.info(f"✅ Base SQLite lista en {DATABASE_PATH} (WAL)")
+
+
+def _thread_connection() -> sqlite3.Connection:
+    """Conexión del thread actual; un worker forkeado no reutiliza la del master"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.pid != os.getpid():
+        conn = _open()
+        _local.conn = conn
+        _local.pid = os.getpid()
+        _local.depth = 0
+    return conn
+
+
+class SQLiteCursor:
+    """
+    Cursor sqlite3 con la interfaz que usan los servicios (context manager)
+    Los atributos de ajuste de Oracle (arraysize, prefetchrows,
+    outputtypehandler) no aplican: Query no los asigna con este dialecto.
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._cursor = conn.cursor()
+
+    def begin_immediate(self) -> None:
+        """Toma el lock de escritura al iniciar la transacción (equivale a FOR UPDATE)"""
+        if not self._conn.in_transaction:
+            self._cursor.execute('BEGIN IMMEDIATE')
+
+    def execute(self, sql: str, params=None):
+        self._cursor.execute(sql, params or {})
+        return self
+
+    def executemany(self, sql: str, rows: list):
+        self._cursor.executemany(sql, rows)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size: int = None):
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self) -> None:
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+class _SQLiteSession:
+    """Vista de la conexión del thread que entregan los context managers"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    @property
+    def transaction_in_progress(self) -> bool:
+        """Mismo nombre que en oracledb: hay cambios sin commit o un BEGIN abierto"""
+        return self._conn.in_transaction
+
+    def cursor(self) -> SQLiteCursor:
+        return SQLiteCursor(self._conn)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+
+
+class SQLiteConnection:
+    """
+    Context manager equivalente a OracleConnection sobre la conexión del thread
+
+    Al salir del bloque más externo se descarta la transacción que haya
+    quedado abierta sin commit (como al devolver una conexión al pool).
+    Los bloques anidados en el mismo thread comparten la conexión.
+    """
+
+    def __enter__(self):
+        self.conn = _thread_connection()
+        _local.depth += 1
+        return _SQLiteSession(self.conn)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _local.depth -= 1
+        if _local.depth == 0 and self.conn.in_transaction:
+            self.conn.rollback()
+        return False
+
+
+def close_thread_connection() -> None:
+    """Cierra la conexión del thread actual (se reabre en el próximo uso)"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.pid == os.getpid():
+        conn.close()
+    _local.conn = None
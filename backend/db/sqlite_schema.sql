@@ -0,0 +1,143 @@
+-- Esquema SQLite (DB_BACKEND=sqlite): mismas tablas y columnas que usan las
+-- sentencias de db/queries.py en Oracle. Idempotente: se aplica al abrir la
+-- primera conexión de cada proceso.
+-- Fechas: DIA como texto 'YYYY-MM-DD'; TIMESTAMP se convierte a datetime al leer.
+
+-- ─── Referencia (copiada desde Oracle con python -m db.sqlite_sync) ───
+
+CREATE TABLE IF NOT EXISTS CARRERAS_NUEVO (
+    ID INTEGER PRIMARY KEY,
+    CARRERA TEXT,
+    DESCRIPCION TEXT,
+    AFINIDAD TEXT,
+    URL TEXT
+);
+
+CREATE TABLE IF NOT EXISTS SKILLS (
+    ID INTEGER PRIMARY KEY,
+    NOMBRE TEXT
+);
+
+CREATE TABLE IF NOT EXISTS CARRERAS_SKILLS (
+    ID INTEGER PRIMARY KEY,
+    FK_CARRERA INTEGER,
+    FK_SKILLS INTEGER
+);
+CREATE INDEX IF NOT EXISTS IX_CARRERAS_SKILLS_CARRERA ON CARRERAS_SKILLS (FK_CARRERA);
+
+CREATE TABLE IF NOT EXISTS TAREAS (
+    ID INTEGER PRIMARY KEY,
+    NOMBRE TEXT
+);
+
+CREATE TABLE IF NOT EXISTS CARRERA_TAREAS (
+    ID INTEGER PRIMARY KEY,
+    FK_CARRERA INTEGER,
+    FK_TAREA INTEGER
+);
+CREATE INDEX IF NOT EXISTS IX_CARRERA_TAREAS_CARRERA ON CARRERA_TAREAS (FK_CARRERA);
+
+CREATE TABLE IF NOT EXISTS ASESORES (
+    ID INTEGER PRIMARY KEY,
+    NOMBRE TEXT,
+    APELLIDO TEXT,
+    FK_CARRERA INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS CATEGORIAS_RIASEC (
+    ID INTEGER PRIMARY KEY,
+    CATEGORY_NAME TEXT
+);
+
+CREATE TABLE IF NOT EXISTS AFIRMACIONES (
+    ID INTEGER PRIMARY KEY,
+    AFIRMACION_DSC TEXT,
+    FK_RIASEC INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS MODELO_CONVERSIONES (
+    ID INTEGER PRIMARY KEY,
+    OCUPACION TEXT,
+    REALISTIC REAL,
+    INVESTIGATIVE REAL,
+    ARTISTIC REAL,
+    SOCIAL REAL,
+    ENTERPRISING REAL,
+    CONVENTIONAL REAL,
+    POSIBLES_CARRERAS TEXT
+);
+
+CREATE TABLE IF NOT EXISTS MATCH_OCUPACION_CARRERA (
+    ID_OCUPACION INTEGER,
+    ID_CARRERA INTEGER,
+    RELEVANCIA INTEGER
+);
+CREATE INDEX IF NOT EXISTS IX_MATCH_OCUPACION ON MATCH_OCUPACION_CARRERA (ID_OCUPACION, RELEVANCIA);
+
+-- ─── Datos de la aplicación ───
+
+CREATE TABLE IF NOT EXISTS USUARIO (
+    ID INTEGER PRIMARY KEY,
+    NOMBRE TEXT,
+    APELLIDO TEXT,
+    CORREO TEXT UNIQUE,
+    PASSWORD TEXT
+);
+
+CREATE TABLE IF NOT EXISTS USUARIO_AFIRMACION_RPTA (
+    USUARIO_ID INTEGER NOT NULL,
+    AFIRMACION_ID INTEGER NOT NULL,
+    RIASEC_ID INTEGER,
+    ESTAMPA TIMESTAMP,
+    PRIMARY KEY (USUARIO_ID, AFIRMACION_ID)
+);
+
+CREATE TABLE IF NOT EXISTS USUARIO_PERFIL_RIASEC (
+    USUARIO_ID INTEGER NOT NULL,
+    CATEGORY_NAME TEXT NOT NULL,
+    SUMA INTEGER DEFAULT 0 NOT NULL,
+    CANTIDAD INTEGER DEFAULT 0 NOT NULL,
+    FECHA_ACTUALIZACION TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (USUARIO_ID, CATEGORY_NAME)
+);
+
+CREATE TABLE IF NOT EXISTS ASESORIA_USUARIO (
+    ID INTEGER PRIMARY KEY,
+    FK_ASESOR INTEGER,
+    FK_USUARIO INTEGER,
+    DIA TEXT,
+    HORA TEXT,
+    LINK TEXT,
+    UNIQUE (FK_ASESOR, DIA, HORA)
+);
+CREATE INDEX IF NOT EXISTS IX_ASESORIA_USUARIO_USUARIO ON ASESORIA_USUARIO (FK_USUARIO, DIA);
+
+CREATE TABLE IF NOT EXISTS USUARIO_NPS (
+    USUARIO_ID INTEGER PRIMARY KEY,
+    TIEMPO_ACUMULADO REAL DEFAULT 0,
+    ULTIMA_FECHA_VISTO TIMESTAMP,
+    RESPUESTA_PAGINA INTEGER,
+    RESPUESTA_TEST INTEGER,
+    ESTADO INTEGER DEFAULT 0,
+    FECHA_RESPUESTA TIMESTAMP,
+    FECHA_CREACION TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS VISITAS (
+    VISITOR_ID TEXT PRIMARY KEY,
+    PAGINA TEXT,
+    USER_AGENT TEXT,
+    IP_ADDRESS TEXT,
+    DEVICE_TYPE TEXT,
+    PRIMERA_VISITA TIMESTAMP,
+    ULTIMA_VISITA TIMESTAMP,
+    CANTIDAD_VISITAS INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS test_results (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    email TEXT,
+    result_career TEXT,
+    scores TEXT
+);
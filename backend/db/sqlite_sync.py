@@ -0,0 +1,118 @@
+"""
+Copia las tablas de referencia de Oracle a la base SQLite (DB_BACKEND=sqlite)
+Carreras, skills, tareas, asesores, afirmaciones y el modelo de ocupaciones:
+lo que un laboratorio necesita para atender el test sin red. Los datos de la
+aplicación (usuarios, respuestas, asesorías, NPS, visitas) son locales.
+
+Cada tabla se reemplaza completa en una transacción, leyendo de Oracle en
+lotes de --batch filas e insertando cada lote con un executemany sobre la
+misma sentencia preparada.
+
+Uso (con las variables ORACLE_* configuradas):
+    python -m db.sqlite_sync [--batch 5000] [--tables SKILLS TAREAS ...]
+"""
+import argparse
+import logging
+import sqlite3
+import time
+import oracledb
+from config import DATABASE_PATH
+from db import queries
+from db.db_config import OracleConnection, close_pool
+from db.sqlite_backend import SQLiteConnection
+
+logger = logging.getLogger(__name__)
+
+# Tabla -> columnas usadas por las sentencias de db/queries.py
+REFERENCE_TABLES = {
+    'CARRERAS_NUEVO': ('ID', 'CARRERA', 'DESCRIPCION', 'AFINIDAD', 'URL'),
+    'SKILLS': ('ID', 'NOMBRE'),
+    'CARRERAS_SKILLS': ('FK_CARRERA', 'FK_SKILLS'),
+    'TAREAS': ('ID', 'NOMBRE'),
+    'CARRERA_TAREAS': ('FK_CARRERA', 'FK_TAREA'),
+    'ASESORES': ('ID', 'NOMBRE', 'APELLIDO', 'FK_CARRERA'),
+    'CATEGORIAS_RIASEC': ('ID', 'CATEGORY_NAME'),
+    'AFIRMACIONES': ('ID', 'AFIRMACION_DSC', 'FK_RIASEC'),
+    'MODELO_CONVERSIONES': ('ID', 'OCUPACION', 'REALISTIC', 'INVESTIGATIVE', 'ARTISTIC',
+                            'SOCIAL', 'ENTERPRISING', 'CONVENTIONAL', 'POSIBLES_CARRERAS'),
+    'MATCH_OCUPACION_CARRERA': ('ID_OCUPACION', 'ID_CARRERA', 'RELEVANCIA'),
+}
+
+DEFAULT_BATCH = 5000
+
+
+def _sync_queries(table: str, columns: tuple) -> tuple:
+    """Sentencias de lectura (Oracle) y escritura (SQLite) de una tabla"""
+    column_list = ', '.join(columns)
+    select = queries.Query(f'sync.select_{table.lower()}', f"""
+        SELECT {column_list} FROM {{schema}}.{table}
+    """, arraysize=DEFAULT_BATCH, prefetchrows=DEFAULT_BATCH)
+    insert = queries.Query(f'sync.insert_{table.lower()}', f"""
+        INSERT INTO {{schema}}.{table} ({column_list})
+        VALUES ({', '.join(f':{column.lower()}' for column in columns)})
+    """)
+    return select, insert
+
+
+SYNC_QUERIES = {table: _sync_queries(table, columns) for table, columns in REFERENCE_TABLES.items()}
+
+
+def sync_table(table: str, batch: int = DEFAULT_BATCH) -> int:
+    """
+    Reemplaza una tabla de referencia de SQLite con el contenido de Oracle
+
+    Returns:
+        Cantidad de filas copiadas
+    """
+    select, insert = SYNC_QUERIES[table]
+    keys = [column.lower() for column in REFERENCE_TABLES[table]]
+    copied = 0
+
+    with OracleConnection() as source, SQLiteConnection() as target:
+        with source.cursor() as reader, target.cursor() as writer:
+            select.execute(reader)
+            writer.execute(f"DELETE FROM main.{table}")
+            while True:
+                rows = reader.fetchmany(batch)
+                if not rows:
+                    break
+                insert.executemany(writer, [dict(zip(keys, row)) for row in rows])
+                copied += len(rows)
+        target.commit()
+    return copied
+
+
+def sync_reference_data(tables: list = None, batch: int = DEFAULT_BATCH) -> dict:
+    """
+    Copia las tablas de referencia indicadas (todas por defecto)
+
+    Returns:
+        dict {tabla: filas copiadas}
+    """
+    # POSIBLES_CARRERAS es CLOB: leerlo como str en el mismo round trip
+    oracledb.defaults.fetch_lobs = False
+    result = {}
+    try:
+        for table in tables or REFERENCE_TABLES:
+            started = time.perf_counter()
+            result[table] = sync_table(table, batch)
+            logger.info(f"{table}: {result[table]} filas en "
+                        f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    finally:
+        close_pool()
+    return result
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Copia las tablas de referencia de Oracle a SQLite')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, help='Filas por lote')
+    parser.add_argument('--tables', nargs='+', choices=sorted(REFERENCE_TABLES), help='Tablas a copiar')
+    args = parser.parse_args()
+
+    try:
+        copied = sync_reference_data(args.tables, args.batch)
+    except (oracledb.Error, sqlite3.Error) as e:
+        raise SystemExit(f"Error sincronizando {DATABASE_PATH}: {str(e)}")
+    print(f"Base SQLite {DATABASE_PATH}: " + ', '.join(f"{table}={rows}" for table, rows in copied.items()))
@@ -17,6 +17,7 @@ from controllers.predictions_controller import PredictionsController
 from controllers.visits_controller import VisitsController
 from controllers.upload_controller import UploadController
 from controllers.nps_controller import NpsController
+from controllers.metrics_controller import MetricsController
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -85,6 +86,16 @@ api_bp.add_url_rule('/save-answers', 'save_answers',
 # Predictions endpoints
 api_bp.add_url_rule('/predict-careers', 'predict_careers',
                     PredictionsController.predict_careers, methods=['POST'])
+api_bp.add_url_rule('/predict-careers/anonymous', 'predict_careers_anonymous',
+                    PredictionsController.predict_careers_anonymous, methods=['POST'])
+api_bp.add_url_rule('/predict-careers/batch', 'predict_careers_batch',
+                    PredictionsController.predict_careers_batch, methods=['POST'])
+api_bp.add_url_rule('/predict-careers/what-if', 'predict_what_if',
+                    PredictionsController.predict_what_if, methods=['POST'])
+api_bp.add_url_rule('/predict-careers/refresh-index', 'refresh_match_index',
+                    PredictionsController.refresh_match_index, methods=['POST'])
+api_bp.add_url_rule('/predict-careers/reload-model', 'reload_model',
+                    PredictionsController.reload_model, methods=['POST'])
 api_bp.add_url_rule('/occupations', 'get_occupations',
                     PredictionsController.get_occupations, methods=['GET'])
 
@@ -140,6 +151,10 @@ api_bp.add_url_rule('/nps/submit', 'nps_submit',
 api_bp.add_url_rule('/nps/status', 'nps_status',
                     NpsController.get_status, methods=['GET'])
 
+# Metrics endpoints (solo administradores)
+api_bp.add_url_rule('/metrics', 'get_metrics',
+                    MetricsController.get_metrics, methods=['GET'])
+
 
 # Image proxy endpoint (sirve imágenes desde OCI sin problemas CORS)
 @api_bp.route('/image/proxy', methods=['GET'])
@@ -0,0 +1,102 @@
+"""
+Test adaptativo: corte temprano cuando el top de ocupaciones ya no puede cambiar
+Con las respuestas parciales, cada categoría RIASEC terminará con un promedio
+dentro de un intervalo (las preguntas pendientes pueden valer de 1 a 5), así
+que el vector final del usuario está en una caja. Para la similitud coseno,
+la ocupación a supera a b si (â - b̂)·v > 0 (la norma de v es común a ambas):
+una función lineal de v, cuyo mínimo sobre la caja es exacto y vectorizable,
+
+    min (â - b̂)·v = (â - b̂)·centro - |â - b̂|·radio
+
+Si ese mínimo es positivo para cada ocupación del top contra todas las demás,
+el top es el mismo para cualquier combinación de respuestas pendientes.
+
+Respuestas pendientes "plausibles": dentro de ±spread del promedio que el
+alumno ya dio en la categoría (spread <= 0: cualquier valor 1-5, cota de peor
+caso). El promedio parcial siempre queda dentro de la caja, así que el top
+estable es también el que verá el alumno si el test se corta.
+"""
+import numpy as np
+from services.similarity_engine import RIASEC_ORDER
+
+# Escala de las respuestas del test
+ANSWER_MIN = 1
+ANSWER_MAX = 5
+
+
+def profile_bounds(totals: dict, items_per_category: dict, spread: float = 0) -> tuple:
+    """
+    Intervalo del promedio final de cada categoría dadas las respuestas parciales
+
+    Args:
+        totals: dict {sigla: (suma, cantidad)} de las respuestas guardadas
+        items_per_category: dict {sigla: afirmaciones de la categoría en el test}
+        spread: desvío plausible de cada respuesta pendiente respecto al promedio
+                ya respondido en la categoría (<= 0: rango completo 1-5)
+
+    Returns:
+        tuple (lo, hi) np.ndarray (6,) en escala 1-5, en orden RIASEC
+    """
+    lo = np.empty(len(RIASEC_ORDER))
+    hi = np.empty(len(RIASEC_ORDER))
+    for position, code in enumerate(RIASEC_ORDER):
+        suma, cantidad = totals.get(code, (0, 0))
+        items = max(items_per_category.get(code, 0), cantidad)
+        if items == 0:
+            # Categoría sin afirmaciones en el test: neutra (como en la predicción)
+            lo[position] = hi[position] = 3
+            continue
+        pending = items - cantidad
+        low, high = ANSWER_MIN, ANSWER_MAX
+        if spread > 0 and cantidad > 0:
+            mean = suma / cantidad
+            low, high = max(ANSWER_MIN, mean - spread), min(ANSWER_MAX, mean + spread)
+        lo[position] = (suma + low * pending) / items
+        hi[position] = (suma + high * pending) / items
+    return lo, hi
+
+
+def top_k_stability(unit_matrix: np.ndarray, lo: np.ndarray, hi: np.ndarray, k: int = 3) -> dict:
+    """
+    Verifica si el top-k por coseno es el mismo en toda la caja [lo, hi]
+
+    Args:
+        unit_matrix: np.ndarray (n, 6) con las ocupaciones normalizadas
+        lo, hi: límites (6,) del vector del usuario en la escala del modelo
+        k: tamaño del top a estabilizar
+
+    Returns:
+        dict con 'top' (índices en orden descendente en el centro de la caja),
+        'stable' (el conjunto del top no puede cambiar), 'order_stable' (tampoco
+        su orden) y 'margin' (peor margen lineal del top contra el resto)
+    """
+    center = ((lo + hi) / 2).astype(np.float32)
+    radius = ((hi - lo) / 2).astype(np.float32)
+    n = unit_matrix.shape[0]
+    k = min(k, n)
+
+    scores = unit_matrix @ center
+    top = np.argsort(-scores, kind='stable')[:k]
+    if k == n:
+        return {'top': top, 'stable': True, 'order_stable': k <= 1, 'margin': None}
+
+    outside = np.ones(n, dtype=bool)
+    outside[top] = False
+    others = unit_matrix[outside]
+
+    margin = np.inf
+    for row in top:
+        # Peor caso de (â - b̂)·v sobre la caja para todas las b fuera del top
+        diff = unit_matrix[row] - others
+        worst = diff @ center - np.abs(diff) @ radius
+        margin = min(margin, float(worst.min()))
+
+    order_stable = True
+    for i in range(k - 1):
+        diff = unit_matrix[top[i]] - unit_matrix[top[i + 1]]
+        if float(diff @ center - np.abs(diff) @ radius) <= 0:
+            order_stable = False
+            break
+
+    stable = margin > 0
+    return {'top': top, 'stable': stable, 'order_stable': stable and order_stable, 'margin': margin}
@@ -4,8 +4,9 @@ Usa las tablas: ASESORES, ASESORIA_USUARIO, USUARIO, CARRERAS_NUEVO
 """
 import logging
 from datetime import datetime
-from db.db_config import OracleConnection
-from config import ORACLE_SCHEMA, ADVISORY_START_HOUR, ADVISORY_END_HOUR, ADVISORY_INTERVAL_MINUTES
+from db import queries
+from db.db_config import get_connection
+from config import ADVISORY_START_HOUR, ADVISORY_END_HOUR, ADVISORY_INTERVAL_MINUTES
 from utils.errors import DatabaseError
 
 logger = logging.getLogger(__name__)
@@ -23,17 +24,9 @@ class AdvisoryService:
         JOIN ASESORES ↔ CARRERAS_NUEVO
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(
-                        f"""SELECT a.ID, a.NOMBRE, a.APELLIDO,
-                                   c.ID AS CARRERA_ID, c.CARRERA AS CARRERA_NOMBRE
-                            FROM {ORACLE_SCHEMA}.ASESORES a
-                            LEFT JOIN {ORACLE_SCHEMA}.CARRERAS_NUEVO c
-                              ON a.FK_CARRERA = c.ID
-                            ORDER BY a.NOMBRE"""
-                    )
-                    rows = cursor.fetchall()
+                    rows = queries.ADVISORS_ALL.execute(cursor).fetchall()
                     return [
                         {
                             'id': row[0],
@@ -52,18 +45,9 @@ class AdvisoryService:
     def get_advisor_by_id(advisor_id: int) -> dict:
         """Obtener un asesor por su ID"""
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(
-                        f"""SELECT a.ID, a.NOMBRE, a.APELLIDO,
-                                   c.ID AS CARRERA_ID, c.CARRERA AS CARRERA_NOMBRE
-                            FROM {ORACLE_SCHEMA}.ASESORES a
-                            LEFT JOIN {ORACLE_SCHEMA}.CARRERAS_NUEVO c
-                              ON a.FK_CARRERA = c.ID
-                            WHERE a.ID = :advisor_id""",
-                        {'advisor_id': advisor_id}
-                    )
-                    row = cursor.fetchone()
+                    row = queries.ADVISOR_BY_ID.execute(cursor, {'advisor_id': advisor_id}).fetchone()
                     if not row:
                         return None
                     return {
@@ -86,24 +70,12 @@ class AdvisoryService:
         Opcionalmente filtrados por asesor.
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     if advisor_id:
-                        cursor.execute(
-                            f"""SELECT TO_CHAR(DIA, 'YYYY-MM-DD'), HORA
-                                FROM {ORACLE_SCHEMA}.ASESORIA_USUARIO
-                                WHERE FK_ASESOR = :advisor_id
-                                  AND DIA >= TRUNC(SYSDATE)
-                                ORDER BY DIA, HORA""",
-                            {'advisor_id': advisor_id}
-                        )
+                        queries.BOOKED_SLOTS_BY_ADVISOR.execute(cursor, {'advisor_id': advisor_id})
                     else:
-                        cursor.execute(
-                            f"""SELECT TO_CHAR(DIA, 'YYYY-MM-DD'), HORA
-                                FROM {ORACLE_SCHEMA}.ASESORIA_USUARIO
-                                WHERE DIA >= TRUNC(SYSDATE)
-                                ORDER BY DIA, HORA"""
-                        )
+                        queries.BOOKED_SLOTS.execute(cursor)
                     return [
                         f"{row[0]} {row[1]}" for row in cursor.fetchall()
                     ]
@@ -119,15 +91,9 @@ class AdvisoryService:
         ADVISORY_INTERVAL_MINUTES y excluye los ya reservados.
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(
-                        f"""SELECT HORA
-                            FROM {ORACLE_SCHEMA}.ASESORIA_USUARIO
-                            WHERE FK_ASESOR = :advisor_id
-                              AND TO_CHAR(DIA, 'YYYY-MM-DD') = :fecha""",
-                        {'advisor_id': advisor_id, 'fecha': date_str}
-                    )
+                    queries.BOOKED_TIMES_BY_DAY.execute(cursor, {'advisor_id': advisor_id, 'fecha': date_str})
                     booked_times = [str(row[0]).strip() for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Error obteniendo horarios: {e}")
@@ -162,31 +128,19 @@ class AdvisoryService:
             dict con info de la asesoría creada
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Verificar que no exista ya una reserva en ese horario para el asesor
-                    cursor.execute(
-                        f"""SELECT COUNT(*)
-                            FROM {ORACLE_SCHEMA}.ASESORIA_USUARIO
-                            WHERE FK_ASESOR = :advisor_id
-                              AND TO_CHAR(DIA, 'YYYY-MM-DD') = :fecha
-                              AND HORA = :hora""",
-                        {'advisor_id': advisor_id, 'fecha': date_str, 'hora': time_str}
-                    )
-                    count = cursor.fetchone()[0]
+                    count = queries.ADVISOR_SLOT_TAKEN.execute(
+                        cursor, {'advisor_id': advisor_id, 'fecha': date_str, 'hora': time_str}
+                    ).fetchone()[0]
                     if count > 0:
                         raise DatabaseError("Este horario ya está reservado para este asesor")
 
                     # Verificar que el usuario no tenga otra asesoría en la misma fecha y hora
-                    cursor.execute(
-                        f"""SELECT COUNT(*)
-                            FROM {ORACLE_SCHEMA}.ASESORIA_USUARIO
-                            WHERE FK_USUARIO = :user_id
-                              AND TO_CHAR(DIA, 'YYYY-MM-DD') = :fecha
-                              AND HORA = :hora""",
-                        {'user_id': user_id, 'fecha': date_str, 'hora': time_str}
-                    )
-                    count = cursor.fetchone()[0]
+                    count = queries.USER_SLOT_TAKEN.execute(
+                        cursor, {'user_id': user_id, 'fecha': date_str, 'hora': time_str}
+                    ).fetchone()[0]
                     if count > 0:
                         raise DatabaseError("Ya tienes una asesoría agendada en ese horario")
 
@@ -194,10 +148,8 @@ class AdvisoryService:
                     link = "https://ulima-edu-pe.zoom.us/j/6595549038?pwd=bUY0ZkdSOXk5UHU5UVBRV1JuM2VyUT09"
 
                     # Insertar la asesoría
-                    cursor.execute(
-                        f"""INSERT INTO {ORACLE_SCHEMA}.ASESORIA_USUARIO
-                            (FK_ASESOR, FK_USUARIO, DIA, HORA, LINK)
-                            VALUES (:advisor_id, :user_id, TO_DATE(:fecha, 'YYYY-MM-DD'), :hora, :link)""",
+                    queries.BOOKING_INSERT.execute(
+                        cursor,
                         {
                             'advisor_id': advisor_id,
                             'user_id': user_id,
@@ -233,25 +185,9 @@ class AdvisoryService:
         JOIN con ASESORES y CARRERAS_NUEVO para info completa.
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(
-                        f"""SELECT au.ID,
-                                   TO_CHAR(au.DIA, 'YYYY-MM-DD') AS DIA,
-                                   au.HORA,
-                                   au.LINK,
-                                   a.NOMBRE AS ASESOR_NOMBRE,
-                                   a.APELLIDO AS ASESOR_APELLIDO,
-                                   c.CARRERA AS CARRERA_NOMBRE
-                            FROM {ORACLE_SCHEMA}.ASESORIA_USUARIO au
-                            JOIN {ORACLE_SCHEMA}.ASESORES a ON au.FK_ASESOR = a.ID
-                            LEFT JOIN {ORACLE_SCHEMA}.CARRERAS_NUEVO c ON a.FK_CARRERA = c.ID
-                            WHERE au.FK_USUARIO = :user_id
-                              AND au.DIA >= TRUNC(SYSDATE)
-                            ORDER BY au.DIA, au.HORA""",
-                        {'user_id': user_id}
-                    )
-                    rows = cursor.fetchall()
+                    rows = queries.USER_BOOKINGS.execute(cursor, {'user_id': user_id}).fetchall()
                     return [
                         {
                             'id': row[0],
@@ -277,13 +213,9 @@ class AdvisoryService:
         Solo permite cancelar asesorías propias.
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(
-                        f"""DELETE FROM {ORACLE_SCHEMA}.ASESORIA_USUARIO
-                            WHERE ID = :booking_id AND FK_USUARIO = :user_id""",
-                        {'booking_id': booking_id, 'user_id': user_id}
-                    )
+                    queries.BOOKING_DELETE.execute(cursor, {'booking_id': booking_id, 'user_id': user_id})
                     deleted = cursor.rowcount
                     conn.commit()
 
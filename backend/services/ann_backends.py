@@ -0,0 +1,268 @@
+"""
+Backends intercambiables de vecinos más cercanos para el modelo de ocupaciones
+Todos exponen la interfaz de SimilarityEngine (top_k / top_k_batch devuelven
+índices de fila y similitud coseno en orden descendente) más build_seconds y
+nbytes (memoria adicional al motor). Se elige con PREDICTION_BACKEND:
+
+    exact     recorrido completo (producto matriz-vector + argpartition)
+    holland   índice invertido por código Holland (services.holland_index)
+    balltree  BallTree de scikit-learn sobre los vectores unitarios (exacto)
+    lsh       random projection LSH (hiperplanos aleatorios + multiprobe)
+    auto      holland desde HOLLAND_INDEX_MIN_OCCUPATIONS ocupaciones, exact si no
+
+Reporte de construcción, memoria, latencia y recall@k contra el recorrido completo:
+    python -m services.ann_backends [--synthetic N] [--samples N] [--backends exact,lsh,...]
+"""
+import argparse
+import logging
+import time
+import numpy as np
+from config import (
+    HOLLAND_INDEX_MIN_OCCUPATIONS,
+    HOLLAND_MIN_SHARED,
+    HOLLAND_MIN_CANDIDATES,
+    LSH_TABLES,
+    LSH_BITS
+)
+from services.holland_index import HollandIndex, sample_user_vectors, synthetic_engine
+from services.similarity_engine import SimilarityEngine, recall_at_k
+
+logger = logging.getLogger(__name__)
+
+
+class ExactBackend:
+    """Recorrido completo sobre el motor (referencia para el recall)"""
+
+    name = 'exact'
+
+    def __init__(self, engine: SimilarityEngine):
+        self.engine = engine
+        self.build_seconds = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return 0
+
+    def top_k(self, user_vector, k: int = 5) -> tuple:
+        return self.engine.top_k(user_vector, k)
+
+    def top_k_batch(self, user_matrix, k: int = 5) -> tuple:
+        return self.engine.top_k_batch(user_matrix, k)
+
+
+class HollandBackend(HollandIndex):
+    """Índice Holland con los umbrales de config"""
+
+    name = 'holland'
+
+    def __init__(self, engine: SimilarityEngine):
+        super().__init__(engine, min_shared=HOLLAND_MIN_SHARED, min_candidates=HOLLAND_MIN_CANDIDATES)
+
+
+class BallTreeBackend:
+    """
+    BallTree (distancia euclídea) sobre las filas unitarias: en vectores de
+    norma 1, ||a - b||² = 2 - 2·cos(a, b), así que el orden coincide con el coseno
+    """
+
+    name = 'balltree'
+    leaf_size = 40
+
+    def __init__(self, engine: SimilarityEngine):
+        # Dependencia opcional: solo se importa si se elige este backend
+        from sklearn.neighbors import BallTree
+
+        self.engine = engine
+        started = time.perf_counter()
+        self.tree = BallTree(engine.unit_matrix, leaf_size=self.leaf_size)
+        self.build_seconds = time.perf_counter() - started
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.tree.get_arrays())
+
+    def top_k_batch(self, user_matrix, k: int = 5) -> tuple:
+        unit_users = SimilarityEngine._normalize_rows(np.atleast_2d(user_matrix))
+        k = min(k, self.engine.size)
+        _, indices = self.tree.query(unit_users, k=k, sort_results=True)
+        # Similitud exacta de los vecinos (vale también para filas de norma 0)
+        similarities = np.einsum('mkd,md->mk', self.engine.unit_matrix[indices], unit_users)
+        return indices, similarities.astype(np.float32)
+
+    def top_k(self, user_vector, k: int = 5) -> tuple:
+        indices, similarities = self.top_k_batch(user_vector, k)
+        return indices[0], similarities[0]
+
+
+class LshBackend:
+    """
+    Random projection LSH: LSH_TABLES tablas de LSH_BITS hiperplanos aleatorios
+    sobre los vectores unitarios centrados (todos los perfiles son positivos y
+    caen en un cono estrecho; centrar hace que los hiperplanos los separen).
+    Cada consulta prueba su cubeta y las que difieren en un bit en cada tabla,
+    y rankea exactamente la unión de candidatos. Con menos de min_candidates
+    candidatos recurre al recorrido completo.
+    """
+
+    name = 'lsh'
+    min_candidates = 50
+    seed = 0
+
+    def __init__(self, engine: SimilarityEngine, tables: int = LSH_TABLES, bits: int = LSH_BITS):
+        self.engine = engine
+        self.tables = tables
+        self.bits = bits
+
+        started = time.perf_counter()
+        rng = np.random.default_rng(self.seed)
+        self.center = engine.unit_matrix.mean(axis=0).astype(np.float32)
+        self.planes = rng.standard_normal((tables, bits, engine.unit_matrix.shape[1])).astype(np.float32)
+        self._powers = np.left_shift(1, np.arange(bits), dtype=np.int64)
+
+        codes = self._hash(engine.unit_matrix)               # (tables, n)
+        self.orders = np.argsort(codes, axis=1, kind='stable').astype(np.int32)
+        self.sorted_codes = np.take_along_axis(codes, self.orders.astype(np.intp), axis=1)
+        self._probe_masks = np.concatenate(([0], self._powers))
+        self.build_seconds = time.perf_counter() - started
+
+    @property
+    def nbytes(self) -> int:
+        return self.orders.nbytes + self.sorted_codes.nbytes + self.planes.nbytes
+
+    def _hash(self, unit_vectors: np.ndarray) -> np.ndarray:
+        """Códigos (tables, m) de vectores unitarios"""
+        centered = np.atleast_2d(unit_vectors) - self.center
+        signs = np.einsum('tbd,md->tmb', self.planes, centered) > 0
+        return signs.astype(np.int64) @ self._powers
+
+    def _candidates(self, unit_user: np.ndarray) -> np.ndarray:
+        """Filas candidatas: cubeta del usuario y vecinas a un bit en cada tabla"""
+        codes = self._hash(unit_user)[:, 0]
+        # Marcar en un buffer booleano es más barato que np.unique sobre la unión
+        selected = np.zeros(self.engine.size, dtype=bool)
+        for table in range(self.tables):
+            probes = codes[table] ^ self._probe_masks
+            lo = np.searchsorted(self.sorted_codes[table], probes, side='left')
+            hi = np.searchsorted(self.sorted_codes[table], probes, side='right')
+            for start, end in zip(lo, hi):
+                selected[self.orders[table, start:end]] = True
+        return np.flatnonzero(selected)
+
+    def top_k(self, user_vector, k: int = 5) -> tuple:
+        unit_user = SimilarityEngine._normalize_rows(np.atleast_2d(user_vector))
+        candidates = self._candidates(unit_user)
+        if len(candidates) < max(self.min_candidates, k):
+            return self.engine.top_k(user_vector, k)
+
+        similarities = self.engine.unit_matrix[candidates] @ unit_user[0]
+        positions = SimilarityEngine.select_top_k(similarities, k)
+        return candidates[positions].astype(np.intp), similarities[positions]
+
+    def top_k_batch(self, user_matrix, k: int = 5) -> tuple:
+        user_matrix = np.atleast_2d(user_matrix)
+        k = min(k, self.engine.size)
+        indices = np.empty((len(user_matrix), k), dtype=np.intp)
+        similarities = np.empty((len(user_matrix), k), dtype=np.float32)
+        for row, user_vector in enumerate(user_matrix):
+            indices[row], similarities[row] = self.top_k(user_vector, k)
+        return indices, similarities
+
+
+BACKENDS = {
+    'exact': ExactBackend,
+    'holland': HollandBackend,
+    'balltree': BallTreeBackend,
+    'lsh': LshBackend
+}
+
+
+def resolve_backend_name(name: str, engine: SimilarityEngine) -> str:
+    """Traduce 'auto' al backend adecuado para el tamaño del modelo"""
+    name = (name or 'auto').lower()
+    if name == 'auto':
+        return 'holland' if 0 < HOLLAND_INDEX_MIN_OCCUPATIONS <= engine.size else 'exact'
+    return name
+
+
+def build_backend(name: str, engine: SimilarityEngine):
+    """
+    Construye el backend pedido sobre el motor
+
+    Raises:
+        ValueError: si el nombre no corresponde a ningún backend
+        ImportError: si falta la dependencia opcional del backend
+    """
+    name = resolve_backend_name(name, engine)
+    backend_cls = BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(f"Backend de predicción desconocido: {name} (opciones: {', '.join(BACKENDS)}, auto)")
+
+    backend = backend_cls(engine)
+    logger.info(f"Backend de predicción '{backend.name}': {engine.size} ocupaciones, "
+                f"construido en {backend.build_seconds:.3f}s, {backend.nbytes} bytes adicionales")
+    return backend
+
+
+def evaluate_backends(engine: SimilarityEngine, user_vectors, k: int = 5, names=tuple(BACKENDS)) -> list:
+    """
+    Construye cada backend y lo compara contra el recorrido completo
+
+    Returns:
+        list de dicts con backend, build_seconds, nbytes, recall, p50_ms y p99_ms
+        (o error si el backend no pudo construirse)
+    """
+    user_vectors = np.atleast_2d(user_vectors)
+    exact = np.array([engine.top_k(u, k)[0] for u in user_vectors])
+
+    report = []
+    for name in names:
+        try:
+            backend = build_backend(name, engine)
+        except (ImportError, ValueError) as e:
+            report.append({'backend': name, 'error': str(e)})
+            continue
+
+        latencies = []
+        approx = []
+        for u in user_vectors:
+            started = time.perf_counter()
+            indices, _ = backend.top_k(u, k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            approx.append(indices)
+
+        report.append({
+            'backend': backend.name,
+            'build_seconds': backend.build_seconds,
+            'nbytes': backend.nbytes,
+            'recall': recall_at_k(exact, np.array(approx)),
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99))
+        })
+    return report
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Comparación de backends de predicción')
+    parser.add_argument('--samples', type=int, default=1000, help='perfiles de usuario simulados')
+    parser.add_argument('--k', type=int, default=5, help='tamaño del top-k')
+    parser.add_argument('--backends', default=','.join(BACKENDS), help='backends a comparar (separados por coma)')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='usar un modelo aleatorio con N ocupaciones en lugar del de la BD')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        engine = synthetic_engine(args.synthetic)
+    else:
+        from services.predictions_service import PredictionsService
+        engine = PredictionsService.get_similarity_engine()
+
+    print(f"Ocupaciones: {engine.size} | perfiles: {args.samples} | k={args.k}")
+    print(f"{'backend':>9} {'build s':>8} {'memoria':>11} {f'recall@{args.k}':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for row in evaluate_backends(engine, sample_user_vectors(args.samples), args.k, args.backends.split(',')):
+        if 'error' in row:
+            print(f"{row['backend']:>9} no disponible: {row['error']}")
+            continue
+        print(f"{row['backend']:>9} {row['build_seconds']:>8.3f} {row['nbytes']:>11} "
+              f"{row['recall']:>9.4f} {row['p50_ms']:>8.4f} {row['p99_ms']:>8.4f}")
@@ -6,8 +6,8 @@ Gestiona registro y login de usuarios con contraseñas hasheadas
 import hashlib
 import logging
 from datetime import datetime
-from db.db_config import OracleConnection
-from config import ORACLE_SCHEMA
+from db import queries
+from db.db_config import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +39,10 @@ class AuthService:
             dict con el resultado {'success': bool, 'message': str, 'user_id': int/None}
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Verificar si el usuario ya existe
-                    cursor.execute(
-                        f"SELECT CORREO FROM {ORACLE_SCHEMA}.USUARIO WHERE CORREO = :correo",
-                        {'correo': correo}
-                    )
-                    if cursor.fetchone():
+                    if queries.USER_EMAIL_EXISTS.execute(cursor, {'correo': correo}).fetchone():
                         return {
                             'success': False,
                             'message': 'El correo ya está registrado',
@@ -57,9 +53,8 @@ class AuthService:
                     password_hash = AuthService.hash_password(password)
 
                     # Insertar nuevo usuario
-                    cursor.execute(
-                        f"""INSERT INTO {ORACLE_SCHEMA}.USUARIO (NOMBRE, APELLIDO, CORREO, PASSWORD) 
-                           VALUES (:nombre, :apellido, :correo, :password)""",
+                    queries.USER_INSERT.execute(
+                        cursor,
                         {
                             'nombre': nombre,
                             'apellido': apellido,
@@ -95,15 +90,10 @@ class AuthService:
             dict con el resultado {'success': bool, 'message': str, 'user': dict/None}
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Buscar usuario por correo
-                    cursor.execute(
-                        f"""SELECT ID, NOMBRE, APELLIDO, CORREO, PASSWORD 
-                           FROM {ORACLE_SCHEMA}.USUARIO WHERE CORREO = :correo""",
-                        {'correo': correo}
-                    )
-                    result = cursor.fetchone()
+                    result = queries.USER_BY_EMAIL.execute(cursor, {'correo': correo}).fetchone()
 
                     if not result:
                         return {
@@ -153,19 +143,14 @@ class AuthService:
             dict con datos del usuario o None si no existe
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(
-                        f"""SELECT NOMBRE, APELLIDO, CORREO, PASSWORD 
-                           FROM {ORACLE_SCHEMA}.USUARIO WHERE CORREO = :correo""",
-                        {'correo': correo}
-                    )
-                    result = cursor.fetchone()
+                    result = queries.USER_BY_EMAIL.execute(cursor, {'correo': correo}).fetchone()
 
                     if not result:
                         return None
 
-                    nombre, apellido, correo_db, password_hash = result
+                    _, nombre, apellido, correo_db, password_hash = result
                     return {
                         'NOMBRE': nombre,
                         'APELLIDO': apellido,
@@ -0,0 +1,163 @@
+"""
+Índice en memoria de MATCH_OCUPACION_CARRERA (ocupación -> carreras peruanas)
+Formato CSR: para la ocupación en la fila i, sus carreras están en
+career_pos[offsets[i]:offsets[i + 1]] (ordenadas por RELEVANCIA descendente),
+apuntando a las tablas compactas career_ids / career_names.
+"""
+import hashlib
+import json
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CareerMatchIndex:
+    """Índice CSR ocupación -> carreras de CARRERAS_NUEVO con su relevancia"""
+
+    def __init__(self, occupation_ids, offsets, career_pos, relevancia,
+                 career_ids, career_names, version=None):
+        self.occupation_ids = np.asarray(occupation_ids, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.career_pos = np.asarray(career_pos, dtype=np.int32)
+        self.relevancia = np.asarray(relevancia, dtype=np.int16)
+        self.career_ids = np.asarray(career_ids, dtype=np.int64)
+        self.career_names = tuple(career_names)
+
+        self._row_of = {int(occ_id): row for row, occ_id in enumerate(self.occupation_ids)}
+        self.loaded_at = time.time()
+        self.version = version or self._compute_version()
+
+    @classmethod
+    def from_rows(cls, rows) -> 'CareerMatchIndex':
+        """
+        Construye el índice desde filas (ID_OCUPACION, ID_CARRERA, CARRERA, RELEVANCIA)
+        ordenadas por ID_OCUPACION y RELEVANCIA descendente
+        """
+        occupation_ids = []
+        offsets = [0]
+        career_pos = []
+        relevancia = []
+        career_ids = []
+        career_names = []
+        pos_of_career = {}
+
+        current_occ = None
+        for occ_id, career_id, career_name, relevance in rows:
+            if occ_id != current_occ:
+                if current_occ is not None:
+                    offsets.append(len(career_pos))
+                occupation_ids.append(occ_id)
+                current_occ = occ_id
+
+            pos = pos_of_career.get(career_id)
+            if pos is None:
+                pos = len(career_ids)
+                pos_of_career[career_id] = pos
+                career_ids.append(career_id)
+                career_names.append(career_name)
+
+            career_pos.append(pos)
+            relevancia.append(relevance if relevance is not None else 0)
+
+        if current_occ is not None:
+            offsets.append(len(career_pos))
+
+        return cls(occupation_ids, offsets, career_pos, relevancia, career_ids, career_names)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por los arrays del índice"""
+        return (self.occupation_ids.nbytes + self.offsets.nbytes + self.career_pos.nbytes
+                + self.relevancia.nbytes + self.career_ids.nbytes)
+
+    def _compute_version(self) -> str:
+        """Hash corto del contenido del índice (incluye los nombres de carrera)"""
+        digest = hashlib.sha1()
+        for array in (self.occupation_ids, self.offsets, self.career_pos,
+                      self.relevancia, self.career_ids):
+            digest.update(array.tobytes())
+        digest.update(json.dumps(list(self.career_names), ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    def careers_for(self, occupation_id: int) -> list:
+        """
+        Carreras peruanas de una ocupación, ordenadas por relevancia
+
+        Returns:
+            list de dicts {'id', 'nombre', 'relevancia'}
+        """
+        row = self._row_of.get(int(occupation_id))
+        if row is None:
+            return []
+
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return [
+            {
+                'id': int(self.career_ids[pos]),
+                'nombre': self.career_names[pos],
+                'relevancia': int(relevance)
+            }
+            for pos, relevance in zip(self.career_pos[start:end], self.relevancia[start:end])
+        ]
+
+    def careers_for_many(self, occupation_ids: list) -> dict:
+        """
+        Carreras peruanas para varias ocupaciones
+
+        Returns:
+            dict {occupation_id: [carreras]}
+        """
+        return {oid: self.careers_for(oid) for oid in occupation_ids}
+
+    def rank_careers(self, occupation_ids, weights, limit: int = None) -> list:
+        """
+        Ranking agregado de carreras peruanas sobre varias ocupaciones:
+        puntaje(carrera) = Σ peso(ocupación) × RELEVANCIA(ocupación, carrera)
+        Scatter-add vectorizado (np.bincount) sobre los tramos CSR de cada ocupación.
+
+        Args:
+            occupation_ids: IDs de ocupaciones (p. ej. el top-k de una predicción)
+            weights: peso de cada ocupación (p. ej. su similitud)
+            limit: cantidad máxima de carreras a devolver
+
+        Returns:
+            list de dicts {'id', 'nombre', 'score', 'ocupaciones'} por score descendente
+        """
+        rows, row_weights = [], []
+        for occ_id, weight in zip(occupation_ids, weights):
+            row = self._row_of.get(int(occ_id))
+            if row is not None:
+                rows.append(row)
+                row_weights.append(weight)
+        if not rows:
+            return []
+
+        rows = np.asarray(rows)
+        starts = self.offsets[rows].astype(np.int64)
+        lengths = self.offsets[rows + 1].astype(np.int64) - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return []
+
+        # Posiciones CSR de todos los tramos concatenados, sin bucles en Python
+        flat = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        contributions = np.repeat(np.asarray(row_weights, dtype=np.float64), lengths) * self.relevancia[flat]
+
+        careers, inverse = np.unique(self.career_pos[flat], return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions)
+        occurrences = np.bincount(inverse)
+
+        order = np.lexsort((self.career_ids[careers], -scores))
+        if limit is not None:
+            order = order[:limit]
+        return [
+            {
+                'id': int(self.career_ids[careers[i]]),
+                'nombre': self.career_names[careers[i]],
+                'score': round(float(scores[i]), 4),
+                'ocupaciones': int(occurrences[i])
+            }
+            for i in order
+        ]
@@ -7,11 +7,35 @@ import unicodedata
 import logging
 import time
 from urllib.parse import quote
-from db.db_config import OracleConnection
-from config import ORACLE_SCHEMA
+from db import queries
+from db.db_config import get_connection
+from services.reference_cache import reference_cache
+from services.warmup import register_warmup
 
 logger = logging.getLogger(__name__)
 
+
+def _none(*args, **kwargs):
+    return None
+
+
+def _empty(*args, **kwargs) -> tuple:
+    return ()
+
+
+def _careers_list_unavailable(page: int = 1, per_page: int = 12) -> dict:
+    return {
+        'success': False,
+        'message': 'Error obteniendo carreras',
+        'careers': (),
+        'total': 0,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': 0,
+        'has_next': False,
+        'has_prev': False
+    }
+
 class CareerService:
     """Servicio para gestionar carreras"""
 
@@ -109,7 +133,7 @@ class CareerService:
         print("Cache del servicio de carreras limpiado")
     
     @staticmethod
-    @lru_cache(maxsize=128)
+    @reference_cache(maxsize=128, fallback=_careers_list_unavailable, warmup=True)
     def get_careers_list(page: int = 1, per_page: int = 12) -> dict:
         """
         Obtener lista paginada de carreras (id, nombre, icono, descripción)
@@ -121,251 +145,173 @@ class CareerService:
         Returns:
             dict con careers, metadatos de paginación y success
         """
-        try:
-            offset = (page - 1) * per_page
-            
-            with OracleConnection() as conn:
-                with conn.cursor() as cursor:
-                    # COUNT(*) OVER() obtiene el total en la misma query
-                    # evitando un segundo round-trip a Oracle
-                    cursor.execute(
-                        f"""SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL,
-                                   COUNT(*) OVER() AS TOTAL_COUNT
-                            FROM {ORACLE_SCHEMA}.CARRERAS_NUEVO
-                            ORDER BY CARRERA
-                            OFFSET :offset ROWS FETCH NEXT :per_page ROWS ONLY""",
-                        {'offset': offset, 'per_page': per_page}
-                    )
-                    rows = cursor.fetchall()
-                    
-                    total = rows[0][5] if rows else 0
-                    total_pages = max(1, (total + per_page - 1) // per_page) if total > 0 else 1
-                    
-                    careers = tuple({
-                        'id': row[0],
-                        'name': row[1],
-                        'description': row[2],
-                        'afinidad': row[3],
-                        'url': CareerService._build_image_url(row[1], row[4])
-                    } for row in rows)
-                    
-                    return {
-                        'success': True,
-                        'careers': careers,
-                        'total': total,
-                        'page': page,
-                        'per_page': per_page,
-                        'total_pages': total_pages,
-                        'has_next': page < total_pages,
-                        'has_prev': page > 1
-                    }
-                    
-        except Exception as e:
-            logger.error(f"Error obteniendo lista de carreras: {e}")
-            return {
-                'success': False,
-                'message': 'Error obteniendo carreras',
-                'careers': (),
-                'total': 0,
-                'page': page,
-                'per_page': per_page,
-                'total_pages': 0,
-                'has_next': False,
-                'has_prev': False
-            }
+        offset = (page - 1) * per_page
+        
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                # COUNT(*) OVER() obtiene el total en la misma query
+                # evitando un segundo round-trip a Oracle
+                rows = queries.CAREERS_PAGE.execute(
+                    cursor, {'offset': offset, 'per_page': per_page}
+                ).fetchall()
+                
+                total = rows[0][5] if rows else 0
+                total_pages = max(1, (total + per_page - 1) // per_page) if total > 0 else 1
+                
+                careers = tuple({
+                    'id': row[0],
+                    'name': row[1],
+                    'description': row[2],
+                    'afinidad': row[3],
+                    'url': CareerService._build_image_url(row[1], row[4])
+                } for row in rows)
+                
+                return {
+                    'success': True,
+                    'careers': careers,
+                    'total': total,
+                    'page': page,
+                    'per_page': per_page,
+                    'total_pages': total_pages,
+                    'has_next': page < total_pages,
+                    'has_prev': page > 1
+                }
     
     @staticmethod
-    @lru_cache(maxsize=128)
+    @reference_cache(maxsize=128, fallback=_none)
     def get_career_detail(career_id: int) -> dict:
         """
         Obtener detalle completo de una carrera (con skills, jobs, etc.)
         Para la página de detalle de carrera
         Cacheado: máximo 128 consultas diferentes en memoria
         """
-        try:
-            with OracleConnection() as conn:
-                with conn.cursor() as cursor:
-                    # Obtener datos básicos de la carrera
-                    cursor.execute(
-                        f"SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL FROM {ORACLE_SCHEMA}.CARRERAS_NUEVO WHERE ID = :1",
-                        (career_id,)
-                    )
-                    row = cursor.fetchone()
-                    
-                    if not row:
-                        return None
-                    
-                    # Obtener skills de esta carrera
-                    cursor.execute(
-                        f"""SELECT S.NOMBRE FROM {ORACLE_SCHEMA}.SKILLS S
-                           INNER JOIN {ORACLE_SCHEMA}.CARRERAS_SKILLS CS ON S.ID = CS.FK_SKILLS
-                           WHERE CS.FK_CARRERA = :1
-                           ORDER BY S.NOMBRE""",
-                        (career_id,)
-                    )
-                    skills = [skill[0] for skill in cursor.fetchall()]
-                    
-                    # Obtener tareas/jobs de esta carrera
-                    cursor.execute(
-                        f"""SELECT T.NOMBRE FROM {ORACLE_SCHEMA}.TAREAS T
-                           INNER JOIN {ORACLE_SCHEMA}.CARRERA_TAREAS CT ON T.ID = CT.FK_TAREA
-                           WHERE CT.FK_CARRERA = :1
-                           ORDER BY T.NOMBRE""",
-                        (career_id,)
-                    )
-                    jobs = [job[0] for job in cursor.fetchall()]
-                    
-                    return {
-                        'id': row[0],
-                        'name': row[1],
-                        'description': row[2],
-                        'afinidad': row[3],
-                        'url': CareerService._build_image_url(row[1], row[4]),
-                        'skills': skills,
-                        'jobs': jobs
-                    }
-        except Exception as e:
-            print(f"Error obteniendo detalle de carrera {career_id}: {e}")
-            return None
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Obtener datos básicos de la carrera
+                row = queries.CAREER_BY_ID.execute(cursor, {'career_id': career_id}).fetchone()
+                
+                if not row:
+                    return None
+                
+                # Obtener skills de esta carrera
+                queries.CAREER_SKILLS.execute(cursor, {'career_id': career_id})
+                skills = [skill[0] for skill in cursor.fetchall()]
+                
+                # Obtener tareas/jobs de esta carrera
+                queries.CAREER_TASKS.execute(cursor, {'career_id': career_id})
+                jobs = [job[0] for job in cursor.fetchall()]
+                
+                return {
+                    'id': row[0],
+                    'name': row[1],
+                    'description': row[2],
+                    'afinidad': row[3],
+                    'url': CareerService._build_image_url(row[1], row[4]),
+                    'skills': skills,
+                    'jobs': jobs
+                }
     
     @staticmethod
-    @lru_cache(maxsize=1)
+    @reference_cache(maxsize=1, fallback=_empty, warmup=True)
     def get_all_careers() -> tuple:
         """Obtener todas las carreras con sus skills desde la BD
         OPTIMIZADO: 2 queries en lugar de 60+
         Cacheado: solo se guarda 1 resultado ya que no toma parámetros
         """
-        try:
-            with OracleConnection() as conn:
-                with conn.cursor() as cursor:
-                    # Query 1: Obtener todas las carreras
-                    cursor.execute(f"SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL FROM {ORACLE_SCHEMA}.CARRERAS_NUEVO ORDER BY CARRERA")
-                    career_rows = cursor.fetchall()
-                    
-                    # Query 2: Obtener TODOS los skills mapeados por carrera
-                    cursor.execute(f"""
-                        SELECT CS.FK_CARRERA, S.NOMBRE 
-                        FROM {ORACLE_SCHEMA}.CARRERAS_SKILLS CS
-                        INNER JOIN {ORACLE_SCHEMA}.SKILLS S ON S.ID = CS.FK_SKILLS
-                        ORDER BY CS.FK_CARRERA, S.NOMBRE
-                    """)
-                    skills_rows = cursor.fetchall()
-                    
-                    # Mapear skills por carrera_id
-                    skills_by_career = {}
-                    for career_id, skill_name in skills_rows:
-                        if career_id not in skills_by_career:
-                            skills_by_career[career_id] = []
-                        skills_by_career[career_id].append(skill_name)
-                    
-                    # Armar resultado
-                    careers = []
-                    for row in career_rows:
-                        career_id = row[0]
-                        careers.append({
-                            'id': career_id,
-                            'name': row[1],
-                            'description': row[2],
-                            'afinidad': row[3],
-                            'url': CareerService._build_image_url(row[1], row[4]),
-                            'skills': skills_by_career.get(career_id, [])
-                        })
-                    
-                    return tuple(careers)
-        except Exception as e:
-            logger.error(f"Error obteniendo carreras: {e}")
-            return ()
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Query 1: Obtener todas las carreras
+                queries.CAREERS_ALL.execute(cursor)
+                career_rows = cursor.fetchall()
+                
+                # Query 2: Obtener TODOS los skills mapeados por carrera
+                queries.CAREERS_ALL_SKILLS.execute(cursor)
+                skills_rows = cursor.fetchall()
+                
+                # Mapear skills por carrera_id
+                skills_by_career = {}
+                for career_id, skill_name in skills_rows:
+                    if career_id not in skills_by_career:
+                        skills_by_career[career_id] = []
+                    skills_by_career[career_id].append(skill_name)
+                
+                # Armar resultado
+                careers = []
+                for row in career_rows:
+                    career_id = row[0]
+                    careers.append({
+                        'id': career_id,
+                        'name': row[1],
+                        'description': row[2],
+                        'afinidad': row[3],
+                        'url': CareerService._build_image_url(row[1], row[4]),
+                        'skills': skills_by_career.get(career_id, [])
+                    })
+                
+                return tuple(careers)
     
     @staticmethod
-    @lru_cache(maxsize=1)
+    @reference_cache(maxsize=1, fallback=_empty, warmup=True)
     def get_all_careers_full() -> tuple:
         """Obtener todas las carreras con TODOS sus datos (skills + jobs)
         Para cargar en cache del frontend y evitar múltiples llamadas
         OPTIMIZADO: 3 queries instead of 120+ (antes hacía 2 queries por carrera)
         Cacheado: solo se guarda 1 resultado ya que no toma parámetros
         """
-        t_start = time.time()
+        t_start = time.perf_counter()
         
-        try:
-            with OracleConnection() as conn:
-                # Query 1: Obtener TODAS las carreras
-                t_q1 = time.time()
-                with conn.cursor() as cursor:
-                    cursor.execute(f"SELECT ID, CARRERA, DESCRIPCION, AFINIDAD, URL FROM {ORACLE_SCHEMA}.CARRERAS_NUEVO ORDER BY CARRERA")
-                    career_rows = cursor.fetchall()
-                t_q1_elapsed = time.time() - t_q1
-                logger.info(f"⏱️ Query 1 (carreras): {t_q1_elapsed:.3f}s ({len(career_rows)} filas)")
-                
-                # Query 2: Obtener TODOS los skills con sus carreras (un JOIN)
-                t_q2 = time.time()
-                with conn.cursor() as cursor:
-                    cursor.execute(f"""
-                        SELECT CS.FK_CARRERA, S.NOMBRE 
-                        FROM {ORACLE_SCHEMA}.CARRERAS_SKILLS CS
-                        INNER JOIN {ORACLE_SCHEMA}.SKILLS S ON S.ID = CS.FK_SKILLS
-                        ORDER BY CS.FK_CARRERA, S.NOMBRE
-                    """)
-                    skills_rows = cursor.fetchall()
-                t_q2_elapsed = time.time() - t_q2
-                logger.info(f"⏱️ Query 2 (skills): {t_q2_elapsed:.3f}s ({len(skills_rows)} filas)")
-                
-                # Query 3: Obtener TODOS los jobs con sus carreras (un JOIN)
-                t_q3 = time.time()
-                with conn.cursor() as cursor:
-                    cursor.execute(f"""
-                        SELECT CT.FK_CARRERA, T.NOMBRE 
-                        FROM {ORACLE_SCHEMA}.CARRERA_TAREAS CT
-                        INNER JOIN {ORACLE_SCHEMA}.TAREAS T ON T.ID = CT.FK_TAREA
-                        ORDER BY CT.FK_CARRERA, T.NOMBRE
-                    """)
-                    jobs_rows = cursor.fetchall()
-                t_q3_elapsed = time.time() - t_q3
-                logger.info(f"⏱️ Query 3 (jobs): {t_q3_elapsed:.3f}s ({len(jobs_rows)} filas)")
-                
-            # Mapear skills por carrera_id para acceso O(1)
-            t_map = time.time()
-            skills_by_career = {}
-            for career_id, skill_name in skills_rows:
-                if career_id not in skills_by_career:
-                    skills_by_career[career_id] = []
-                skills_by_career[career_id].append(skill_name)
+        # Round trips, filas y tiempo de cada query: Server-Timing y log del request
+        with get_connection() as conn:
+            # Query 1: Obtener TODAS las carreras
+            with conn.cursor() as cursor:
+                queries.CAREERS_ALL.execute(cursor)
+                career_rows = cursor.fetchall()
             
-            # Mapear jobs por carrera_id para acceso O(1)
-            jobs_by_career = {}
-            for career_id, job_name in jobs_rows:
-                if career_id not in jobs_by_career:
-                    jobs_by_career[career_id] = []
-                jobs_by_career[career_id].append(job_name)
-            t_map_elapsed = time.time() - t_map
-            logger.info(f"⏱️ Mapping (skills+jobs): {t_map_elapsed:.3f}s")
-            
-            # Armar resultado final
-            t_build = time.time()
-            careers = []
-            for row in career_rows:
-                career_id = row[0]
-                careers.append({
-                    'id': career_id,
-                    'name': row[1],
-                    'description': row[2],
-                    'afinidad': row[3],
-                    'url': CareerService._build_image_url(row[1], row[4]),
-                    'skills': skills_by_career.get(career_id, []),
-                    'jobs': jobs_by_career.get(career_id, [])
-                })
-            t_build_elapsed = time.time() - t_build
-            logger.info(f"⏱️ Build carreras+URLs: {t_build_elapsed:.3f}s ({len(careers)} carreras)")
+            # Query 2: Obtener TODOS los skills con sus carreras (un JOIN)
+            with conn.cursor() as cursor:
+                queries.CAREERS_ALL_SKILLS.execute(cursor)
+                skills_rows = cursor.fetchall()
             
-            t_total = time.time() - t_start
-            logger.info(f"✓ Total: {t_total:.3f}s (Q1:{t_q1_elapsed:.3f}s Q2:{t_q2_elapsed:.3f}s Q3:{t_q3_elapsed:.3f}s Map:{t_map_elapsed:.3f}s Build:{t_build_elapsed:.3f}s)")
+            # Query 3: Obtener TODOS los jobs con sus carreras (un JOIN)
+            with conn.cursor() as cursor:
+                queries.CAREERS_ALL_TASKS.execute(cursor)
+                jobs_rows = cursor.fetchall()
             
-            return tuple(careers)
-        except Exception as e:
-            logger.error(f"Error obteniendo carreras completas: {e}")
-            return ()
+        # Mapear skills por carrera_id para acceso O(1)
+        skills_by_career = {}
+        for career_id, skill_name in skills_rows:
+            if career_id not in skills_by_career:
+                skills_by_career[career_id] = []
+            skills_by_career[career_id].append(skill_name)
+        
+        # Mapear jobs por carrera_id para acceso O(1)
+        jobs_by_career = {}
+        for career_id, job_name in jobs_rows:
+            if career_id not in jobs_by_career:
+                jobs_by_career[career_id] = []
+            jobs_by_career[career_id].append(job_name)
+        
+        # Armar resultado final
+        careers = []
+        for row in career_rows:
+            career_id = row[0]
+            careers.append({
+                'id': career_id,
+                'name': row[1],
+                'description': row[2],
+                'afinidad': row[3],
+                'url': CareerService._build_image_url(row[1], row[4]),
+                'skills': skills_by_career.get(career_id, []),
+                'jobs': jobs_by_career.get(career_id, [])
+            })
+        
+        logger.info(f"✓ Carreras completas: {len(careers)} carreras, {len(skills_rows)} skills, "
+                    f"{len(jobs_rows)} jobs en {time.perf_counter() - t_start:.3f}s")
+        
+        return tuple(careers)
     
     @staticmethod
-    @lru_cache(maxsize=128)
+    @reference_cache(maxsize=128, fallback=_none)
     def get_career_by_id(career_id: int) -> dict:
         """
         Obtener una carrera por ID con sus skills desde la BD
@@ -378,39 +324,27 @@ class CareerService:
             
         Nota: Cacheado hasta 128 carreras diferentes
         """
-        try:
-            with OracleConnection() as conn:
-                with conn.cursor() as cursor:
-                    # Obtener carrera
-                    cursor.execute(
-                        f"SELECT ID, CARRERA, DESCRIPCION FROM {ORACLE_SCHEMA}.CARRERAS_NUEVO WHERE ID = :1",
-                        (career_id,)
-                    )
-                    row = cursor.fetchone()
-                    
-                    if not row:
-                        return None
-                    
-                    # Obtener skills de esta carrera
-                    cursor.execute(
-                        f"""SELECT S.NOMBRE FROM {ORACLE_SCHEMA}.SKILLS S
-                           INNER JOIN {ORACLE_SCHEMA}.CARRERAS_SKILLS CS ON S.ID = CS.FK_SKILLS
-                           WHERE CS.FK_CARRERA = :1
-                           ORDER BY S.NOMBRE""",
-                        (career_id,)
-                    )
-                    skills_rows = cursor.fetchall()
-                    skills = [skill[0] for skill in skills_rows]
-                    
-                    return {
-                        'id': row[0],
-                        'name': row[1],
-                        'description': row[2],
-                        'skills': skills
-                    }
-        except Exception as e:
-            print(f"Error obteniendo carrera {career_id}: {e}")
-            return None
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Obtener carrera
+                row = queries.CAREER_BY_ID.execute(cursor, {'career_id': career_id}).fetchone()
+                
+                if not row:
+                    return None
+                
+                # Obtener skills de esta carrera
+                skills_rows = queries.CAREER_SKILLS.execute(cursor, {'career_id': career_id}).fetchall()
+                skills = [skill[0] for skill in skills_rows]
+                
+                return {
+                    'id': row[0],
+                    'name': row[1],
+                    'description': row[2],
+                    'skills': skills
+                }
+
+
+register_warmup('CareerService._local_images_index', CareerService._local_images_index)
 
 
 if __name__ == "__main__":
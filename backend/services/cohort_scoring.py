@@ -0,0 +1,300 @@
+"""
+Puntaje offline de cohortes (tests en papel de campañas escolares) desde CSV
+Lee el CSV en bloques, los puntúa en paralelo con un ProcessPoolExecutor
+(cada proceso carga la base de ocupaciones una sola vez, de solo lectura) y
+escribe el top-k de cada alumno en CSV o Parquet a medida que llegan los
+resultados. La memoria queda acotada por chunk_size x bloques en vuelo,
+independientemente del tamaño de la entrada.
+
+CSV de entrada (una fila por alumno, respuestas 1-5):
+    id, int_R1..int_R4, int_I1.., ..., int_C4, hab_R1, hab_R2, ..., hab_C2
+
+Base de ocupaciones: el bundle del modelo (MODEL_BUNDLE_DIR, mapeado en
+memoria y compartido entre procesos vía page cache) o un CSV O*NET con
+Ocupacion, Realistic..Conventional y Posibles carreras (--base).
+
+Uso:
+    python -m services.cohort_scoring respuestas.csv resultados.csv [--workers 4] [--top 5]
+    python -m services.cohort_scoring respuestas.csv resultados.parquet --base onet.csv
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from services.model_service import (
+    WeightedRiasecEngine,
+    ORDERED_COLS,
+    INTEREST_KEYS,
+    SKILL_KEYS
+)
+from services.occupation_catalog import parse_posibles_carreras
+
+logger = logging.getLogger(__name__)
+
+# Columnas de respuestas del CSV de entrada (mismo orden que WeightedRiasecEngine)
+ANSWER_FIELDS = tuple(f'int_{key}' for key in INTEREST_KEYS) + tuple(f'hab_{key}' for key in SKILL_KEYS)
+
+OUTPUT_FIELDS = ('id', 'rank', 'ocupacion', 'match_score', 'posibles_carreras')
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Motor del proceso worker (se carga en _init_worker)
+_engine = None
+
+
+# ─── Base de ocupaciones ────────────────────────────────────
+
+def load_base_csv(path: str, peso_intereses: float, peso_habilidades: float) -> WeightedRiasecEngine:
+    """Motor desde un CSV O*NET (Ocupacion, Realistic..Conventional, Posibles carreras)"""
+    matrix, occupations, carreras = [], [], []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            matrix.append([float(row[col]) for col in ORDERED_COLS])
+            occupations.append(row['Ocupacion'])
+            carreras.append(parse_posibles_carreras(row.get('Posibles carreras')))
+    return WeightedRiasecEngine(np.array(matrix, dtype=np.float32), occupations, carreras,
+                                peso_intereses, peso_habilidades)
+
+
+def load_base_bundle(root: str, peso_intereses: float, peso_habilidades: float) -> WeightedRiasecEngine:
+    """Motor desde el bundle del modelo exportado de MODELO_CONVERSIONES"""
+    from services import model_bundle
+
+    bundle = model_bundle.load_bundle(root)
+    if bundle is None:
+        raise FileNotFoundError(f"No hay bundle del modelo publicado en {root}")
+    engine = bundle[0]
+    return WeightedRiasecEngine(engine.matrix, engine.names, engine.carreras,
+                                peso_intereses, peso_habilidades)
+
+
+def _init_worker(base_path, bundle_dir, peso_intereses, peso_habilidades):
+    """Carga la base una vez por proceso"""
+    global _engine
+    if base_path:
+        _engine = load_base_csv(base_path, peso_intereses, peso_habilidades)
+    else:
+        _engine = load_base_bundle(bundle_dir, peso_intereses, peso_habilidades)
+
+
+def _parse_answers(raw_rows: list) -> tuple:
+    """
+    Convierte las respuestas en texto a float32 y descarta filas inválidas
+    (no numéricas o fuera de 1-5)
+
+    Returns:
+        tuple (answers (n, 36), máscara de filas válidas)
+    """
+    try:
+        answers = np.array(raw_rows, dtype=np.float32)
+    except ValueError:
+        # Alguna fila no numérica: convertir fila por fila
+        answers = np.full((len(raw_rows), len(ANSWER_FIELDS)), np.nan, dtype=np.float32)
+        for row, values in enumerate(raw_rows):
+            try:
+                answers[row] = np.array(values, dtype=np.float32)
+            except ValueError:
+                pass
+    answers = answers.reshape(-1, len(ANSWER_FIELDS))
+    valid = np.all((answers >= 1) & (answers <= 5), axis=1)
+    return answers[valid], valid
+
+
+def _score_chunk(ids: list, raw_rows: list, top: int) -> tuple:
+    """
+    Parseo + top-k de un bloque de alumnos (se ejecuta en el proceso worker)
+
+    Returns:
+        tuple (filas de salida, cantidad de filas inválidas)
+    """
+    answers, valid = _parse_answers(raw_rows)
+    ids = [student_id for student_id, ok in zip(ids, valid) if ok]
+    if not ids:
+        return [], int((~valid).sum())
+
+    indices, scores = _engine.top_k(answers, k=top)
+    rows = []
+    for student_id, student_indices, student_scores in zip(ids, indices, scores):
+        for rank, (idx, score) in enumerate(zip(student_indices, student_scores), 1):
+            rows.append((
+                student_id,
+                rank,
+                _engine.occupations[idx],
+                round(float(score), 6),
+                '; '.join(str(c) for c in _engine.posibles_carreras[idx])
+            ))
+    return rows, int((~valid).sum())
+
+
+# ─── Entrada / salida ───────────────────────────────────────
+
+def read_chunks(path: str, chunk_size: int, id_column: str = 'id'):
+    """
+    Lee el CSV de respuestas en bloques sin convertir los valores
+    (el parseo y la validación se hacen en los procesos worker)
+
+    Yields:
+        tuple (ids, filas de respuestas como texto)
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = [field for field in ANSWER_FIELDS if field not in header]
+        if missing:
+            raise ValueError(f"Faltan columnas en {path}: {', '.join(missing[:6])}"
+                             f"{'...' if len(missing) > 6 else ''}")
+
+        positions = [header.index(field) for field in ANSWER_FIELDS]
+        id_position = header.index(id_column) if id_column in header else None
+        width = max(positions + [id_position or 0]) + 1
+
+        ids, raw_rows = [], []
+        for line, row in enumerate(reader, 2):
+            if len(row) < width:
+                # Fila incompleta: se envía vacía para contarla como inválida
+                row = row + [''] * (width - len(row))
+            ids.append(row[id_position] if id_position is not None and row[id_position] else str(line))
+            raw_rows.append([row[position] for position in positions])
+            if len(ids) >= chunk_size:
+                yield ids, raw_rows
+                ids, raw_rows = [], []
+
+        if ids:
+            yield ids, raw_rows
+
+
+class _CsvSink:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(OUTPUT_FIELDS)
+
+    def write(self, rows: list) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetSink:
+    def __init__(self, path: str):
+        # Dependencia opcional: solo para salida .parquet
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ('id', pa.string()),
+            ('rank', pa.int16()),
+            ('ocupacion', pa.string()),
+            ('match_score', pa.float32()),
+            ('posibles_carreras', pa.string())
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: list) -> None:
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        columns[0] = [str(value) for value in columns[0]]
+        self._writer.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(column, type=field.type) for column, field in zip(columns, self._schema)],
+            schema=self._schema
+        ))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def open_sink(path: str):
+    """Escritor de resultados según la extensión (.parquet o CSV)"""
+    if path.lower().endswith('.parquet'):
+        return _ParquetSink(path)
+    return _CsvSink(path)
+
+
+# ─── Ejecución ──────────────────────────────────────────────
+
+def score_cohort(input_path: str, output_path: str, base_path: str = None, bundle_dir: str = None,
+                 workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, top: int = 5,
+                 peso_intereses: float = 0.6, peso_habilidades: float = 0.4,
+                 id_column: str = 'id') -> dict:
+    """
+    Puntúa un CSV de respuestas y escribe el top-k por alumno en orden de entrada
+
+    Returns:
+        dict con rows (leídas), students (puntuados), invalid, chunks y seconds
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    stats = {'rows': 0, 'invalid': 0, 'chunks': 0}
+    started = time.perf_counter()
+
+    sink = open_sink(output_path)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(base_path, bundle_dir, peso_intereses, peso_habilidades)
+        ) as pool:
+            pending = deque()
+            def _write_oldest():
+                rows, invalid = pending.popleft().result()
+                sink.write(rows)
+                stats['invalid'] += invalid
+
+            for ids, raw_rows in read_chunks(input_path, chunk_size, id_column):
+                # Acotar bloques en vuelo: escribir el más antiguo antes de leer más
+                if len(pending) >= max_in_flight:
+                    _write_oldest()
+                pending.append(pool.submit(_score_chunk, ids, raw_rows, top))
+                stats['rows'] += len(ids)
+                stats['chunks'] += 1
+
+            while pending:
+                _write_oldest()
+    finally:
+        sink.close()
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['students'] = stats['rows'] - stats['invalid']
+    return stats
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Puntaje offline de cohortes desde CSV')
+    parser.add_argument('input', help='CSV de respuestas (id, int_R1..int_C4, hab_R1..hab_C2)')
+    parser.add_argument('output', help='archivo de salida (.csv o .parquet)')
+    parser.add_argument('--base', help='CSV O*NET de ocupaciones (por defecto, el bundle del modelo)')
+    parser.add_argument('--bundle-dir', help='directorio del bundle del modelo (por defecto MODEL_BUNDLE_DIR)')
+    parser.add_argument('--workers', type=int, default=None, help='procesos (por defecto, CPUs disponibles)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='alumnos por bloque')
+    parser.add_argument('--top', type=int, default=5, help='ocupaciones por alumno')
+    parser.add_argument('--peso-intereses', type=float, default=0.6)
+    parser.add_argument('--peso-habilidades', type=float, default=0.4)
+    parser.add_argument('--id-column', default='id', help='columna identificadora del alumno')
+    args = parser.parse_args()
+
+    bundle_dir = args.bundle_dir
+    if not args.base and not bundle_dir:
+        from config import MODEL_BUNDLE_DIR
+        bundle_dir = MODEL_BUNDLE_DIR
+
+    try:
+        result = score_cohort(args.input, args.output, base_path=args.base, bundle_dir=bundle_dir,
+                              workers=args.workers, chunk_size=args.chunk_size, top=args.top,
+                              peso_intereses=args.peso_intereses, peso_habilidades=args.peso_habilidades,
+                              id_column=args.id_column)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Alumnos: {result['students']} | inválidos: {result['invalid']} | "
+          f"bloques: {result['chunks']} | {result['seconds']:.2f}s")
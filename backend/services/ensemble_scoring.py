@@ -0,0 +1,248 @@
+"""
+Puntaje combinado de ocupaciones (ensemble de métricas)
+Las tres métricas salen del mismo producto matriz-vector contra la matriz
+original del modelo (escala 1-7), con las normas de fila ya precalculadas:
+
+    cosine      x·u / (|x| |u|)
+    euclidean   -|x - u|, con |x - u|² = |x|² + |u|² - 2 x·u
+    holland     coincidencia de posiciones del código Holland (top 3 letras)
+
+El puntaje combinado es el promedio ponderado de las tres, llevadas a 0-1
+(la distancia se normaliza por la diagonal de la escala 1-7). Las reglas
+(pesos) se configuran con PREDICTION_SCORING y, para pruebas A/B, con
+PREDICTION_SCORING_B y PREDICTION_SCORING_B_PERCENT.
+"""
+import hashlib
+import logging
+import numpy as np
+from services.similarity_engine import RIASEC_ORDER
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('cosine', 'euclidean', 'holland')
+
+# Escala de los vectores del modelo y del usuario (MODELO_CONVERSIONES)
+SCALE_MIN = 1.0
+SCALE_MAX = 7.0
+MAX_DISTANCE = (SCALE_MAX - SCALE_MIN) * np.sqrt(len(RIASEC_ORDER))
+
+# Letras del código Holland comparadas y peso de cada posición
+HOLLAND_LETTERS = 3
+HOLLAND_POSITION_WEIGHTS = np.array([3.0, 2.0, 1.0], dtype=np.float32)
+
+# Crédito por letra del usuario según su posición en el código de la ocupación:
+# misma posición = 1, otra posición dentro del top 3 = 0.5, fuera = 0
+_HOLLAND_CREDIT = np.zeros((len(RIASEC_ORDER), HOLLAND_LETTERS), dtype=np.float32)
+for _letter in range(HOLLAND_LETTERS):
+    _HOLLAND_CREDIT[:HOLLAND_LETTERS, _letter] = 0.5
+    _HOLLAND_CREDIT[_letter, _letter] = 1.0
+_HOLLAND_CREDIT *= HOLLAND_POSITION_WEIGHTS / HOLLAND_POSITION_WEIGHTS.sum()
+
+# Elementos (usuarios x ocupaciones) por bloque en los cálculos en lote
+BLOCK_ELEMENTS = 4 * 1024 * 1024
+
+
+def parse_weights(text: str) -> dict:
+    """
+    Pesos 'cosine=0.6,euclidean=0.2,holland=0.2' -> dict (métricas omitidas = 0)
+
+    Raises:
+        ValueError: si hay métricas desconocidas, pesos negativos o todos en 0
+    """
+    weights = dict.fromkeys(METRICS, 0.0)
+    for item in (text or '').split(','):
+        if not item.strip():
+            continue
+        name, _, value = item.partition('=')
+        name = name.strip().lower()
+        if name not in weights:
+            raise ValueError(f"Métrica desconocida '{name}' (opciones: {', '.join(METRICS)})")
+        weights[name] = float(value)
+    if any(value < 0 for value in weights.values()) or sum(weights.values()) <= 0:
+        raise ValueError(f"Pesos inválidos: '{text}'")
+    return weights
+
+
+class ScoringRule:
+    """
+    Regla de puntaje: pesos de cada métrica
+
+    Atributos:
+        name: nombre de la regla (p.ej. 'a' / 'b' en la prueba A/B)
+        weights: dict {métrica: peso}
+        key: texto canónico de los pesos (parte de la clave del cache)
+    """
+
+    def __init__(self, name: str, weights: dict):
+        total = sum(weights.values())
+        self.name = name
+        self.weights = {metric: float(weights.get(metric, 0)) / total for metric in METRICS}
+        self.key = ','.join(f"{metric}={self.weights[metric]:.4f}" for metric in METRICS)
+
+    @property
+    def cosine_only(self) -> bool:
+        """Solo coseno: el ranking puede salir del backend de vecinos configurado"""
+        return self.weights['cosine'] == 1.0
+
+    def to_dict(self) -> dict:
+        return {'rule': self.name, 'weights': self.weights}
+
+
+def assign_rule(rules: dict, usuario_id=None, percent_b: int = 0) -> ScoringRule:
+    """
+    Regla de un usuario en la prueba A/B: el mismo usuario cae siempre en el
+    mismo grupo (hash del ID). Sin usuario (anónimo) se usa la regla 'a'.
+    """
+    if usuario_id is None or percent_b <= 0 or 'b' not in rules:
+        return rules['a']
+    bucket = int(hashlib.sha1(str(usuario_id).encode()).hexdigest()[:8], 16) % 100
+    return rules['b'] if bucket < percent_b else rules['a']
+
+
+def build_rules(weights_a: str, weights_b: str = '') -> dict:
+    """
+    Reglas 'a' (y 'b' si se configuró) desde la configuración.
+    Una regla inválida se registra y se reemplaza por coseno ('a') o se omite ('b').
+    """
+    try:
+        rules = {'a': ScoringRule('a', parse_weights(weights_a))}
+    except ValueError as e:
+        logger.warning(f"PREDICTION_SCORING inválido, usando coseno: {str(e)}")
+        rules = {'a': ScoringRule('a', {'cosine': 1.0})}
+
+    if weights_b:
+        try:
+            rules['b'] = ScoringRule('b', parse_weights(weights_b))
+        except ValueError as e:
+            logger.warning(f"PREDICTION_SCORING_B inválido, prueba A/B desactivada: {str(e)}")
+    return rules
+
+
+class EnsembleScorer:
+    """
+    Precálculos por modelo para las tres métricas
+
+    Atributos:
+        engine: SimilarityEngine (matriz original y normas de fila)
+        sq_norms: np.ndarray float32 (n,) con |x|²
+        positions: np.ndarray int8 (n, 6) con la posición de cada dimensión
+                   en el orden descendente de la ocupación (0 = más alta)
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.sq_norms = np.square(engine.norms, dtype=np.float32)
+        order = np.argsort(-engine.matrix, axis=1, kind='stable')
+        positions = np.empty(order.shape, dtype=np.int8)
+        np.put_along_axis(positions, order, np.arange(order.shape[1], dtype=np.int8)[np.newaxis, :], axis=1)
+        self.positions = positions
+
+    @staticmethod
+    def _user_codes(user_matrix: np.ndarray) -> np.ndarray:
+        """Top 3 dimensiones (código Holland) de cada usuario, empates en orden RIASEC"""
+        return np.argsort(-user_matrix, axis=1, kind='stable')[:, :HOLLAND_LETTERS]
+
+    def _metrics(self, user_matrix: np.ndarray, rows=None) -> dict:
+        """
+        Métricas de cada usuario contra las filas `rows` (todas si es None)
+
+        Args:
+            user_matrix: np.ndarray float32 (m, 6) en escala 1-7
+            rows: None o índices (m, k) por usuario
+
+        Returns:
+            dict {métrica: np.ndarray (m, n) o (m, k)}
+        """
+        user_sq = np.einsum('md,md->m', user_matrix, user_matrix)[:, np.newaxis]
+        user_norms = np.sqrt(user_sq)
+        codes = self._user_codes(user_matrix)
+
+        if rows is None:
+            dots = user_matrix @ self.engine.matrix.T
+            sq_norms = self.sq_norms[np.newaxis, :]
+            norms = self.engine.norms[np.newaxis, :]
+            positions = self.positions.T[codes]                  # (m, 3, n)
+        else:
+            dots = np.einsum('mkd,md->mk', self.engine.matrix[rows], user_matrix)
+            sq_norms = self.sq_norms[rows]
+            norms = self.engine.norms[rows]
+            positions = np.take_along_axis(
+                self.positions[rows].transpose(0, 2, 1), codes[:, :, np.newaxis], axis=1
+            )                                                    # (m, 3, k)
+
+        denominator = user_norms * norms
+        cosine = np.divide(dots, denominator, out=np.zeros_like(dots), where=denominator > 0)
+        euclidean = -np.sqrt(np.maximum(user_sq + sq_norms - 2 * dots, 0))
+        holland = sum(
+            _HOLLAND_CREDIT[positions[:, letter], letter] for letter in range(HOLLAND_LETTERS)
+        )
+        return {'cosine': cosine, 'euclidean': euclidean, 'holland': holland}
+
+    @staticmethod
+    def _combine(metrics: dict, rule: ScoringRule) -> np.ndarray:
+        """Promedio ponderado con las métricas llevadas a 0-1"""
+        weights = rule.weights
+        combined = np.zeros_like(metrics['cosine'])
+        if weights['cosine']:
+            combined += weights['cosine'] * metrics['cosine']
+        if weights['euclidean']:
+            combined += weights['euclidean'] * (1 + metrics['euclidean'] / MAX_DISTANCE)
+        if weights['holland']:
+            combined += weights['holland'] * metrics['holland']
+        return combined
+
+    def _blocks(self, count: int):
+        """Rangos de usuarios para acotar la memoria a BLOCK_ELEMENTS por bloque"""
+        step = max(1, BLOCK_ELEMENTS // max(self.engine.size * HOLLAND_LETTERS, 1))
+        for start in range(0, count, step):
+            yield start, min(start + step, count)
+
+    def scores_batch(self, user_matrix, rule: ScoringRule) -> np.ndarray:
+        """
+        Puntaje combinado de cada usuario contra todas las ocupaciones
+
+        Returns:
+            np.ndarray float32 (m, n)
+        """
+        user_matrix = np.atleast_2d(np.asarray(user_matrix, dtype=np.float32))
+        if rule.cosine_only:
+            return self.engine.scores_batch(user_matrix)
+
+        combined = np.empty((len(user_matrix), self.engine.size), dtype=np.float32)
+        for start, end in self._blocks(len(user_matrix)):
+            combined[start:end] = self._combine(self._metrics(user_matrix[start:end]), rule)
+        return combined
+
+    def top_k_batch(self, user_matrix, rule: ScoringRule, k: int = 5) -> tuple:
+        """
+        Top-k por puntaje combinado en una pasada por bloque de usuarios
+
+        Returns:
+            tuple (indices (m, k), puntajes (m, k), {métrica: (m, k)})
+        """
+        user_matrix = np.atleast_2d(np.asarray(user_matrix, dtype=np.float32))
+        k = min(k, self.engine.size)
+        indices = np.empty((len(user_matrix), k), dtype=np.intp)
+        scores = np.empty((len(user_matrix), k), dtype=np.float32)
+        metrics = {metric: np.empty((len(user_matrix), k), dtype=np.float32) for metric in METRICS}
+
+        for start, end in self._blocks(len(user_matrix)):
+            block_metrics = self._metrics(user_matrix[start:end])
+            combined = self._combine(block_metrics, rule)
+            block_indices = self.engine.select_top_k(combined, k)
+            indices[start:end] = block_indices
+            scores[start:end] = np.take_along_axis(combined, block_indices, axis=1)
+            for metric in METRICS:
+                metrics[metric][start:end] = np.take_along_axis(block_metrics[metric], block_indices, axis=1)
+        return indices, scores, metrics
+
+    def metrics_at(self, user_matrix, indices) -> dict:
+        """
+        Métricas solo de las ocupaciones ya elegidas (p.ej. por el backend de
+        vecinos con la regla de solo coseno)
+
+        Returns:
+            dict {métrica: np.ndarray (m, k)}
+        """
+        user_matrix = np.atleast_2d(np.asarray(user_matrix, dtype=np.float32))
+        return self._metrics(user_matrix, rows=np.atleast_2d(indices))
@@ -0,0 +1,263 @@
+"""
+Índice invertido por código Holland (top-3 RIASEC) sobre el modelo de ocupaciones
+Cada ocupación se agrupa por el conjunto de sus 3 dimensiones más altas
+(p. ej. "ISA"). Las filas se reordenan por grupo, de modo que los candidatos
+de un usuario (ocupaciones que comparten al menos min_shared letras con su
+código) son unos pocos tramos contiguos de la matriz: el ranking exacto por
+coseno se hace solo sobre esos tramos, sin copiar filas. Si hay menos de
+min_candidates candidatos se recurre al recorrido completo del motor exacto.
+
+Chequeo de recall contra el motor exacto (para elegir HOLLAND_MIN_SHARED):
+    python -m services.holland_index [--samples N] [--k K] [--synthetic N_OCUPACIONES]
+"""
+import argparse
+import logging
+import threading
+import time
+import numpy as np
+from services.similarity_engine import SimilarityEngine, RIASEC_ORDER, recall_at_k
+
+logger = logging.getLogger(__name__)
+
+# Letras del código Holland de cada ocupación
+CODE_LENGTH = 3
+
+# Tolerancia para considerar empatada una dimensión con la tercera del usuario
+TIE_TOLERANCE = 1e-6
+
+
+def holland_code(vector, length: int = CODE_LENGTH) -> str:
+    """Código Holland (letras de las dimensiones más altas, en orden descendente)"""
+    order = np.argsort(-np.asarray(vector, dtype=np.float32), kind='stable')[:length]
+    return ''.join(RIASEC_ORDER[i] for i in order)
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+class HollandIndex:
+    """
+    Índice de candidatos por código Holland sobre un SimilarityEngine
+
+    Atributos:
+        engine: motor exacto (fallback y fuente de IDs/nombres)
+        min_shared: letras del código que un candidato debe compartir con el usuario
+        min_candidates: por debajo de esta cantidad de candidatos se usa el motor exacto
+    """
+
+    def __init__(self, engine: SimilarityEngine, min_shared: int = 2, min_candidates: int = 200):
+        self.engine = engine
+        self.min_shared = min_shared
+        self.min_candidates = min_candidates
+
+        started = time.perf_counter()
+        # Máscara de bits (1 << posición RIASEC) con el top-3 de cada fila
+        top = np.argsort(-engine.matrix, axis=1, kind='stable')[:, :CODE_LENGTH]
+        row_masks = np.bitwise_or.reduce(np.left_shift(1, top), axis=1).astype(np.uint8)
+
+        # Filas reordenadas por grupo: cada código es un tramo contiguo
+        self.order = np.argsort(row_masks, kind='stable')
+        self.unit_sorted = np.ascontiguousarray(engine.unit_matrix[self.order])
+        sorted_masks = row_masks[self.order]
+        masks, starts, counts = np.unique(sorted_masks, return_index=True, return_counts=True)
+        self._buckets = {
+            int(mask): (int(start), int(start + count))
+            for mask, start, count in zip(masks, starts, counts)
+        }
+
+        self._ranges_cache = {}
+        self._lock = threading.Lock()
+        self.build_seconds = time.perf_counter() - started
+        logger.info(f"Índice Holland construido: {engine.size} ocupaciones, "
+                    f"{len(self._buckets)} códigos, {self.build_seconds:.3f}s")
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria adicional del índice (matriz reordenada + permutación)"""
+        return self.unit_sorted.nbytes + self.order.nbytes
+
+    @staticmethod
+    def user_mask(user_vector) -> int:
+        """
+        Máscara del código del usuario: sus 3 dimensiones más altas más las
+        empatadas con la tercera (un perfil plano no descarta ninguna ocupación)
+        """
+        values = np.asarray(user_vector, dtype=np.float32)
+        threshold = np.sort(values)[::-1][min(CODE_LENGTH, len(values)) - 1] - TIE_TOLERANCE
+        return int(sum(1 << i for i, value in enumerate(values) if value >= threshold))
+
+    def _ranges(self, mask: int, min_shared: int) -> tuple:
+        """
+        Tramos (inicio, fin) de la matriz reordenada con los candidatos de una máscara
+
+        Returns:
+            tuple (starts, ends, total)
+        """
+        key = (mask, min_shared)
+        ranges = self._ranges_cache.get(key)
+        if ranges is None:
+            selected = sorted(
+                bounds for bucket_mask, bounds in self._buckets.items()
+                if _popcount(bucket_mask & mask) >= min_shared
+            )
+            starts = np.array([start for start, _ in selected], dtype=np.int64)
+            ends = np.array([end for _, end in selected], dtype=np.int64)
+            ranges = (starts, ends, int((ends - starts).sum()))
+            with self._lock:
+                self._ranges_cache[key] = ranges
+        return ranges
+
+    def candidate_count(self, user_vector, min_shared: int = None) -> int:
+        """Cantidad de candidatos para un vector de usuario"""
+        min_shared = self.min_shared if min_shared is None else min_shared
+        return self._ranges(self.user_mask(user_vector), min_shared)[2]
+
+    def _rank_ranges(self, unit_users: np.ndarray, ranges: tuple, k: int) -> tuple:
+        """
+        Top-k exacto restringido a los tramos candidatos
+
+        Args:
+            unit_users: array (m, d) de vectores de usuario normalizados
+            ranges: resultado de _ranges
+        """
+        starts, ends, _ = ranges
+        similarities = np.concatenate(
+            [unit_users @ self.unit_sorted[start:end].T for start, end in zip(starts, ends)],
+            axis=-1
+        )
+        positions = SimilarityEngine.select_top_k(similarities, k)
+
+        # Posición dentro de los candidatos -> fila de la matriz original
+        lengths = ends - starts
+        range_of = np.searchsorted(np.cumsum(lengths), positions, side='right')
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        sorted_rows = starts[range_of] + (positions - offsets[range_of])
+        return self.order[sorted_rows], np.take_along_axis(similarities, positions, axis=-1)
+
+    def top_k(self, user_vector, k: int = 5, min_shared: int = None) -> tuple:
+        """
+        Top-k ocupaciones por coseno entre los candidatos del código Holland
+
+        Returns:
+            tuple (indices, similarities) en orden descendente (mismo formato que SimilarityEngine.top_k)
+        """
+        min_shared = self.min_shared if min_shared is None else min_shared
+        ranges = self._ranges(self.user_mask(user_vector), min_shared)
+        if ranges[2] < max(self.min_candidates, k):
+            return self.engine.top_k(user_vector, k)
+
+        unit_user = SimilarityEngine._normalize_rows(np.atleast_2d(user_vector))
+        indices, similarities = self._rank_ranges(unit_user, ranges, k)
+        return indices[0], similarities[0]
+
+    def top_k_batch(self, user_matrix, k: int = 5, min_shared: int = None) -> tuple:
+        """
+        Top-k para varios usuarios: agrupa por código Holland y rankea cada grupo
+        con un producto matriz-matriz sobre sus candidatos
+
+        Returns:
+            tuple (indices (m, k), similarities (m, k))
+        """
+        min_shared = self.min_shared if min_shared is None else min_shared
+        user_matrix = np.atleast_2d(np.asarray(user_matrix, dtype=np.float32))
+        k = min(k, self.engine.size)
+        indices = np.empty((len(user_matrix), k), dtype=np.intp)
+        similarities = np.empty((len(user_matrix), k), dtype=np.float32)
+
+        groups = {}
+        for row, user_vector in enumerate(user_matrix):
+            groups.setdefault(self.user_mask(user_vector), []).append(row)
+
+        for mask, rows in groups.items():
+            ranges = self._ranges(mask, min_shared)
+            if ranges[2] < max(self.min_candidates, k):
+                group_indices, group_similarities = self.engine.top_k_batch(user_matrix[rows], k)
+            else:
+                unit_users = SimilarityEngine._normalize_rows(user_matrix[rows])
+                group_indices, group_similarities = self._rank_ranges(unit_users, ranges, k)
+            indices[rows] = group_indices
+            similarities[rows] = group_similarities
+
+        return indices, similarities
+
+
+def sample_user_vectors(count: int, seed: int = 0) -> np.ndarray:
+    """
+    Vectores de usuario sintéticos en la escala 1-7 del modelo: 7 respuestas
+    Likert (1-5) por categoría, promediadas y escaladas como en predict_careers
+    """
+    rng = np.random.default_rng(seed)
+    answers = rng.integers(1, 6, size=(count, len(RIASEC_ORDER), 7))
+    return (answers.mean(axis=2) * 1.5 - 0.5).astype(np.float32)
+
+
+def synthetic_engine(count: int, seed: int = 0) -> SimilarityEngine:
+    """Motor con ocupaciones aleatorias (escala 1-7) para pruebas de escala"""
+    rng = np.random.default_rng(seed)
+    matrix = rng.uniform(1, 7, size=(count, len(RIASEC_ORDER))).astype(np.float32)
+    return SimilarityEngine(
+        ids=np.arange(1, count + 1),
+        names=[f'Ocupación {i}' for i in range(1, count + 1)],
+        carreras=[()] * count,
+        matrix=matrix
+    )
+
+
+def evaluate_recall(engine: SimilarityEngine, user_vectors, k: int = 5,
+                    min_shared_values=(1, 2, 3), min_candidates: int = 200) -> list:
+    """
+    Compara el índice Holland contra el motor exacto para cada umbral min_shared
+
+    Returns:
+        list de dicts con min_shared, recall, candidate_fraction, fallback_rate,
+        exact_ms e index_ms (latencia promedio por consulta)
+    """
+    user_vectors = np.atleast_2d(user_vectors)
+    index = HollandIndex(engine, min_candidates=min_candidates)
+
+    started = time.perf_counter()
+    exact = np.array([engine.top_k(u, k)[0] for u in user_vectors])
+    exact_ms = (time.perf_counter() - started) * 1000 / len(user_vectors)
+
+    report = []
+    for min_shared in min_shared_values:
+        started = time.perf_counter()
+        approx = np.array([index.top_k(u, k, min_shared=min_shared)[0] for u in user_vectors])
+        index_ms = (time.perf_counter() - started) * 1000 / len(user_vectors)
+
+        counts = np.array([index.candidate_count(u, min_shared) for u in user_vectors])
+        report.append({
+            'min_shared': min_shared,
+            'recall': recall_at_k(exact, approx),
+            'candidate_fraction': float(counts.mean() / engine.size),
+            'fallback_rate': float(np.mean(counts < max(min_candidates, k))),
+            'exact_ms': exact_ms,
+            'index_ms': index_ms
+        })
+    return report
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Recall del índice Holland contra el motor exacto')
+    parser.add_argument('--samples', type=int, default=1000, help='perfiles de usuario simulados')
+    parser.add_argument('--k', type=int, default=5, help='tamaño del top-k')
+    parser.add_argument('--min-candidates', type=int, default=200, help='umbral de fallback al motor exacto')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='usar un modelo aleatorio con N ocupaciones en lugar del de la BD')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        engine = synthetic_engine(args.synthetic)
+    else:
+        from services.predictions_service import PredictionsService
+        engine = PredictionsService.get_similarity_engine()
+
+    print(f"Ocupaciones: {engine.size} | perfiles: {args.samples} | k={args.k}")
+    print(f"{'min_shared':>10} {'recall@k':>9} {'candidatos':>11} {'fallback':>9} {'exacto ms':>10} {'índice ms':>10}")
+    for row in evaluate_recall(engine, sample_user_vectors(args.samples), args.k,
+                               min_candidates=args.min_candidates):
+        print(f"{row['min_shared']:>10} {row['recall']:>9.4f} {row['candidate_fraction']:>10.1%} "
+              f"{row['fallback_rate']:>8.1%} {row['exact_ms']:>10.4f} {row['index_ms']:>10.4f}")
@@ -0,0 +1,260 @@
+"""
+Bundle en disco del modelo de predicción (versionado y mapeable en memoria)
+
+Contiene MODELO_CONVERSIONES (matriz .npy + normas), las listas parseadas de
+POSIBLES_CARRERAS y el índice MATCH_OCUPACION_CARRERA, con los textos en
+tablas compactas (blob UTF-8 + offsets). Los workers de gunicorn lo abren con
+np.load(mmap_mode='r'): las páginas de la matriz se comparten entre procesos
+vía page cache y la primera predicción de un worker nuevo no toca la BD.
+
+Estructura:
+    <raíz>/CURRENT              -> nombre de la versión vigente
+    <raíz>/<versión>/manifest.json
+    <raíz>/<versión>/*.npy, *.bin
+
+Uso (exportar desde Oracle):
+    python -m services.model_bundle [directorio]
+"""
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from services.career_match_index import CareerMatchIndex
+from services.similarity_engine import SimilarityEngine
+
+logger = logging.getLogger(__name__)
+
+# 2: la versión incluye nombres de ocupaciones y carreras (los bundles de
+# formato 1 se ignoran y se vuelven a exportar)
+BUNDLE_FORMAT = 2
+CURRENT_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+
+# Versiones anteriores que se conservan al exportar (workers viejos pueden tenerlas abiertas)
+KEEP_VERSIONS = 2
+
+
+# ─── Tablas de strings ──────────────────────────────────────
+
+def _write_strings(directory: Path, name: str, strings) -> None:
+    """Guarda una secuencia de strings como blob UTF-8 + offsets int64"""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    (directory / f'{name}.bin').write_bytes(b''.join(encoded))
+    np.save(directory / f'{name}_offsets.npy', offsets)
+
+
+def _read_strings(directory: Path, name: str) -> tuple:
+    """Lee una tabla de strings guardada con _write_strings (strings internados)"""
+    blob = (directory / f'{name}.bin').read_bytes()
+    offsets = np.load(directory / f'{name}_offsets.npy')
+    return tuple(
+        sys.intern(blob[offsets[i]:offsets[i + 1]].decode('utf-8'))
+        for i in range(len(offsets) - 1)
+    )
+
+
+# ─── Exportar ───────────────────────────────────────────────
+
+def write_bundle(root, engine: SimilarityEngine, match_index: CareerMatchIndex) -> str:
+    """
+    Escribe un bundle nuevo y lo publica atómicamente en <root>/CURRENT
+
+    Args:
+        root: directorio raíz de bundles
+        engine: motor de similitud con el modelo de ocupaciones
+        match_index: índice ocupación -> carreras peruanas
+
+    Returns:
+        nombre de la versión escrita
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = f"{engine.version}-{match_index.version}"
+    target = root / version
+
+    # La versión cubre todo el contenido: un bundle válido con ese nombre es el mismo modelo
+    if _read_version_manifest(target) is None:
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{version}.', dir=root))
+        try:
+            # Modelo de ocupaciones
+            np.save(tmp_dir / 'ids.npy', np.asarray(engine.ids, dtype=np.int64))
+            np.save(tmp_dir / 'matrix.npy', engine.matrix)
+            np.save(tmp_dir / 'norms.npy', engine.norms)
+            np.save(tmp_dir / 'unit_matrix.npy', engine.unit_matrix)
+            _write_strings(tmp_dir, 'names', engine.names)
+
+            # POSIBLES_CARRERAS: tabla de strings únicos + CSR por ocupación
+            unique_careers = {}
+            carreras_pos = []
+            carreras_offsets = [0]
+            for carreras in engine.carreras:
+                for carrera in carreras:
+                    carreras_pos.append(unique_careers.setdefault(str(carrera), len(unique_careers)))
+                carreras_offsets.append(len(carreras_pos))
+            _write_strings(tmp_dir, 'carrera_strings', list(unique_careers))
+            np.save(tmp_dir / 'carreras_pos.npy', np.asarray(carreras_pos, dtype=np.int32))
+            np.save(tmp_dir / 'carreras_offsets.npy', np.asarray(carreras_offsets, dtype=np.int32))
+
+            # MATCH_OCUPACION_CARRERA (CSR)
+            np.save(tmp_dir / 'match_occupation_ids.npy', match_index.occupation_ids)
+            np.save(tmp_dir / 'match_offsets.npy', match_index.offsets)
+            np.save(tmp_dir / 'match_career_pos.npy', match_index.career_pos)
+            np.save(tmp_dir / 'match_relevancia.npy', match_index.relevancia)
+            np.save(tmp_dir / 'match_career_ids.npy', match_index.career_ids)
+            _write_strings(tmp_dir, 'match_career_names', match_index.career_names)
+
+            manifest = {
+                'format': BUNDLE_FORMAT,
+                'version': version,
+                'engine_version': engine.version,
+                'match_index_version': match_index.version,
+                'occupations': engine.size,
+                'matches': int(len(match_index.career_pos)),
+                'created_at': time.time()
+            }
+            (tmp_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+            os.chmod(tmp_dir, 0o755)
+            _replace_directory(tmp_dir, target)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    # Publicar la versión vigente de forma atómica
+    tmp_current = root / f'.{CURRENT_FILE}.tmp'
+    tmp_current.write_text(version, encoding='utf-8')
+    os.replace(tmp_current, root / CURRENT_FILE)
+
+    _prune_old_versions(root, keep=version)
+    logger.info(f"Bundle del modelo exportado: {target}")
+    return version
+
+
+def _replace_directory(source: Path, target: Path) -> None:
+    """
+    Publica source como target; un target previo (incompleto o de otro formato)
+    se aparta y se borra. Los workers que lo tenían mapeado conservan sus archivos.
+    """
+    stale = None
+    if target.exists():
+        stale = target.with_name(f'.{target.name}.stale.{os.getpid()}')
+        os.rename(target, stale)
+    os.rename(source, target)
+    if stale is not None:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def _prune_old_versions(root: Path, keep: str) -> None:
+    """Elimina bundles antiguos conservando los KEEP_VERSIONS más recientes"""
+    versions = sorted(
+        (p for p in root.iterdir() if p.is_dir() and not p.name.startswith('.') and p.name != keep),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+    for old in versions[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+# ─── Cargar ─────────────────────────────────────────────────
+
+def current_version(root):
+    """
+    Versión publicada en <root>/CURRENT (lectura barata, sin abrir el manifest)
+
+    Returns:
+        nombre de la versión o None si no hay bundle publicado
+    """
+    try:
+        return (Path(root) / CURRENT_FILE).read_text(encoding='utf-8').strip() or None
+    except OSError:
+        return None
+
+
+def read_manifest(root):
+    """
+    Lee el manifest de la versión vigente
+
+    Returns:
+        dict del manifest o None si no hay bundle publicado
+    """
+    version = current_version(root)
+    if version is None:
+        return None
+    return _read_version_manifest(Path(root) / version)
+
+
+def _read_version_manifest(directory: Path):
+    """Manifest de un directorio de versión (None si falta, es ilegible o de otro formato)"""
+    try:
+        manifest = json.loads((directory / MANIFEST_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format') != BUNDLE_FORMAT or manifest.get('version') != directory.name:
+        return None
+    return manifest
+
+
+def load_bundle(root):
+    """
+    Abre la versión vigente del bundle con los arrays mapeados en memoria
+
+    Returns:
+        tuple (engine, match_index, manifest) o None si no hay bundle válido
+    """
+    manifest = read_manifest(root)
+    if manifest is None:
+        return None
+
+    directory = Path(root) / manifest['version']
+
+    def _mmap(name):
+        return np.load(directory / f'{name}.npy', mmap_mode='r')
+
+    # POSIBLES_CARRERAS: reconstruir tuplas que comparten los strings internados
+    career_strings = _read_strings(directory, 'carrera_strings')
+    carreras_pos = np.load(directory / 'carreras_pos.npy')
+    carreras_offsets = np.load(directory / 'carreras_offsets.npy')
+    carreras = tuple(
+        tuple(career_strings[pos] for pos in carreras_pos[carreras_offsets[i]:carreras_offsets[i + 1]])
+        for i in range(len(carreras_offsets) - 1)
+    )
+
+    engine = SimilarityEngine(
+        ids=_mmap('ids'),
+        names=_read_strings(directory, 'names'),
+        carreras=carreras,
+        matrix=_mmap('matrix'),
+        norms=_mmap('norms'),
+        unit_matrix=_mmap('unit_matrix'),
+        version=manifest['engine_version']
+    )
+    match_index = CareerMatchIndex(
+        occupation_ids=_mmap('match_occupation_ids'),
+        offsets=_mmap('match_offsets'),
+        career_pos=_mmap('match_career_pos'),
+        relevancia=_mmap('match_relevancia'),
+        career_ids=_mmap('match_career_ids'),
+        career_names=_read_strings(directory, 'match_career_names'),
+        version=manifest['match_index_version']
+    )
+
+    logger.info(f"Bundle del modelo cargado (mmap): versión {manifest['version']}, "
+                f"{manifest['occupations']} ocupaciones")
+    return engine, match_index, manifest
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from config import MODEL_BUNDLE_DIR
+    from services.predictions_service import PredictionsService
+
+    target_root = sys.argv[1] if len(sys.argv) > 1 else MODEL_BUNDLE_DIR
+    print(f"Versión exportada: {PredictionsService.export_model_bundle(target_root)}")
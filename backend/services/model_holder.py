@@ -0,0 +1,130 @@
+"""
+Contenedor versionado del modelo de predicción
+Un ModelSnapshot agrupa, de forma inmutable, todo lo que usa una predicción
+(motor de similitud, backend de vecinos y el índice de carreras peruanas).
+Las recargas construyen el snapshot nuevo completo fuera del camino de las
+requests y reemplazan una sola referencia: cada request toma el snapshot una
+vez y trabaja con una versión consistente aunque haya una recarga en curso.
+"""
+import logging
+import threading
+import time
+from services.ensemble_scoring import EnsembleScorer
+
+logger = logging.getLogger(__name__)
+
+
+class ModelSnapshot:
+    """
+    Versión inmutable del modelo
+
+    Atributos:
+        engine: SimilarityEngine con la matriz de ocupaciones
+        backend: backend de vecinos más cercanos construido sobre engine
+        match_index: CareerMatchIndex ocupación -> carreras peruanas
+        scorer: EnsembleScorer con los precálculos del puntaje combinado
+        bundle_version: versión del bundle en disco de la que proviene (None si vino de la BD)
+        version: '<versión motor>:<versión índice>' (clave del cache y de las respuestas)
+        loaded_at: timestamp de construcción
+    """
+
+    __slots__ = ('engine', 'backend', 'match_index', 'scorer', 'bundle_version', 'version', 'loaded_at')
+
+    def __init__(self, engine, backend, match_index, bundle_version=None, scorer=None):
+        self.engine = engine
+        self.backend = backend
+        self.match_index = match_index
+        self.scorer = scorer if scorer is not None else EnsembleScorer(engine)
+        self.bundle_version = bundle_version
+        self.version = f"{engine.version}:{match_index.version}"
+        self.loaded_at = time.time()
+
+
+class ModelHolder:
+    """
+    Referencia al snapshot vigente con recargas serializadas
+    (solo una construcción a la vez; las lecturas nunca se bloquean salvo
+    en la primera carga del proceso)
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._build_lock = threading.Lock()
+        self.last_error = None
+
+    @property
+    def current(self):
+        """Snapshot vigente (None si todavía no se cargó)"""
+        return self._snapshot
+
+    @property
+    def reloading(self) -> bool:
+        """Hay una construcción en curso"""
+        return self._build_lock.locked()
+
+    def get(self, build) -> ModelSnapshot:
+        """
+        Snapshot vigente; en la primera llamada lo construye de forma síncrona
+        (las requests concurrentes esperan a esa única construcción)
+
+        Args:
+            build: callable(previous) -> ModelSnapshot
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._build_lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._swap(build(None))
+        return snapshot
+
+    def reload(self, build) -> ModelSnapshot:
+        """Construye un snapshot nuevo a partir del vigente y lo publica"""
+        with self._build_lock:
+            return self._swap(build(self._snapshot))
+
+    def reload_background(self, build) -> bool:
+        """
+        Recarga en un thread daemon si no hay otra construcción en curso
+
+        Returns:
+            True si se inició la recarga, False si ya había una en curso
+        """
+        if not self._build_lock.acquire(blocking=False):
+            return False
+
+        def _run():
+            try:
+                self._swap(build(self._snapshot))
+                self.last_error = None
+            except Exception as e:
+                # Se mantiene el snapshot anterior
+                self.last_error = str(e)
+                logger.error(f"Error recargando el modelo en segundo plano: {str(e)}")
+            finally:
+                self._build_lock.release()
+
+        threading.Thread(target=_run, name='model-reload', daemon=True).start()
+        return True
+
+    def _swap(self, snapshot: ModelSnapshot) -> ModelSnapshot:
+        previous = self._snapshot
+        # Asignación de una referencia: atómica para los threads lectores
+        self._snapshot = snapshot
+        if previous is None or previous.version != snapshot.version:
+            logger.info(f"Modelo de predicción publicado: versión {snapshot.version} "
+                        f"({snapshot.engine.size} ocupaciones, backend {snapshot.backend.name})")
+        return snapshot
+
+    def status(self) -> dict:
+        """Estado del contenedor para endpoints de administración"""
+        snapshot = self._snapshot
+        return {
+            'model_version': snapshot.version if snapshot else None,
+            'bundle_version': snapshot.bundle_version if snapshot else None,
+            'occupations': snapshot.engine.size if snapshot else 0,
+            'backend': snapshot.backend.name if snapshot else None,
+            'loaded_at': snapshot.loaded_at if snapshot else None,
+            'reloading': self.reloading,
+            'last_error': self.last_error
+        }
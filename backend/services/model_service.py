@@ -1,102 +1,208 @@
+"""
+Motor de recomendación por Intereses + Habilidades ponderados
+La base de ocupaciones se normaliza una sola vez (escala 1-7 -> 0-1 y filas
+a norma 1) y las respuestas se reciben como matriz (n_usuarios x 36):
+24 columnas de intereses (R1-4, I1-4, A1-4, S1-4, E1-4, C1-4) seguidas de
+12 de habilidades (R1-2, I1-2, A1-2, S1-2, E1-2, C1-2). El top-k de todos
+los usuarios sale de un solo producto matriz-matriz.
+"""
+import hashlib
+import logging
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from services.similarity_engine import SimilarityEngine, RIASEC_ORDER
 
-def recomendar_carreras(respuestas_intereses, respuestas_habilidades, df_base, 
-                        peso_intereses=0.6, peso_habilidades=0.4):
+logger = logging.getLogger(__name__)
+
+# Columnas O*NET de la base, en orden RIASEC
+COL_MAP = {
+    'R': 'Realistic',
+    'I': 'Investigative',
+    'A': 'Artistic',
+    'S': 'Social',
+    'E': 'Enterprising',
+    'C': 'Conventional'
+}
+ORDERED_COLS = [COL_MAP[k] for k in RIASEC_ORDER]
+
+# Preguntas por dimensión RIASEC en cada sección del test
+INTEREST_ITEMS = 4
+SKILL_ITEMS = 2
+
+# Orden de las 36 columnas de la matriz de respuestas
+INTEREST_KEYS = tuple(f'{cat}{i}' for cat in RIASEC_ORDER for i in range(1, INTEREST_ITEMS + 1))
+SKILL_KEYS = tuple(f'{cat}{i}' for cat in RIASEC_ORDER for i in range(1, SKILL_ITEMS + 1))
+ANSWER_COLUMNS = len(INTEREST_KEYS) + len(SKILL_KEYS)
+
+
+class WeightedRiasecEngine:
+    """
+    Base de ocupaciones pre-normalizada para el puntaje ponderado intereses/habilidades
+
+    Atributos:
+        occupations: tuple con el nombre de cada ocupación
+        posibles_carreras: tuple con las posibles carreras de cada ocupación
+        unit_base: np.ndarray float32 (m, 6) con la base en 0-1 y filas de norma 1
+        peso_intereses / peso_habilidades: pesos del vector combinado
+    """
+
+    def __init__(self, base_matrix, occupations, posibles_carreras,
+                 peso_intereses: float = 0.6, peso_habilidades: float = 0.4):
+        self.occupations = tuple(occupations)
+        self.posibles_carreras = tuple(posibles_carreras)
+        self.peso_intereses = peso_intereses
+        self.peso_habilidades = peso_habilidades
+
+        # 1-7 -> 0-1 y normalización de filas (filas en 0 quedan en 0, como sklearn)
+        base = (np.asarray(base_matrix, dtype=np.float32) - 1) / 6.0
+        self.unit_base = np.ascontiguousarray(SimilarityEngine._normalize_rows(base))
+
+    @classmethod
+    def from_dataframe(cls, df_base, peso_intereses: float = 0.6,
+                       peso_habilidades: float = 0.4) -> 'WeightedRiasecEngine':
+        """
+        Construye el motor desde el DataFrame de ocupaciones O*NET
+        (columnas Realistic..Conventional, 'Ocupacion' y 'Posibles carreras')
+        """
+        return cls(
+            base_matrix=df_base[ORDERED_COLS].to_numpy(dtype=np.float32),
+            occupations=df_base['Ocupacion'].tolist(),
+            posibles_carreras=df_base['Posibles carreras'].tolist(),
+            peso_intereses=peso_intereses,
+            peso_habilidades=peso_habilidades
+        )
+
+    @property
+    def size(self) -> int:
+        """Cantidad de ocupaciones en la base"""
+        return self.unit_base.shape[0]
+
+    @staticmethod
+    def answers_from_dicts(respuestas_intereses: dict, respuestas_habilidades: dict) -> np.ndarray:
+        """
+        Convierte los dicts de respuestas (R1-4... y R1-2...) a una fila de 36 columnas
+        """
+        return np.array(
+            [respuestas_intereses[key] for key in INTEREST_KEYS]
+            + [respuestas_habilidades[key] for key in SKILL_KEYS],
+            dtype=np.float32
+        )
+
+    @staticmethod
+    def _section_scores(answers: np.ndarray) -> tuple:
+        """
+        Promedios por dimensión RIASEC de cada sección (escala 1-5)
+
+        Returns:
+            tuple (intereses (n, 6), habilidades (n, 6))
+        """
+        dims = len(RIASEC_ORDER)
+        split = len(INTEREST_KEYS)
+        interests = answers[:, :split].reshape(-1, dims, INTEREST_ITEMS).mean(axis=2)
+        skills = answers[:, split:].reshape(-1, dims, SKILL_ITEMS).mean(axis=2)
+        return interests, skills
+
+    def profile_vectors(self, answers) -> np.ndarray:
+        """
+        Vectores combinados (ponderados) de los usuarios
+
+        Args:
+            answers: array (n, 36) o (36,) con respuestas 1-5
+
+        Returns:
+            np.ndarray float32 (n, 6) en escala -1 a 1
+        """
+        answers = np.atleast_2d(np.asarray(answers, dtype=np.float32))
+        if answers.shape[1] != ANSWER_COLUMNS:
+            raise ValueError(f"Se esperaban {ANSWER_COLUMNS} columnas de respuestas, llegaron {answers.shape[1]}")
+
+        interests, skills = self._section_scores(answers)
+        # 1-5 -> -1 a 1
+        combined = ((interests - 3) / 2.0) * self.peso_intereses + ((skills - 3) / 2.0) * self.peso_habilidades
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for row in range(len(answers)):
+                self._log_profile(interests[row], skills[row], combined[row])
+        return combined
+
+    def scores(self, answers) -> np.ndarray:
+        """
+        Similitud coseno de cada usuario contra todas las ocupaciones
+
+        Returns:
+            np.ndarray float32 (n, m)
+        """
+        return SimilarityEngine._normalize_rows(self.profile_vectors(answers)) @ self.unit_base.T
+
+    def top_k(self, answers, k: int = 5) -> tuple:
+        """
+        Top-k ocupaciones por usuario en una sola llamada
+
+        Returns:
+            tuple (indices (n, k), scores (n, k)) en orden descendente
+        """
+        similarities = self.scores(answers)
+        indices = SimilarityEngine.select_top_k(similarities, k)
+        return indices, np.take_along_axis(similarities, indices, axis=-1)
+
+    def _log_profile(self, vector_int, vector_hab, vector_combinado) -> None:
+        """Perfil RIASEC del estudiante (solo con logging en DEBUG)"""
+        lines = ["Perfil RIASEC del estudiante (escala 1-5)",
+                 f"Intereses ({self.peso_intereses:.0%}):"]
+        lines += [f"   {COL_MAP[cat]:14} | {value:5.2f}" for cat, value in zip(RIASEC_ORDER, vector_int)]
+        lines.append(f"Habilidades ({self.peso_habilidades:.0%}):")
+        lines += [f"   {COL_MAP[cat]:14} | {value:5.2f}" for cat, value in zip(RIASEC_ORDER, vector_hab)]
+        lines.append("Vector combinado (ponderado):")
+        lines += [f"   {COL_MAP[cat]:14} | {value:6.3f}" for cat, value in zip(RIASEC_ORDER, vector_combinado)]
+        logger.debug('\n'.join(lines))
+
+
+# Motor de la última base usada por recomendar_carreras: se reutiliza mientras
+# los puntajes RIASEC de la base (forma y contenido) y los pesos no cambien,
+# aunque el DataFrame se haya modificado en el lugar o sea otro objeto
+_engine_cache = {}
+
+
+def _engine_for(df_base, peso_intereses: float, peso_habilidades: float) -> WeightedRiasecEngine:
+    values = df_base[ORDERED_COLS].to_numpy(dtype=np.float32)
+    key = (values.shape, hashlib.blake2b(values.tobytes(), digest_size=16).digest(),
+           peso_intereses, peso_habilidades)
+    cached = _engine_cache.get('engine')
+    if cached is None or cached[0] != key:
+        engine = WeightedRiasecEngine(values, df_base['Ocupacion'].tolist(),
+                                      df_base['Posibles carreras'].tolist(),
+                                      peso_intereses, peso_habilidades)
+        cached = (key, engine)
+        _engine_cache['engine'] = cached
+    return cached[1]
+
+
+def recomendar_carreras(respuestas_intereses, respuestas_habilidades, df_base,
+                        peso_intereses=0.6, peso_habilidades=0.4, engine: WeightedRiasecEngine = None):
     """
     Recomienda carreras basado en Intereses + Habilidades ponderadas.
-    
+    Envoltorio de WeightedRiasecEngine (la base se normaliza una vez por contenido
+    del DataFrame; para muchas llamadas conviene construir el motor y pasarlo).
+
     Args:
         respuestas_intereses: dict con R1-4, I1-4, A1-4, S1-4, E1-4, C1-4
         respuestas_habilidades: dict con R1-2, I1-2, A1-2, S1-2, E1-2, C1-2
         df_base: DataFrame con ocupaciones y puntajes O*NET
         peso_intereses: peso del vector de intereses (0-1)
         peso_habilidades: peso del vector de habilidades (0-1)
+        engine: WeightedRiasecEngine ya construido con df_base (mismas filas
+                y orden; los pesos son los del motor)
+
+    Returns:
+        DataFrame con Ocupacion, Match_Score y Posibles carreras ordenado por Match_Score
     """
-    
-    # --- MAPEO DE COLUMNAS ---
-    col_map = {
-        'R': 'Realistic',
-        'I': 'Investigative',
-        'A': 'Artistic',
-        'S': 'Social',
-        'E': 'Enterprising',
-        'C': 'Conventional'
-    }
-    ordered_cols = [col_map[k] for k in ['R', 'I', 'A', 'S', 'E', 'C']]
-
-    # --- PROCESAR INTERESES ---
-    scores_int = {
-        'R': np.mean([respuestas_intereses['R1'], respuestas_intereses['R2'], 
-                      respuestas_intereses['R3'], respuestas_intereses['R4']]),
-        'I': np.mean([respuestas_intereses['I1'], respuestas_intereses['I2'], 
-                      respuestas_intereses['I3'], respuestas_intereses['I4']]),
-        'A': np.mean([respuestas_intereses['A1'], respuestas_intereses['A2'], 
-                      respuestas_intereses['A3'], respuestas_intereses['A4']]),
-        'S': np.mean([respuestas_intereses['S1'], respuestas_intereses['S2'], 
-                      respuestas_intereses['S3'], respuestas_intereses['S4']]),
-        'E': np.mean([respuestas_intereses['E1'], respuestas_intereses['E2'], 
-                      respuestas_intereses['E3'], respuestas_intereses['E4']]),
-        'C': np.mean([respuestas_intereses['C1'], respuestas_intereses['C2'], 
-                      respuestas_intereses['C3'], respuestas_intereses['C4']])
-    }
-    vector_int = np.array([scores_int[k] for k in ['R', 'I', 'A', 'S', 'E', 'C']])
-    vector_int_norm = (vector_int - 3) / 2.0  # 1-5 -> -1 a 1
-
-    # --- PROCESAR HABILIDADES ---
-    scores_hab = {
-        'R': np.mean([respuestas_habilidades['R1'], respuestas_habilidades['R2']]),
-        'I': np.mean([respuestas_habilidades['I1'], respuestas_habilidades['I2']]),
-        'A': np.mean([respuestas_habilidades['A1'], respuestas_habilidades['A2']]),
-        'S': np.mean([respuestas_habilidades['S1'], respuestas_habilidades['S2']]),
-        'E': np.mean([respuestas_habilidades['E1'], respuestas_habilidades['E2']]),
-        'C': np.mean([respuestas_habilidades['C1'], respuestas_habilidades['C2']])
-    }
-    vector_hab = np.array([scores_hab[k] for k in ['R', 'I', 'A', 'S', 'E', 'C']])
-    vector_hab_norm = (vector_hab - 3) / 2.0  # 1-5 -> -1 a 1
-
-    # --- VECTOR COMBINADO (PONDERADO) ---
-    vector_combinado = (vector_int_norm * peso_intereses + 
-                        vector_hab_norm * peso_habilidades)
-
-    # --- IMPRIMIR PERFIL RIASEC DEL ESTUDIANTE ---
-    print("\n" + "=" * 70)
-    print("📊 PERFIL RIASEC DEL ESTUDIANTE (Escala 1-5)")
-    print("=" * 70)
-    
-    riasec_labels = ['R (Realistic)', 'I (Investigative)', 'A (Artistic)', 
-                     'S (Social)', 'E (Enterprising)', 'C (Conventional)']
-    
-    print("\n▶ INTERESES (40%):")
-    for i, label in enumerate(riasec_labels):
-        val_int = vector_int[i]
-        print(f"   {label:20} | {val_int:5.2f} ", end="")
-        print("█" * int(val_int * 2) + "░" * (10 - int(val_int * 2)))
-    
-    print("\n▶ HABILIDADES (30%):")
-    for i, label in enumerate(riasec_labels):
-        val_hab = vector_hab[i]
-        print(f"   {label:20} | {val_hab:5.2f} ", end="")
-        print("█" * int(val_hab * 2) + "░" * (10 - int(val_hab * 2)))
-    
-    print("\n▶ VECTOR COMBINADO (PONDERADO):")
-    for i, label in enumerate(riasec_labels):
-        val_comb = vector_combinado[i]
-        print(f"   {label:20} | {val_comb:6.3f}")
-    
-    print("=" * 70)
-
-    # --- PROCESAR BASE DE DATOS ---
-    df_calc = df_base.copy()
-    df_calc[ordered_cols] = (df_calc[ordered_cols] - 1) / 6.0
-
-    # --- CALCULAR SIMILITUD ---
-    similarities = cosine_similarity(
-        vector_combinado.reshape(1, -1),
-        df_calc[ordered_cols]
-    )
-    df_calc['Match_Score'] = similarities[0]
-
-    # --- RETORNAR RESULTADOS ---
-    resultado = df_calc.sort_values(by='Match_Score', ascending=False)
-    return resultado[['Ocupacion', 'Match_Score', 'Posibles carreras']]
\ No newline at end of file
+    if engine is None:
+        engine = _engine_for(df_base, peso_intereses, peso_habilidades)
+    elif engine.size != len(df_base):
+        raise ValueError(f"El motor tiene {engine.size} ocupaciones y df_base {len(df_base)} filas")
+    answers = WeightedRiasecEngine.answers_from_dicts(respuestas_intereses, respuestas_habilidades)
+    similarities = engine.scores(answers)[0]
+    order = np.argsort(-similarities, kind='stable')
+
+    resultado = df_base.iloc[order][['Ocupacion', 'Posibles carreras']].copy()
+    resultado.insert(1, 'Match_Score', similarities[order])
+    return resultado
@@ -6,8 +6,8 @@ que han completado el test vocacional.
 
 import logging
 from datetime import datetime
-from db.db_config import OracleConnection
-from config import ORACLE_SCHEMA
+from db import queries
+from db.db_config import get_connection
 from utils.errors import DatabaseError
 
 logger = logging.getLogger(__name__)
@@ -29,26 +29,18 @@ class NpsService:
             dict con estado NPS o None si no existe registro
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    query = f"""
-                    SELECT TIEMPO_ACUMULADO, ULTIMA_FECHA_VISTO,
-                           RESPUESTA_PAGINA, RESPUESTA_TEST,
-                           ESTADO, FECHA_RESPUESTA
-                    FROM {ORACLE_SCHEMA}.USUARIO_NPS
-                    WHERE USUARIO_ID = :usuario_id
-                    """
-                    cursor.execute(query, {'usuario_id': usuario_id})
-                    row = cursor.fetchone()
+                    row = queries.NPS_STATUS.execute(cursor, {'usuario_id': usuario_id}).fetchone()
 
                     if row:
                         return {
                             'exists': True,
-                            'tiempo_acumulado': float(row[0]) if row[0] else 0,
+                            'tiempo_acumulado': row[0] or 0,
                             'ultima_fecha_visto': row[1].isoformat() if row[1] else None,
-                            'respuesta_pagina': int(row[2]) if row[2] is not None else None,
-                            'respuesta_test': int(row[3]) if row[3] is not None else None,
-                            'estado': int(row[4]) if row[4] is not None else 0,
+                            'respuesta_pagina': row[2],
+                            'respuesta_test': row[3],
+                            'estado': row[4] if row[4] is not None else 0,
                             'fecha_respuesta': row[5].isoformat() if row[5] else None
                         }
                     else:
@@ -78,24 +70,14 @@ class NpsService:
             True si se creó o ya existía
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Verificar si ya existe
-                    cursor.execute(
-                        f"SELECT 1 FROM {ORACLE_SCHEMA}.USUARIO_NPS WHERE USUARIO_ID = :usuario_id",
-                        {'usuario_id': usuario_id}
-                    )
-                    if cursor.fetchone():
+                    if queries.NPS_EXISTS.execute(cursor, {'usuario_id': usuario_id}).fetchone():
                         return True
 
                     # Crear registro inicial
-                    insert_sql = f"""
-                    INSERT INTO {ORACLE_SCHEMA}.USUARIO_NPS 
-                        (USUARIO_ID, TIEMPO_ACUMULADO, ULTIMA_FECHA_VISTO, ESTADO, FECHA_CREACION)
-                    VALUES 
-                        (:usuario_id, 0, CURRENT_TIMESTAMP, 0, CURRENT_TIMESTAMP)
-                    """
-                    cursor.execute(insert_sql, {'usuario_id': usuario_id})
+                    queries.NPS_INSERT.execute(cursor, {'usuario_id': usuario_id})
                     conn.commit()
 
                     logger.info(f"Registro NPS creado para usuario {usuario_id}")
@@ -118,14 +100,10 @@ class NpsService:
             dict con el nuevo tiempo acumulado y si debe mostrar NPS
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Primero asegurar que existe el registro
-                    cursor.execute(
-                        f"SELECT TIEMPO_ACUMULADO, ESTADO FROM {ORACLE_SCHEMA}.USUARIO_NPS WHERE USUARIO_ID = :usuario_id",
-                        {'usuario_id': usuario_id}
-                    )
-                    row = cursor.fetchone()
+                    row = queries.NPS_TIME.execute(cursor, {'usuario_id': usuario_id}).fetchone()
 
                     if not row:
                         # Crear registro si no existe
@@ -133,8 +111,8 @@ class NpsService:
                         tiempo_actual = 0
                         estado = 0
                     else:
-                        tiempo_actual = float(row[0]) if row[0] else 0
-                        estado = int(row[1]) if row[1] is not None else 0
+                        tiempo_actual = row[0] or 0
+                        estado = row[1] if row[1] is not None else 0
 
                     # Si ya completó ambas encuestas (estado=2), no actualizar más
                     if estado >= 2:
@@ -147,13 +125,7 @@ class NpsService:
                     nuevo_tiempo = tiempo_actual + seconds
 
                     # Actualizar tiempo acumulado
-                    update_sql = f"""
-                    UPDATE {ORACLE_SCHEMA}.USUARIO_NPS
-                    SET TIEMPO_ACUMULADO = :nuevo_tiempo,
-                        ULTIMA_FECHA_VISTO = CURRENT_TIMESTAMP
-                    WHERE USUARIO_ID = :usuario_id
-                    """
-                    cursor.execute(update_sql, {
+                    queries.NPS_TIME_UPDATE.execute(cursor, {
                         'nuevo_tiempo': nuevo_tiempo,
                         'usuario_id': usuario_id
                     })
@@ -201,16 +173,10 @@ class NpsService:
             if not isinstance(puntuacion, int) or puntuacion < 0 or puntuacion > 10:
                 return {'success': False, 'message': 'Puntuación debe ser entre 0 y 10'}
 
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Obtener estado actual
-                    cursor.execute(
-                        f"""SELECT RESPUESTA_PAGINA, RESPUESTA_TEST, ESTADO 
-                        FROM {ORACLE_SCHEMA}.USUARIO_NPS 
-                        WHERE USUARIO_ID = :usuario_id""",
-                        {'usuario_id': usuario_id}
-                    )
-                    row = cursor.fetchone()
+                    row = queries.NPS_RESPONSES.execute(cursor, {'usuario_id': usuario_id}).fetchone()
 
                     if not row:
                         # Crear registro si no existe
@@ -221,30 +187,21 @@ class NpsService:
                     else:
                         resp_pagina = row[0]
                         resp_test = row[1]
-                        estado = int(row[2]) if row[2] is not None else 0
+                        estado = row[2] if row[2] is not None else 0
 
-                    # Determinar qué campo actualizar
+                    # Verificar que el campo a actualizar siga vacío
                     if tipo == 'pagina':
                         if resp_pagina is not None:
                             return {'success': False, 'message': 'Ya respondiste la encuesta de la página'}
-                        campo = 'RESPUESTA_PAGINA'
                     else:
                         if resp_test is not None:
                             return {'success': False, 'message': 'Ya respondiste la encuesta del test'}
-                        campo = 'RESPUESTA_TEST'
 
                     # Calcular nuevo estado
                     nuevo_estado = estado + 1
 
                     # Actualizar respuesta
-                    update_sql = f"""
-                    UPDATE {ORACLE_SCHEMA}.USUARIO_NPS
-                    SET {campo} = :puntuacion,
-                        ESTADO = :nuevo_estado,
-                        FECHA_RESPUESTA = CURRENT_TIMESTAMP
-                    WHERE USUARIO_ID = :usuario_id
-                    """
-                    cursor.execute(update_sql, {
+                    queries.NPS_RESPONSE_UPDATE[tipo].execute(cursor, {
                         'puntuacion': puntuacion,
                         'nuevo_estado': nuevo_estado,
                         'usuario_id': usuario_id
@@ -278,15 +235,10 @@ class NpsService:
             dict con elegibilidad y detalles
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Verificar si completó el test (42 respuestas)
-                    cursor.execute(
-                        f"""SELECT COUNT(*) FROM {ORACLE_SCHEMA}.USUARIO_AFIRMACION_RPTA 
-                        WHERE USUARIO_ID = :usuario_id""",
-                        {'usuario_id': usuario_id}
-                    )
-                    count_row = cursor.fetchone()
+                    count_row = queries.NPS_TEST_ANSWERS.execute(cursor, {'usuario_id': usuario_id}).fetchone()
                     test_completed = count_row[0] >= 42 if count_row else False
 
                     if not test_completed:
@@ -297,13 +249,7 @@ class NpsService:
                         }
 
                     # Verificar estado NPS
-                    cursor.execute(
-                        f"""SELECT TIEMPO_ACUMULADO, RESPUESTA_PAGINA, RESPUESTA_TEST, ESTADO
-                        FROM {ORACLE_SCHEMA}.USUARIO_NPS 
-                        WHERE USUARIO_ID = :usuario_id""",
-                        {'usuario_id': usuario_id}
-                    )
-                    nps_row = cursor.fetchone()
+                    nps_row = queries.NPS_ELIGIBILITY.execute(cursor, {'usuario_id': usuario_id}).fetchone()
 
                     if not nps_row:
                         # Es elegible, crear registro NPS
@@ -316,7 +262,7 @@ class NpsService:
                             'pending_test': True
                         }
 
-                    estado = int(nps_row[3]) if nps_row[3] is not None else 0
+                    estado = nps_row[3] if nps_row[3] is not None else 0
 
                     if estado >= 2:
                         return {
@@ -327,7 +273,7 @@ class NpsService:
 
                     return {
                         'eligible': True,
-                        'tiempo_acumulado': float(nps_row[0]) if nps_row[0] else 0,
+                        'tiempo_acumulado': nps_row[0] or 0,
                         'estado': estado,
                         'pending_pagina': nps_row[1] is None,
                         'pending_test': nps_row[2] is None
@@ -0,0 +1,120 @@
+"""
+Catálogo de ocupaciones de MODELO_CONVERSIONES
+POSIBLES_CARRERAS se parsea una sola vez por carga a tuplas de strings
+internados (las carreras repetidas entre ocupaciones comparten el mismo
+objeto). El motor de similitud y /api/occupations usan el mismo catálogo;
+el cuerpo JSON del endpoint y su ETag se serializan una sola vez.
+"""
+import ast
+import hashlib
+import json
+import logging
+import sys
+import numpy as np
+from services.similarity_engine import RIASEC_ORDER
+
+logger = logging.getLogger(__name__)
+
+
+def parse_posibles_carreras(value) -> tuple:
+    """
+    Parsea POSIBLES_CARRERAS (LOB o string con formato de lista literal
+    ['Carrera 1', 'Carrera 2', ...]) a una tupla de strings internados
+    """
+    if value is None:
+        return ()
+
+    # Convertir a string si es LOB
+    text = value.read() if hasattr(value, 'read') else str(value)
+    if not text.strip():
+        return ()
+
+    try:
+        parsed = ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        # Si falla el parseo, tratar como string simple
+        return (sys.intern(text),)
+
+    if not isinstance(parsed, (list, tuple)):
+        parsed = [parsed]
+    return tuple(sys.intern(str(carrera)) for carrera in parsed)
+
+
+class OccupationCatalog:
+    """
+    Ocupaciones con sus vectores RIASEC y posibles carreras (USA)
+
+    Atributos:
+        ids: tuple con los IDs de MODELO_CONVERSIONES
+        names: tuple con el nombre de cada ocupación
+        carreras: tuple de tuplas con las posibles carreras de cada ocupación
+        matrix: np.ndarray float32 (n, 6) con los puntajes RIASEC (None si no se cargaron)
+    """
+
+    def __init__(self, ids, names, carreras, matrix=None):
+        self.ids = tuple(int(occ_id) for occ_id in ids)
+        self.names = tuple(names)
+        self.carreras = tuple(carreras)
+        self.matrix = matrix
+        self._json_body = None
+        self._etag = None
+
+    @classmethod
+    def from_rows(cls, rows) -> 'OccupationCatalog':
+        """
+        Construye el catálogo desde filas
+        (ID, OCUPACION, REALISTIC..CONVENTIONAL, POSIBLES_CARRERAS), con los
+        puntajes ya numéricos (queries.OCCUPATION_MODEL los trae como float)
+        """
+        dims = len(RIASEC_ORDER)
+        ids, names, carreras, vectors = [], [], [], []
+        for row in rows:
+            ids.append(row[0])
+            names.append(sys.intern(row[1]) if isinstance(row[1], str) else row[1])
+            vectors.append(row[2:2 + dims])
+            carreras.append(parse_posibles_carreras(row[2 + dims]))
+
+        matrix = np.array(vectors, dtype=np.float32).reshape(-1, dims)
+        return cls(ids, names, carreras, matrix)
+
+    @classmethod
+    def from_engine(cls, engine) -> 'OccupationCatalog':
+        """Catálogo a partir de un SimilarityEngine (p. ej. cargado desde el bundle)"""
+        return cls(engine.ids, engine.names, engine.carreras, engine.matrix)
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def to_dicts(self) -> list:
+        """
+        Returns:
+            list de dicts con {id, ocupacion, posibles_carreras}
+        """
+        return [
+            {'id': occ_id, 'ocupacion': name, 'posibles_carreras': list(carreras)}
+            for occ_id, name, carreras in zip(self.ids, self.names, self.carreras)
+        ]
+
+    def _serialize(self) -> None:
+        body = json.dumps({
+            'success': True,
+            'total': self.size,
+            'occupations': self.to_dicts()
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self._etag = hashlib.sha1(body).hexdigest()
+        self._json_body = body
+
+    @property
+    def json_body(self) -> bytes:
+        """Respuesta de /api/occupations serializada una sola vez"""
+        if self._json_body is None:
+            self._serialize()
+        return self._json_body
+
+    @property
+    def etag(self) -> str:
+        """ETag del cuerpo JSON (hash del contenido)"""
+        if self._etag is None:
+            self._serialize()
+        return self._etag
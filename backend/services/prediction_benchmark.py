@@ -0,0 +1,371 @@
+"""
+Microbenchmarks de predicción sobre modelos de ocupaciones sintéticos
+Mide PredictionsService.predict_careers (por backend de vecinos y regla de
+puntaje) y model_service (WeightedRiasecEngine y recomendar_carreras) con
+modelos aleatorios de distinto tamaño y perfiles de usuario sintéticos.
+Oracle no se usa: el snapshot del modelo se publica directamente en el
+proceso y el perfil de cada usuario sale de un diccionario en memoria.
+
+Por variante reporta latencia p50/p99, throughput, memoria pico (tracemalloc,
+en una pasada aparte para no distorsionar la latencia) y el tiempo de import
+de los módulos. El resultado se guarda en JSON para comparar entre commits:
+
+    python -m services.prediction_benchmark --output bench-$(git rev-parse --short HEAD).json
+    python -m services.prediction_benchmark --sizes 1000,10000 --baseline bench-anterior.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from services import ann_backends, ensemble_scoring
+from services import predictions_service
+from services.career_match_index import CareerMatchIndex
+from services.holland_index import synthetic_engine
+from services.model_holder import ModelSnapshot
+from services.model_service import WeightedRiasecEngine, ANSWER_COLUMNS, recomendar_carreras
+from services.prediction_cache import prediction_cache
+from services.predictions_service import PredictionsService, NAME_TO_CODE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_BACKENDS = ('exact', 'holland', 'lsh')
+DEFAULT_SCORING = ('cosine=1', 'cosine=0.6,euclidean=0.2,holland=0.2')
+
+# Módulos cuyo tiempo de import se mide (proceso nuevo por módulo)
+IMPORT_MODULES = ('services.predictions_service', 'services.model_service')
+
+# Requests medidas con tracemalloc activo
+MEMORY_REQUESTS = 20
+
+# Carreras peruanas sintéticas del índice de match
+SYNTHETIC_CAREERS = 300
+CAREERS_PER_OCCUPATION = 3
+
+
+# ─── Datos sintéticos ───────────────────────────────────────
+
+def synthetic_match_index(engine, seed: int = 0) -> CareerMatchIndex:
+    """Índice ocupación -> carreras con CAREERS_PER_OCCUPATION carreras al azar por ocupación"""
+    rng = np.random.default_rng(seed)
+    careers = rng.integers(1, SYNTHETIC_CAREERS + 1, size=(engine.size, CAREERS_PER_OCCUPATION))
+    relevance = np.sort(rng.integers(1, 101, size=careers.shape), axis=1)[:, ::-1]
+    rows = (
+        (int(occ_id), int(career), f'Carrera {career}', int(rel))
+        for occ_id, occ_careers, occ_relevance in zip(engine.ids, careers, relevance)
+        for career, rel in zip(occ_careers, occ_relevance)
+    )
+    return CareerMatchIndex.from_rows(rows)
+
+
+def synthetic_profiles(count: int, seed: int = 0) -> list:
+    """
+    Perfiles como los de USUARIO_PERFIL_RIASEC: promedio de 7 respuestas 1-5
+    por categoría, con nombres de CATEGORIAS_RIASEC
+    """
+    rng = np.random.default_rng(seed)
+    means = rng.integers(1, 6, size=(count, len(NAME_TO_CODE), 7)).mean(axis=2)
+    return [dict(zip(NAME_TO_CODE, row.tolist())) for row in means]
+
+
+def synthetic_answers(count: int, seed: int = 0) -> np.ndarray:
+    """Respuestas (count, 36) de intereses + habilidades para model_service"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(1, 6, size=(count, ANSWER_COLUMNS)).astype(np.float32)
+
+
+# ─── Medición ───────────────────────────────────────────────
+
+def _measure(call, payloads: list, warmup: int) -> dict:
+    """
+    Latencia por llamada y throughput; la memoria pico se mide aparte con
+    tracemalloc sobre las últimas MEMORY_REQUESTS llamadas (payloads no usados
+    antes, para no medir aciertos del cache de resultados)
+    """
+    for payload in payloads[:warmup]:
+        call(payload)
+
+    measured = payloads[warmup:-MEMORY_REQUESTS]
+    latencies = np.empty(len(measured))
+    started = time.perf_counter()
+    for i, payload in enumerate(measured):
+        call_started = time.perf_counter()
+        call(payload)
+        latencies[i] = time.perf_counter() - call_started
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        for payload in payloads[-MEMORY_REQUESTS:]:
+            call(payload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'requests': len(measured),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'mean_ms': float(latencies.mean() * 1000),
+        'throughput_rps': float(len(measured) / elapsed) if elapsed > 0 else None,
+        'peak_bytes': int(peak)
+    }
+
+
+def _build(factory) -> tuple:
+    """Ejecuta factory() midiendo tiempo y memoria pico de la construcción"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        built = factory()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return built, seconds, int(peak)
+
+
+def bench_predict_careers(engine, match_index, backend_name: str, scoring: str,
+                          profiles: list, warmup: int) -> dict:
+    """
+    predict_careers completo (perfil -> top-k -> carreras peruanas -> respuesta)
+    con el snapshot publicado en el proceso y el cache de resultados vacío
+    """
+    backend, build_seconds, build_peak = _build(lambda: ann_backends.build_backend(backend_name, engine))
+    snapshot = ModelSnapshot(engine, backend, match_index)
+
+    saved = (PredictionsService.get_user_riasec_profile, PredictionsService._next_reload_check,
+             dict(predictions_service._scoring_rules))
+    try:
+        # Sin Oracle: perfil en memoria y sin verificaciones de bundle/índice
+        PredictionsService.get_user_riasec_profile = staticmethod(lambda usuario_id: profiles[usuario_id])
+        PredictionsService._next_reload_check = float('inf')
+        predictions_service._scoring_rules.clear()
+        predictions_service._scoring_rules.update(ensemble_scoring.build_rules(scoring))
+        predictions_service._model_holder._swap(snapshot)
+        prediction_cache.clear()
+
+        hits_before = prediction_cache.stats()['hits']
+        result = _measure(PredictionsService.predict_careers, list(range(len(profiles))), warmup)
+        result['cache_hits'] = prediction_cache.stats()['hits'] - hits_before
+    finally:
+        PredictionsService.get_user_riasec_profile = staticmethod(saved[0])
+        PredictionsService._next_reload_check = saved[1]
+        predictions_service._scoring_rules.clear()
+        predictions_service._scoring_rules.update(saved[2])
+
+    return {
+        'target': 'predict_careers',
+        'backend': backend.name,
+        'scoring': scoring,
+        'build_seconds': build_seconds,
+        'build_peak_bytes': build_peak,
+        **result
+    }
+
+
+def bench_weighted_engine(engine, answers: np.ndarray, warmup: int) -> dict:
+    """WeightedRiasecEngine.top_k por alumno (la base se normaliza una vez)"""
+    weighted, build_seconds, build_peak = _build(
+        lambda: WeightedRiasecEngine(engine.matrix, engine.names, engine.carreras)
+    )
+    return {
+        'target': 'weighted_engine.top_k',
+        'build_seconds': build_seconds,
+        'build_peak_bytes': build_peak,
+        **_measure(lambda row: weighted.top_k(row, k=5), list(answers), warmup)
+    }
+
+
+def bench_recomendar_carreras(engine, answers: np.ndarray, warmup: int) -> dict:
+    """recomendar_carreras (envoltorio con DataFrame; requiere pandas)"""
+    # Dependencia opcional: solo para esta variante
+    import pandas as pd
+    from services.model_service import ORDERED_COLS, INTEREST_KEYS, SKILL_KEYS
+
+    df_base = pd.DataFrame(engine.matrix, columns=ORDERED_COLS)
+    df_base['Ocupacion'] = engine.names
+    df_base['Posibles carreras'] = list(engine.carreras)
+
+    split = len(INTEREST_KEYS)
+    payloads = [
+        (dict(zip(INTEREST_KEYS, row[:split].tolist())), dict(zip(SKILL_KEYS, row[split:].tolist())))
+        for row in answers
+    ]
+    return {
+        'target': 'recomendar_carreras',
+        **_measure(lambda payload: recomendar_carreras(payload[0], payload[1], df_base), payloads, warmup)
+    }
+
+
+def import_times(modules=IMPORT_MODULES) -> dict:
+    """Segundos de import de cada módulo en un proceso nuevo (sin módulos cacheados)"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import importlib, sys, time; started = time.perf_counter(); "
+            "importlib.import_module(sys.argv[1]); print(time.perf_counter() - started)")
+    times = {}
+    for module in modules:
+        completed = subprocess.run([sys.executable, '-c', code, module], cwd=backend_dir,
+                                   capture_output=True, text=True)
+        if completed.returncode == 0:
+            times[module] = float(completed.stdout.strip().splitlines()[-1])
+        else:
+            times[module] = None
+            logger.warning(f"No se pudo importar {module}: {completed.stderr.strip().splitlines()[-1:]}")
+    return times
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ─── Suite ──────────────────────────────────────────────────
+
+def run_suite(sizes=DEFAULT_SIZES, requests: int = 200, warmup: int = 20,
+              backends=DEFAULT_BACKENDS, scoring=DEFAULT_SCORING, seed: int = 0) -> dict:
+    """
+    Ejecuta todas las variantes para cada tamaño de modelo
+
+    Returns:
+        dict con 'meta' (commit, versiones, parámetros), 'imports' y 'results'
+    """
+    total = warmup + requests + MEMORY_REQUESTS
+    profiles = synthetic_profiles(total, seed)
+    answers = synthetic_answers(total, seed)
+    results = []
+
+    for size in sizes:
+        engine = synthetic_engine(size, seed)
+        match_index = synthetic_match_index(engine, seed)
+        logger.info(f"Modelo sintético: {size} ocupaciones")
+
+        variants = [
+            (lambda b=backend_name, s=rule: bench_predict_careers(engine, match_index, b, s, profiles, warmup))
+            for backend_name in backends for rule in scoring
+        ]
+        variants.append(lambda: bench_weighted_engine(engine, answers, warmup))
+        variants.append(lambda: bench_recomendar_carreras(engine, answers, warmup))
+
+        for run in variants:
+            try:
+                result = run()
+            except (ImportError, ValueError) as e:
+                # Backend o dependencia opcional no disponible
+                logger.warning(f"Variante omitida ({size} ocupaciones): {str(e)}")
+                continue
+            result['size'] = size
+            results.append(result)
+            logger.info(f"  {variant_name(result)}: p50 {result['p50_ms']:.3f} ms, "
+                        f"p99 {result['p99_ms']:.3f} ms, {result['throughput_rps']:.0f} req/s")
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'requests': requests,
+            'warmup': warmup,
+            'seed': seed
+        },
+        'imports': import_times(),
+        'results': results
+    }
+
+
+def variant_name(result: dict) -> str:
+    """Identificador estable de una variante (para comparar entre corridas)"""
+    name = f"{result['target']}@{result['size']}"
+    if 'backend' in result:
+        name += f"[{result['backend']}|{result['scoring']}]"
+    return name
+
+
+def compare(current: dict, baseline: dict, threshold: float = 1.2) -> list:
+    """
+    Variantes cuyo p50 o p99 empeoró más de `threshold` veces respecto a baseline
+
+    Returns:
+        list de dicts con variant, metric, baseline, current y ratio
+    """
+    previous = {variant_name(result): result for result in baseline.get('results', [])}
+    regressions = []
+    for result in current['results']:
+        before = previous.get(variant_name(result))
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'p99_ms'):
+            if before[metric] > 0 and result[metric] / before[metric] > threshold:
+                regressions.append({
+                    'variant': variant_name(result),
+                    'metric': metric,
+                    'baseline': before[metric],
+                    'current': result[metric],
+                    'ratio': result[metric] / before[metric]
+                })
+    return regressions
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Los logs por request de predict_careers inundarían la salida de la corrida
+    logging.getLogger('services.predictions_service').setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description='Microbenchmarks de predicción con modelos sintéticos')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='ocupaciones de cada modelo sintético (separadas por coma)')
+    parser.add_argument('--requests', type=int, default=200, help='requests medidas por variante')
+    parser.add_argument('--warmup', type=int, default=20, help='requests de calentamiento por variante')
+    parser.add_argument('--backends', default=','.join(DEFAULT_BACKENDS),
+                        help='backends de predict_careers (exact, holland, balltree, lsh)')
+    parser.add_argument('--scoring', action='append', default=None,
+                        help=f"regla de puntaje (repetible; por defecto {' y '.join(DEFAULT_SCORING)})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='archivo JSON de resultados')
+    parser.add_argument('--baseline', help='JSON de una corrida anterior para detectar regresiones')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='factor de empeoramiento de p50/p99 considerado regresión')
+    args = parser.parse_args()
+
+    report = run_suite(
+        sizes=[int(size) for size in args.sizes.split(',') if size],
+        requests=args.requests,
+        warmup=args.warmup,
+        backends=[name for name in args.backends.split(',') if name],
+        scoring=args.scoring or DEFAULT_SCORING,
+        seed=args.seed
+    )
+
+    print(f"{'variante':<72} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9} {'pico MB':>8}")
+    for result in report['results']:
+        print(f"{variant_name(result):<72} {result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+              f"{result['throughput_rps']:>9.0f} {result['peak_bytes'] / 2**20:>8.2f}")
+    for module, seconds in report['imports'].items():
+        print(f"import {module}: {'no disponible' if seconds is None else f'{seconds * 1000:.1f} ms'}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESIÓN {regression['variant']} {regression['metric']}: "
+                  f"{regression['baseline']:.3f} -> {regression['current']:.3f} ms (x{regression['ratio']:.2f})")
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,152 @@
+"""
+Cache de resultados de predicción direccionado por contenido
+- Resultados: LRU acotado en bytes, clave = hash del perfil RIASEC (6 dimensiones)
+  redondeado + versión del modelo. Perfiles idénticos comparten el resultado.
+- Perfiles por usuario: evita la query de perfil en recargas de /predicciones.
+  Cada entrada guarda la revisión de respuestas de la sesión y se invalida al
+  guardar o resetear respuestas (save_answers_batch / reset_user_answers).
+"""
+import hashlib
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from config import (
+    PREDICTION_CACHE_MAX_BYTES,
+    PREDICTION_CACHE_ROUND_DECIMALS,
+    PREDICTION_PROFILE_CACHE_MAX_USERS,
+    PREDICTION_PROFILE_CACHE_TTL_SECONDS
+)
+from services.similarity_engine import RIASEC_ORDER
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionCache:
+    """LRU thread-safe de resultados de predicción y perfiles de usuario"""
+
+    def __init__(self, max_bytes: int, max_users: int, profile_ttl_seconds: int,
+                 round_decimals: int = 3):
+        self.max_bytes = max_bytes
+        self.max_users = max_users
+        self.profile_ttl_seconds = profile_ttl_seconds
+        self.round_decimals = round_decimals
+
+        self._lock = threading.Lock()
+        self._results = OrderedDict()   # key -> (value, size_bytes)
+        self._results_bytes = 0
+        self._profiles = OrderedDict()  # usuario_id -> (answers_rev, profile, expires_at)
+        self._hits = 0
+        self._misses = 0
+
+    # ─── Resultados por contenido ───────────────────────────────
+
+    def make_key(self, riasec_code_profile: dict, model_version: str) -> str:
+        """
+        Clave direccionada por contenido: hash del perfil redondeado + versión del modelo
+        """
+        values = ','.join(
+            f"{round(float(riasec_code_profile.get(cat, 3)), self.round_decimals):.{self.round_decimals}f}"
+            for cat in RIASEC_ORDER
+        )
+        return hashlib.sha1(f"{model_version}|{values}".encode()).hexdigest()
+
+    def get(self, key: str):
+        """Obtener un resultado cacheado (None si no existe)"""
+        with self._lock:
+            item = self._results.get(key)
+            if item is None:
+                self._misses += 1
+                return None
+            self._results.move_to_end(key)
+            self._hits += 1
+            return item[0]
+
+    def put(self, key: str, value) -> None:
+        """Guardar un resultado, desalojando los menos usados si se excede max_bytes"""
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self._results_bytes -= previous[1]
+
+            self._results[key] = (value, size)
+            self._results_bytes += size
+
+            while self._results_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._results.popitem(last=False)
+                self._results_bytes -= evicted_size
+
+    # ─── Perfiles por usuario ───────────────────────────────────
+
+    def get_user_profile(self, usuario_id: int, answers_rev: str):
+        """
+        Obtener el perfil cacheado de un usuario si coincide la revisión de respuestas
+        """
+        if not answers_rev:
+            return None
+
+        with self._lock:
+            item = self._profiles.get(usuario_id)
+            if item is None:
+                return None
+
+            rev, profile, expires_at = item
+            if rev != answers_rev or expires_at <= time.time():
+                self._profiles.pop(usuario_id, None)
+                return None
+
+            self._profiles.move_to_end(usuario_id)
+            return profile
+
+    def put_user_profile(self, usuario_id: int, answers_rev: str, profile: dict) -> None:
+        """Guardar el perfil de un usuario asociado a su revisión de respuestas"""
+        if not answers_rev:
+            return
+
+        with self._lock:
+            self._profiles[usuario_id] = (
+                answers_rev, profile, time.time() + self.profile_ttl_seconds
+            )
+            self._profiles.move_to_end(usuario_id)
+            while len(self._profiles) > self.max_users:
+                self._profiles.popitem(last=False)
+
+    def invalidate_user(self, usuario_id: int) -> None:
+        """Invalidar el perfil cacheado de un usuario (sus respuestas cambiaron)"""
+        with self._lock:
+            self._profiles.pop(usuario_id, None)
+
+    # ─── Administración ─────────────────────────────────────────
+
+    def clear(self) -> None:
+        """Vaciar todo el cache"""
+        with self._lock:
+            self._results.clear()
+            self._results_bytes = 0
+            self._profiles.clear()
+
+    def stats(self) -> dict:
+        """Estadísticas de uso del cache"""
+        with self._lock:
+            return {
+                'entries': len(self._results),
+                'bytes': self._results_bytes,
+                'max_bytes': self.max_bytes,
+                'profiles': len(self._profiles),
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+
+# Instancia compartida por proceso
+prediction_cache = PredictionCache(
+    max_bytes=PREDICTION_CACHE_MAX_BYTES,
+    max_users=PREDICTION_PROFILE_CACHE_MAX_USERS,
+    profile_ttl_seconds=PREDICTION_PROFILE_CACHE_TTL_SECONDS,
+    round_decimals=PREDICTION_CACHE_ROUND_DECIMALS
+)
@@ -1,22 +1,71 @@
 """
 Servicio de predicción de carreras basado en RIASEC y cosine similarity
-Obtiene datos de USUARIO_AFIRMACION_RPTA y calcula similitud con MODELO_CONVERSIONES
+Obtiene el perfil de USUARIO_PERFIL_RIASEC (agregado de USUARIO_AFIRMACION_RPTA) y calcula similitud con MODELO_CONVERSIONES
 """
 import numpy as np
 import logging
-import ast
-from functools import lru_cache
-from sklearn.metrics.pairwise import cosine_similarity
-from db.db_config import OracleConnection
-from config import ORACLE_SCHEMA
-from utils.errors import DatabaseError
+import time
+from db import queries
+from db.db_config import get_connection, close_pool
+from config import (
+    MATCH_INDEX_MAX_AGE_SECONDS,
+    PREDICTION_BACKEND,
+    MODEL_BUNDLE_ENABLED,
+    MODEL_BUNDLE_DIR,
+    MODEL_BUNDLE_MAX_AGE_SECONDS,
+    MODEL_RELOAD_CHECK_SECONDS,
+    PREDICTION_SCORING,
+    PREDICTION_SCORING_B,
+    PREDICTION_SCORING_B_PERCENT,
+    WHAT_IF_MAX_VARIANTS,
+    ADAPTIVE_TEST_TOP_K,
+    ADAPTIVE_TEST_MIN_ANSWERS,
+    ADAPTIVE_TEST_ANSWER_SPREAD
+)
+from services import adaptive_test, ann_backends, ensemble_scoring, model_bundle, what_if
+from services.career_match_index import CareerMatchIndex
+from services.model_holder import ModelHolder, ModelSnapshot
+from services.occupation_catalog import OccupationCatalog
+from services.prediction_cache import prediction_cache
+from services.similarity_engine import SimilarityEngine, RIASEC_ORDER
+from services.test_service import TestService
+from services.warmup import register_warmup
+from utils.errors import DatabaseError, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Mapeo de nombres españoles (CATEGORIAS_RIASEC) a siglas RIASEC
+NAME_TO_CODE = {
+    'Realista': 'R',
+    'Investigativo': 'I',
+    'Artístico': 'A',
+    'Social': 'S',
+    'Emprendedor': 'E',
+    'Convencional': 'C'
+}
+
+# Cantidad de ocupaciones devueltas por predicción
+TOP_K = 5
+
+# Carreras peruanas en el ranking agregado sobre el top-k (ranked_careers_peru)
+RANKED_CAREERS_LIMIT = 10
+
+# Snapshot vigente del modelo en este proceso (ver get_model)
+_model_holder = ModelHolder()
+
+# Reglas de puntaje 'a' (y 'b' en prueba A/B) de PREDICTION_SCORING
+_scoring_rules = ensemble_scoring.build_rules(PREDICTION_SCORING, PREDICTION_SCORING_B)
+
 
 class PredictionsService:
     """Servicio para predecir carreras basado en respuestas del usuario"""
     
+    # Próxima verificación de bundle publicado / índice vencido (ver get_model)
+    _next_reload_check = 0.0
+    
+    # (motor, catálogo) de /api/occupations (ver get_occupation_catalog)
+    _catalog = None
+    
     @staticmethod
     def get_user_riasec_profile(usuario_id: int) -> dict:
         """
@@ -35,22 +84,11 @@ class PredictionsService:
             }
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    # Query que trae respuestas con categoría RIASEC
-                    query = f"""
-                    SELECT 
-                        cr.CATEGORY_NAME,
-                        AVG(uar.RIASEC_ID) as avg_score
-                    FROM {ORACLE_SCHEMA}.USUARIO_AFIRMACION_RPTA uar
-                    JOIN {ORACLE_SCHEMA}.AFIRMACIONES af ON uar.AFIRMACION_ID = af.ID
-                    JOIN {ORACLE_SCHEMA}.CATEGORIAS_RIASEC cr ON af.FK_RIASEC = cr.ID
-                    WHERE uar.USUARIO_ID = :usuario_id
-                    GROUP BY cr.CATEGORY_NAME
-                    """
-                    
-                    cursor.execute(query, {'usuario_id': usuario_id})
-                    results = cursor.fetchall()
+                    # Perfil materializado (suma/cantidad por categoría), mantenido
+                    # incrementalmente por TestService al guardar respuestas
+                    results = queries.USER_PROFILE.execute(cursor, {'usuario_id': usuario_id}).fetchall()
                     
                     if not results:
                         raise DatabaseError(f"No se encontraron respuestas para usuario {usuario_id}")
@@ -59,7 +97,7 @@ class PredictionsService:
                     riasec_profile = {}
                     for row in results:
                         category = row[0]  # CATEGORY_NAME (R, I, A, S, E, C)
-                        score = float(row[1])  # Promedio de puntajes (1-5)
+                        score = row[1] / row[2]  # Promedio de puntajes (1-5)
                         riasec_profile[category] = score
                     
                     logger.info(f"Perfil RIASEC obtenido para usuario {usuario_id}: {riasec_profile}")
@@ -70,87 +108,253 @@ class PredictionsService:
             raise DatabaseError(f"Error obteniendo perfil RIASEC: {str(e)}")
     
     @staticmethod
-    @lru_cache(maxsize=1)
-    def get_occupations_model() -> list:
+    def load_occupation_catalog() -> OccupationCatalog:
         """
-        Obtiene todas las ocupaciones del modelo MODELO_CONVERSIONES
+        Carga MODELO_CONVERSIONES en un catálogo (POSIBLES_CARRERAS parseado una vez)
+        (sin cache: el modelo en uso vive en el snapshot de get_model)
         
         Returns:
-            list de dicts con ocupaciones y sus vectores RIASEC
+            OccupationCatalog con IDs, nombres, vectores RIASEC y posibles carreras
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    query = f"""
-                    SELECT 
-                        ID,
-                        OCUPACION,
-                        REALISTIC,
-                        INVESTIGATIVE,
-                        ARTISTIC,
-                        SOCIAL,
-                        ENTERPRISING,
-                        CONVENTIONAL,
-                        CAST(POSIBLES_CARRERAS AS VARCHAR2(4000)) as POSIBLES_CARRERAS
-                    FROM {ORACLE_SCHEMA}.MODELO_CONVERSIONES
-                    ORDER BY ID
-                    """
+                    catalog = OccupationCatalog.from_rows(queries.OCCUPATION_MODEL.execute(cursor).fetchall())
                     
-                    cursor.execute(query)
-                    results = cursor.fetchall()
-                    
-                    occupations = []
-                    for row in results:
-                        # Manejar POSIBLES_CARRERAS (puede ser LOB o string con formato array)
-                        carreras_data = row[8]
-                        carreras_list = []
-                        
-                        if carreras_data is not None:
-                            # Convertir a string si es LOB
-                            if hasattr(carreras_data, 'read'):
-                                carreras_str = carreras_data.read()
-                            else:
-                                carreras_str = str(carreras_data)
-                            
-                            # Parsear el formato de array literal: ['Carrera 1', 'Carrera 2', ...]
-                            if carreras_str.strip():
-                                try:
-                                    # ast.literal_eval convierte el string a lista Python
-                                    carreras_list = ast.literal_eval(carreras_str)
-                                    # Asegurar que es una lista
-                                    if not isinstance(carreras_list, list):
-                                        carreras_list = [carreras_list]
-                                except (ValueError, SyntaxError):
-                                    # Si falla el parseo, tratar como string simple
-                                    carreras_list = [carreras_str]
-                        
-                        occupation = {
-                            'id': row[0],
-                            'name': row[1],
-                            'vector': np.array([
-                                float(row[2]),  # REALISTIC
-                                float(row[3]),  # INVESTIGATIVE
-                                float(row[4]),  # ARTISTIC
-                                float(row[5]),  # SOCIAL
-                                float(row[6]),  # ENTERPRISING
-                                float(row[7])   # CONVENTIONAL
-                            ]),
-                            'carreras': carreras_list
-                        }
-                        occupations.append(occupation)
-                    
-                    logger.info(f"Cargadas {len(occupations)} ocupaciones del modelo")
-                    return occupations
+                    logger.info(f"Cargadas {catalog.size} ocupaciones del modelo")
+                    return catalog
                     
         except Exception as e:
             logger.error(f"Error cargando modelo de ocupaciones: {str(e)}")
             raise DatabaseError(f"Error cargando modelo: {str(e)}")
+
+    @staticmethod
+    def _build_backend(engine: SimilarityEngine):
+        """
+        Backend de vecinos más cercanos (PREDICTION_BACKEND) sobre el motor.
+        Si el backend configurado no puede construirse (p. ej. falta
+        scikit-learn) se usa el recorrido completo.
+        """
+        try:
+            return ann_backends.build_backend(PREDICTION_BACKEND, engine)
+        except (ImportError, ValueError) as e:
+            logger.warning(f"Backend de predicción '{PREDICTION_BACKEND}' no disponible, usando exact: {str(e)}")
+            return ann_backends.ExactBackend(engine)
+
+    @staticmethod
+    def _same_engine(previous: ModelSnapshot, engine: SimilarityEngine) -> bool:
+        """
+        Si el motor del snapshot anterior (con su backend y scorer) puede seguir
+        usándose: misma versión (IDs, matriz, nombres y carreras) y mismos
+        nombres y posibles carreras, para no servir textos viejos tras editarlos
+        """
+        return (previous is not None
+                and previous.engine.version == engine.version
+                and previous.engine.names == engine.names
+                and previous.engine.carreras == engine.carreras)
+
+    @staticmethod
+    def _snapshot_from_bundle(previous: ModelSnapshot = None):
+        """
+        Snapshot desde el bundle en disco (mmap), reutilizando motor y backend
+        del snapshot anterior si el modelo no cambió
+
+        Returns:
+            ModelSnapshot o None si no hay bundle disponible
+        """
+        if not MODEL_BUNDLE_ENABLED:
+            return None
+        try:
+            bundle = model_bundle.load_bundle(MODEL_BUNDLE_DIR)
+        except Exception as e:
+            logger.warning(f"No se pudo cargar el bundle del modelo en {MODEL_BUNDLE_DIR}: {str(e)}")
+            return None
+        if bundle is None:
+            return None
+
+        engine, match_index, manifest = bundle
+        if PredictionsService._same_engine(previous, engine):
+            engine, backend, scorer = previous.engine, previous.backend, previous.scorer
+        else:
+            backend, scorer = PredictionsService._build_backend(engine), None
+        return ModelSnapshot(engine, backend, match_index, bundle_version=manifest['version'], scorer=scorer)
+
+    @staticmethod
+    def _load_initial_model(previous: ModelSnapshot = None) -> ModelSnapshot:
+        """
+        Primera carga del proceso: bundle en disco si existe; si no, Oracle.
+        Si falla solo el índice de carreras peruanas se usa uno vacío, que se
+        reintenta en la siguiente verificación de get_model.
+        """
+        snapshot = PredictionsService._snapshot_from_bundle(previous)
+        if snapshot is not None:
+            return snapshot
+
+        engine = SimilarityEngine.from_catalog(PredictionsService.load_occupation_catalog())
+        try:
+            match_index = PredictionsService._load_match_index()
+        except DatabaseError:
+            match_index = CareerMatchIndex.from_rows([])
+            match_index.loaded_at = 0
+        return ModelSnapshot(engine, PredictionsService._build_backend(engine), match_index)
+
+    @staticmethod
+    def _reload_model_from_db(previous: ModelSnapshot = None) -> ModelSnapshot:
+        """
+        Recarga completa desde Oracle (modelo + índice de carreras peruanas).
+        Publica además un bundle nuevo para que los demás workers lo tomen.
+        """
+        engine = SimilarityEngine.from_catalog(PredictionsService.load_occupation_catalog())
+        if PredictionsService._same_engine(previous, engine):
+            engine, backend, scorer = previous.engine, previous.backend, previous.scorer
+        else:
+            backend, scorer = PredictionsService._build_backend(engine), None
+        match_index = PredictionsService._load_match_index()
+
+        bundle_version = None
+        if MODEL_BUNDLE_ENABLED:
+            try:
+                bundle_version = model_bundle.write_bundle(MODEL_BUNDLE_DIR, engine, match_index)
+            except OSError as e:
+                logger.warning(f"No se pudo publicar el bundle del modelo: {str(e)}")
+        return ModelSnapshot(engine, backend, match_index, bundle_version=bundle_version, scorer=scorer)
+
+    @staticmethod
+    def _reload_from_bundle(previous: ModelSnapshot = None) -> ModelSnapshot:
+        """Toma la versión publicada en el bundle (si desapareció, conserva la vigente)"""
+        snapshot = PredictionsService._snapshot_from_bundle(previous)
+        if snapshot is not None:
+            return snapshot
+        return previous if previous is not None else PredictionsService._load_initial_model()
+
+    @staticmethod
+    def _reload_match_index(previous: ModelSnapshot) -> ModelSnapshot:
+        """Mismo motor y backend con el índice de carreras peruanas recargado"""
+        return ModelSnapshot(previous.engine, previous.backend,
+                             PredictionsService._load_match_index(),
+                             bundle_version=previous.bundle_version, scorer=previous.scorer)
+
+    @staticmethod
+    def get_model() -> ModelSnapshot:
+        """
+        Snapshot vigente del modelo (motor, backend e índice de carreras).
+        Cada MODEL_RELOAD_CHECK_SECONDS verifica, sin bloquear la request, si
+        hay un bundle más nuevo publicado por otro worker o si el índice de
+        carreras superó MATCH_INDEX_MAX_AGE_SECONDS, y recarga en segundo plano.
+        """
+        model = _model_holder.get(PredictionsService._load_initial_model)
+
+        now = time.time()
+        if now >= PredictionsService._next_reload_check and not _model_holder.reloading:
+            PredictionsService._next_reload_check = now + MODEL_RELOAD_CHECK_SECONDS
+            published = model_bundle.current_version(MODEL_BUNDLE_DIR) if MODEL_BUNDLE_ENABLED else None
+            if published is not None and published != model.bundle_version:
+                _model_holder.reload_background(PredictionsService._reload_from_bundle)
+            elif MATCH_INDEX_MAX_AGE_SECONDS > 0 and now - model.match_index.loaded_at > MATCH_INDEX_MAX_AGE_SECONDS:
+                _model_holder.reload_background(PredictionsService._reload_match_index)
+
+        return model
+
+    @staticmethod
+    def reload_model(wait: bool = False) -> dict:
+        """
+        Recarga el modelo desde Oracle construyendo el snapshot nuevo aparte y
+        reemplazando la referencia al terminar (sin impacto en las requests en curso)
+
+        Args:
+            wait: esperar a que termine la recarga en lugar de hacerla en segundo plano
+
+        Returns:
+            dict con 'started' y el estado del contenedor (model_version, reloading, ...)
+        """
+        PredictionsService.get_model()
+        if wait:
+            _model_holder.reload(PredictionsService._reload_model_from_db)
+            started = True
+        else:
+            started = _model_holder.reload_background(PredictionsService._reload_model_from_db)
+        return {'started': started, **_model_holder.status()}
+
+    @staticmethod
+    def get_similarity_engine() -> SimilarityEngine:
+        """Motor de similitud del snapshot vigente"""
+        return PredictionsService.get_model().engine
+
+
+    @staticmethod
+    def export_model_bundle(root: str = MODEL_BUNDLE_DIR) -> str:
+        """
+        Exporta desde Oracle el modelo de ocupaciones y el índice de carreras
+        peruanas a un bundle versionado en disco
+
+        Returns:
+            versión del bundle publicado
+        """
+        engine = SimilarityEngine.from_catalog(PredictionsService.load_occupation_catalog())
+        match_index = PredictionsService._load_match_index()
+        return model_bundle.write_bundle(root, engine, match_index)
+
+    @staticmethod
+    def ensure_model_bundle() -> None:
+        """
+        Exporta el bundle si no existe o supera MODEL_BUNDLE_MAX_AGE_SECONDS.
+        Pensado para el master de gunicorn (--preload): cierra el pool al terminar
+        para que los workers forkeados no hereden conexiones.
+        """
+        if not MODEL_BUNDLE_ENABLED:
+            return
+        try:
+            manifest = model_bundle.read_manifest(MODEL_BUNDLE_DIR)
+            if manifest and time.time() - manifest['created_at'] < MODEL_BUNDLE_MAX_AGE_SECONDS:
+                logger.info(f"Bundle del modelo vigente: versión {manifest['version']}")
+                return
+            PredictionsService.export_model_bundle(MODEL_BUNDLE_DIR)
+        except Exception as e:
+            logger.warning(f"No se pudo exportar el bundle del modelo: {str(e)}")
+        finally:
+            # Las conexiones del master no deben heredarse: cada worker abre el bundle
+            close_pool()
     
+    @staticmethod
+    def _load_match_index() -> CareerMatchIndex:
+        """
+        Carga la tabla completa MATCH_OCUPACION_CARRERA + CARRERAS_NUEVO
+        en un índice CSR (una sola query con texto SQL fijo)
+        """
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    index = CareerMatchIndex.from_rows(queries.CAREER_MATCHES.execute(cursor).fetchall())
+                    
+                    logger.info(f"Índice de carreras peruanas cargado: {len(index.occupation_ids)} ocupaciones, "
+                                f"{len(index.career_pos)} matches, {index.nbytes} bytes, versión {index.version}")
+                    return index
+                    
+        except Exception as e:
+            logger.error(f"Error cargando índice de carreras peruanas: {str(e)}")
+            raise DatabaseError(f"Error cargando índice de carreras peruanas: {str(e)}")
+
+
+    @staticmethod
+    def refresh_match_index() -> CareerMatchIndex:
+        """
+        Recarga el índice de carreras peruanas desde la BD y publica un snapshot
+        nuevo (las requests en curso siguen usando el anterior)
+        """
+        PredictionsService.get_model()
+        return _model_holder.reload(PredictionsService._reload_match_index).match_index
+
+    @staticmethod
+    def get_match_index() -> CareerMatchIndex:
+        """Índice ocupación -> carreras peruanas del snapshot vigente"""
+        return PredictionsService.get_model().match_index
+
     @staticmethod
     def get_matched_careers_peru(occupation_ids: list) -> dict:
         """
         Obtiene las carreras peruanas matcheadas para una lista de ocupaciones
-        usando la tabla MATCH_OCUPACION_CARRERA + CARRERAS_NUEVO.
+        desde el índice en memoria de MATCH_OCUPACION_CARRERA + CARRERAS_NUEVO
+        (sin round trip a la BD).
         
         Args:
             occupation_ids: Lista de IDs de ocupaciones de MODELO_CONVERSIONES
@@ -158,212 +362,587 @@ class PredictionsService:
         Returns:
             dict con {occupation_id: [lista de carreras peruanas]}
         """
-        try:
-            with OracleConnection() as conn:
-                with conn.cursor() as cursor:
-                    # Crear placeholders para IN clause
-                    placeholders = ','.join([f':id{i}' for i in range(len(occupation_ids))])
-                    params = {f'id{i}': oid for i, oid in enumerate(occupation_ids)}
-                    
-                    query = f"""
-                    SELECT 
-                        m.ID_OCUPACION,
-                        c.ID,
-                        c.CARRERA,
-                        m.RELEVANCIA
-                    FROM {ORACLE_SCHEMA}.MATCH_OCUPACION_CARRERA m
-                    JOIN {ORACLE_SCHEMA}.CARRERAS_NUEVO c ON m.ID_CARRERA = c.ID
-                    WHERE m.ID_OCUPACION IN ({placeholders})
-                    ORDER BY m.ID_OCUPACION, m.RELEVANCIA DESC
-                    """
-                    
-                    cursor.execute(query, params)
-                    results = cursor.fetchall()
-                    
-                    # Agrupar por ocupación
-                    careers_by_occupation = {oid: [] for oid in occupation_ids}
-                    for row in results:
-                        occ_id = row[0]
-                        careers_by_occupation[occ_id].append({
-                            'id': row[1],
-                            'nombre': row[2],
-                            'relevancia': int(row[3]) if row[3] is not None else 0
-                        })
-                    
-                    logger.info(f"Carreras peruanas obtenidas para {len(occupation_ids)} ocupaciones")
-                    return careers_by_occupation
-                    
-        except Exception as e:
-            logger.error(f"Error obteniendo carreras peruanas matcheadas: {str(e)}")
-            return {oid: [] for oid in occupation_ids}
+        return PredictionsService.get_match_index().careers_for_many(occupation_ids)
+
+    @staticmethod
+    def _to_code_profile(profile: dict) -> dict:
+        """
+        Convierte un perfil {nombre de categoría: puntaje} a {sigla RIASEC: puntaje}
+        """
+        riasec_code_profile = {}
+        for name, score in profile.items():
+            code = NAME_TO_CODE.get(name)
+            if code:
+                riasec_code_profile[code] = score
+        return riasec_code_profile
 
     @staticmethod
-    def predict_careers(usuario_id: int) -> dict:
+    def _to_user_vector(riasec_code_profile: dict) -> np.ndarray:
+        """
+        Construye el vector del usuario (escala 1-5 -> 1-7 de MODELO_CONVERSIONES)
+        Conversión: (valor - 1) * 1.5 + 1 = valor * 1.5 - 0.5
+        Si valor=1: 1*1.5-0.5=1 ✓
+        Si valor=3: 3*1.5-0.5=4 ✓
+        Si valor=5: 5*1.5-0.5=7 ✓
+        Categorías faltantes se asumen neutras (3)
+        """
+        return np.array([
+            riasec_code_profile.get(cat, 3) * 1.5 - 0.5
+            for cat in RIASEC_ORDER
+        ])
+
+    @staticmethod
+    def _scoring_rule(usuario_id: int = None) -> ensemble_scoring.ScoringRule:
+        """Regla de puntaje del usuario (grupo A/B estable por ID; anónimos usan 'a')"""
+        return ensemble_scoring.assign_rule(_scoring_rules, usuario_id, PREDICTION_SCORING_B_PERCENT)
+
+    @staticmethod
+    def _top_k(model: ModelSnapshot, user_matrix: np.ndarray,
+               rule: ensemble_scoring.ScoringRule) -> tuple:
+        """
+        Top-k de varios usuarios según la regla de puntaje
+
+        Con solo coseno el top-k sale del backend configurado (PREDICTION_BACKEND)
+        y las demás métricas se calculan solo para esas k ocupaciones; con una
+        regla combinada se puntúa el modelo completo en una pasada del EnsembleScorer.
+
+        Returns:
+            tuple (indices (m, k), puntajes (m, k), {métrica: (m, k)})
+        """
+        if rule.cosine_only:
+            top_indices, top_scores = model.backend.top_k_batch(user_matrix, k=TOP_K)
+            return top_indices, top_scores, model.scorer.metrics_at(user_matrix, top_indices)
+        return model.scorer.top_k_batch(user_matrix, rule, k=TOP_K)
+
+    @staticmethod
+    def _rank_occupations(model: ModelSnapshot, top_indices, top_scores, metrics: dict,
+                          carreras_peru: dict) -> dict:
+        """
+        Arma el ranking de una predicción a partir del top-k ya calculado
+
+        Args:
+            model: snapshot del modelo usado para el ranking
+            top_indices: índices (filas de la matriz) del top-k en orden descendente
+            top_scores: puntaje combinado de cada índice
+            metrics: dict {métrica: valores del top-k} (cosine, euclidean, holland)
+            carreras_peru: dict {occupation_id: [carreras peruanas]}
+
+        Returns:
+            dict con 'top_occupations' y 'ranked_careers_peru' (puntaje × relevancia
+            agregado sobre todo el top-k desde el índice en memoria)
+        """
+        engine = model.engine
+        top_occupations = []
+        for position, (idx, score) in enumerate(zip(top_indices, top_scores)):
+            occ_id = int(engine.ids[idx])
+            top_occupations.append({
+                'id': occ_id,
+                'name': engine.names[idx],
+                'similarity': float(metrics['cosine'][position]),
+                'score': float(score),
+                'scores': {metric: float(values[position]) for metric, values in metrics.items()},
+                'carreras': engine.carreras[idx],
+                'carreras_peru': carreras_peru.get(occ_id, [])
+            })
+
+        ranked_careers_peru = model.match_index.rank_careers(
+            [occ['id'] for occ in top_occupations],
+            [occ['score'] for occ in top_occupations],
+            limit=RANKED_CAREERS_LIMIT
+        )
+        return {
+            'top_occupations': top_occupations,
+            'ranked_careers_peru': ranked_careers_peru
+        }
+
+    @staticmethod
+    def _build_prediction(ranking: dict, riasec_code_profile: dict,
+                          model_version: str, rule: ensemble_scoring.ScoringRule) -> dict:
+        """
+        Arma la respuesta de predicción a partir del top de ocupaciones y el perfil
+
+        Args:
+            ranking: resultado de _rank_occupations (puede venir del cache)
+            riasec_code_profile: perfil {sigla: puntaje 1-5}
+            model_version: versión del snapshot del modelo usado
+            rule: regla de puntaje usada en el ranking
+        """
+        # La mejor ocupación es la primera del top
+        top_occupations = ranking['top_occupations']
+        best_occupation = top_occupations[0]
+
+        # Perfil escalado a 1-7 para mostrar en frontend
+        riasec_profile_scaled = {
+            cat: float(riasec_code_profile.get(cat, 3) * 1.5 - 0.5)
+            for cat in RIASEC_ORDER
+        }
+
+        return {
+            'success': True,
+            'occupation': {
+                'id': best_occupation['id'],
+                'name': best_occupation['name'],
+                'similarity': best_occupation['similarity'],
+                'score': best_occupation['score']
+            },
+            'suggested_careers': best_occupation['carreras'],
+            'suggested_careers_peru': best_occupation['carreras_peru'],
+            'ranked_careers_peru': ranking['ranked_careers_peru'],
+            'top_occupations': top_occupations,
+            'user_profile': riasec_code_profile,
+            'user_profile_scaled': riasec_profile_scaled,
+            'model_version': model_version,
+            'scoring': rule.to_dict()
+        }
+
+    @staticmethod
+    def get_user_code_profile(usuario_id: int, answers_rev: str = None) -> dict:
+        """
+        Perfil {sigla RIASEC: puntaje 1-5} del usuario
+        (cache por revisión de respuestas de la sesión o BD)
+        
+        Raises:
+            DatabaseError: si el usuario no tiene respuestas o falla la consulta
+        """
+        riasec_code_profile = prediction_cache.get_user_profile(usuario_id, answers_rev)
+        if riasec_code_profile is None:
+            profile = PredictionsService.get_user_riasec_profile(usuario_id)
+            riasec_code_profile = PredictionsService._to_code_profile(profile)
+            prediction_cache.put_user_profile(usuario_id, answers_rev, riasec_code_profile)
+        return riasec_code_profile
+
+    @staticmethod
+    def _predict_profile(riasec_code_profile: dict, rule: ensemble_scoring.ScoringRule) -> dict:
+        """
+        Predicción para un perfil {sigla: puntaje 1-5} ya calculado
+        (compartida por la predicción del usuario logueado y la anónima)
+        """
+        # Snapshot del modelo tomado una sola vez: motor, backend e índice
+        # de la misma versión aunque haya una recarga en curso
+        model = PredictionsService.get_model()
+        engine = model.engine
+        
+        # Perfiles idénticos comparten resultado (clave = perfil + versión del modelo + regla)
+        model_version = model.version
+        cache_key = prediction_cache.make_key(riasec_code_profile, f"{model_version}|{rule.key}")
+        ranking = prediction_cache.get(cache_key)
+        
+        if ranking is None:
+            user_vector = PredictionsService._to_user_vector(riasec_code_profile)
+            logger.info(f"Vector usuario: {user_vector}")
+            
+            # Top 5 en orden descendente según la regla de puntaje (con solo coseno,
+            # backend configurado: recorrido completo, índice Holland, BallTree o LSH)
+            top_indices, top_scores, metrics = PredictionsService._top_k(
+                model, user_vector[np.newaxis, :], rule
+            )
+            
+            # Carreras peruanas del top 5 desde el índice en memoria
+            top_ids = [int(engine.ids[idx]) for idx in top_indices[0]]
+            carreras_peru = model.match_index.careers_for_many(top_ids)
+            
+            ranking = PredictionsService._rank_occupations(
+                model, top_indices[0], top_scores[0],
+                {metric: values[0] for metric, values in metrics.items()}, carreras_peru
+            )
+            prediction_cache.put(cache_key, ranking)
+        
+        logger.info(f"Top {TOP_K} ocupaciones predichas (regla {rule.name}):")
+        for i, occ in enumerate(ranking['top_occupations'], 1):
+            logger.info(f"  {i}. {occ['name']} ({occ['score']:.4f})")
+        
+        return PredictionsService._build_prediction(ranking, riasec_code_profile, model_version, rule)
+
+    @staticmethod
+    def predict_careers(usuario_id: int, answers_rev: str = None) -> dict:
         """
         Predice las mejores carreras para un usuario usando cosine similarity
         
         Args:
             usuario_id: ID del usuario
+            answers_rev: revisión de respuestas de la sesión; si se envía, el
+                         perfil del usuario se reutiliza del cache mientras no cambie
             
         Returns:
             dict con ocupación predicha y carreras sugeridas
         """
         try:
-            # Obtener perfil RIASEC del usuario
-            profile = PredictionsService.get_user_riasec_profile(usuario_id)
-            
-            # Mapeo de nombres españoles a siglas RIASEC
-            name_to_code = {
-                'Realista': 'R',
-                'Investigativo': 'I',
-                'Artístico': 'A',
-                'Social': 'S',
-                'Emprendedor': 'E',
-                'Convencional': 'C'
-            }
-            
-            # Convertir profile a códigos RIASEC
-            riasec_code_profile = {}
-            for name, score in profile.items():
-                code = name_to_code.get(name)
-                if code:
-                    riasec_code_profile[code] = score
+            riasec_code_profile = PredictionsService.get_user_code_profile(usuario_id, answers_rev)
             
             # Asegurar que tenemos todas las categorías
-            riasec_order = ['R', 'I', 'A', 'S', 'E', 'C']
-            if len(riasec_code_profile) != 6:
+            if len(riasec_code_profile) != len(RIASEC_ORDER):
                 logger.warning(f"Perfil incompleto para usuario {usuario_id}: {riasec_code_profile}")
             
-            # Construir vector del usuario (escala 1-5 -> normalizar a 1-7 para MODELO_CONVERSIONES)
-            # Conversión correcta: (valor - 1) * 1.5 + 1 = valor * 1.5 - 0.5
-            # Si valor=1: 1*1.5-0.5=1 ✓
-            # Si valor=3: 3*1.5-0.5=4 ✓
-            # Si valor=5: 5*1.5-0.5=7 ✓
-            user_vector = np.array([
-                riasec_code_profile.get(cat, 3) * 1.5 - 0.5  # Escalar de 1-5 a 1-7
-                for cat in riasec_order
-            ])
+            return PredictionsService._predict_profile(
+                riasec_code_profile, PredictionsService._scoring_rule(usuario_id)
+            )
             
-            logger.info(f"Vector usuario: {user_vector}")
+        except DatabaseError as e:
+            logger.error(f"Error en predicción: {str(e)}")
+            return {
+                'success': False,
+                'message': str(e)
+            }
+
+    @staticmethod
+    def profile_from_answers(answers: list) -> dict:
+        """
+        Perfil {sigla: puntaje 1-5} a partir de las respuestas del test completo
+        (promedio por categoría, igual que USUARIO_PERFIL_RIASEC) usando el mapa
+        afirmación -> categoría cacheado en el proceso
+        
+        Args:
+            answers: lista de dicts con 'afirmacion_id' y 'riasec_id' (1-5)
+            
+        Raises:
+            ValidationError: si hay afirmaciones desconocidas, repetidas o faltantes
+            DatabaseError: si no se pudo cargar el mapa de afirmaciones
+        """
+        categories = TestService.get_afirmacion_categories()
+        
+        sums = {}
+        counts = {}
+        seen = set()
+        for answer in answers:
+            afirmacion_id = answer['afirmacion_id']
+            category = categories.get(afirmacion_id)
+            if category is None:
+                raise ValidationError(f"Afirmación desconocida: {afirmacion_id}")
+            if afirmacion_id in seen:
+                raise ValidationError(f"Afirmación repetida: {afirmacion_id}")
+            seen.add(afirmacion_id)
+            sums[category] = sums.get(category, 0) + answer['riasec_id']
+            counts[category] = counts.get(category, 0) + 1
+        
+        if len(seen) != len(categories):
+            raise ValidationError(f"Se requieren las {len(categories)} respuestas del test "
+                                  f"(llegaron {len(seen)})")
+        
+        return PredictionsService._to_code_profile({
+            category: sums[category] / counts[category] for category in sums
+        })
+
+    @staticmethod
+    def predict_from_answers(answers: list) -> dict:
+        """
+        Predicción anónima (sin sesión): el perfil se calcula en memoria a partir
+        de las respuestas enviadas y no se escribe nada en la BD
+        
+        Args:
+            answers: lista de dicts con 'afirmacion_id' y 'riasec_id' (1-5)
+            
+        Raises:
+            ValidationError: si las respuestas no corresponden al test completo
+        """
+        try:
+            riasec_code_profile = PredictionsService.profile_from_answers(answers)
+            return PredictionsService._predict_profile(riasec_code_profile, PredictionsService._scoring_rule())
+            
+        except DatabaseError as e:
+            logger.error(f"Error en predicción anónima: {str(e)}")
+            return {
+                'success': False,
+                'message': str(e)
+            }
+
+    @staticmethod
+    def evaluate_early_stop(usuario_id: int, totals: dict) -> dict:
+        """
+        Test adaptativo: indica si el top ADAPTIVE_TEST_TOP_K de ocupaciones ya
+        es el mismo para cualquier valor plausible de las respuestas pendientes
+        (ADAPTIVE_TEST_ANSWER_SPREAD; cota exacta sobre la caja de perfiles
+        posibles, ver services.adaptive_test), con la matriz del modelo en
+        memoria y sin consultas a la BD
+        
+        Args:
+            usuario_id: ID del usuario (define su regla de puntaje)
+            totals: dict {nombre de categoría: (suma, cantidad)} de las respuestas
+                    guardadas ('totals' de TestService.save_answers_batch)
             
-            # Obtener modelo de ocupaciones
-            occupations = PredictionsService.get_occupations_model()
+        Returns:
+            dict con 'stop', 'answered', 'total', 'stable', 'order_stable'
+            y 'top_occupations' (el top en el centro de la caja)
+        """
+        categories = TestService.get_afirmacion_categories()
+        items = {}
+        for category in categories.values():
+            code = NAME_TO_CODE.get(category)
+            if code:
+                items[code] = items.get(code, 0) + 1
+        
+        code_totals = {
+            NAME_TO_CODE[name]: value for name, value in totals.items() if name in NAME_TO_CODE
+        }
+        answered = sum(cantidad for _, cantidad in code_totals.values())
+        result = {
+            'stop': False,
+            'answered': answered,
+            'total': len(categories)
+        }
+        
+        # La cota lineal vale para el ranking por coseno
+        if not PredictionsService._scoring_rule(usuario_id).cosine_only:
+            result['stable'] = None
+            return result
+        
+        lo, hi = adaptive_test.profile_bounds(code_totals, items, ADAPTIVE_TEST_ANSWER_SPREAD)
+        engine = PredictionsService.get_model().engine
+        # Escala 1-5 -> 1-7 del modelo (monótona: la caja se transforma en caja)
+        stability = adaptive_test.top_k_stability(
+            engine.unit_matrix, lo * 1.5 - 0.5, hi * 1.5 - 0.5, k=ADAPTIVE_TEST_TOP_K
+        )
+        
+        result.update({
+            'stop': stability['stable'] and answered >= ADAPTIVE_TEST_MIN_ANSWERS,
+            'stable': stability['stable'],
+            'order_stable': stability['order_stable'],
+            'top_occupations': [
+                {'id': int(engine.ids[idx]), 'name': engine.names[idx]} for idx in stability['top']
+            ]
+        })
+        if result['stop']:
+            logger.info(f"Test adaptativo: top {ADAPTIVE_TEST_TOP_K} estable para usuario {usuario_id} "
+                        f"con {answered}/{result['total']} respuestas")
+        return result
+
+    @staticmethod
+    def get_user_riasec_profiles(usuario_ids: list) -> dict:
+        """
+        Obtiene los perfiles RIASEC de varios usuarios desde el perfil materializado
+        por bloque de queries.PROFILE_BATCH_SIZE IDs, todo sobre una sola conexión.
+        Los bloques se rellenan con NULL para que el texto SQL sea siempre el
+        mismo y Oracle reutilice el statement cacheado.
+        
+        Args:
+            usuario_ids: lista de IDs de usuario
             
-            # Preparar matriz de vectores de ocupaciones
-            occupation_vectors = np.array([occ['vector'] for occ in occupations])
+        Returns:
+            dict {usuario_id: {nombre de categoría: promedio}} (solo usuarios con respuestas)
+        """
+        try:
+            profiles = {}
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    for start in range(0, len(usuario_ids), queries.PROFILE_BATCH_SIZE):
+                        chunk = list(usuario_ids[start:start + queries.PROFILE_BATCH_SIZE])
+                        chunk += [None] * (queries.PROFILE_BATCH_SIZE - len(chunk))
+                        params = {f'u{i}': uid for i, uid in enumerate(chunk)}
+                        
+                        queries.USER_PROFILES_BATCH.execute(cursor, params)
+                        for row in cursor.fetchall():
+                            profiles.setdefault(row[0], {})[row[1]] = row[2] / row[3]
             
-            # Calcular cosine similarity
-            similarities = cosine_similarity(
-                user_vector.reshape(1, -1),
-                occupation_vectors
-            )[0]
+            logger.info(f"Perfiles RIASEC obtenidos: {len(profiles)}/{len(usuario_ids)} usuarios")
+            return profiles
             
-            # Encontrar el top 5 de ocupaciones
-            top_5_indices = np.argsort(similarities)[-5:][::-1]  # Top 5 en orden descendente
+        except Exception as e:
+            logger.error(f"Error obteniendo perfiles RIASEC en lote: {str(e)}")
+            raise DatabaseError(f"Error obteniendo perfiles RIASEC: {str(e)}")
+
+    @staticmethod
+    def predict_careers_batch(usuario_ids: list) -> dict:
+        """
+        Predice carreras para varios usuarios en una sola pasada:
+        una query al perfil materializado, un producto matriz-matriz contra el
+        modelo (solo para perfiles que no están en el cache de resultados) y
+        las carreras peruanas salen del índice en memoria.
+        
+        Args:
+            usuario_ids: lista de IDs de usuario (sin duplicados)
             
-            top_occupations = []
-            for idx in top_5_indices:
-                occ = occupations[idx]
-                top_occupations.append({
-                    'id': occ['id'],
-                    'name': occ['name'],
-                    'similarity': float(similarities[idx]),
-                    'carreras': occ['carreras']
-                })
+        Returns:
+            dict con 'results' (una predicción por usuario con respuestas)
+            y 'missing' (usuarios sin respuestas guardadas)
+        """
+        try:
+            profiles = PredictionsService.get_user_riasec_profiles(usuario_ids)
+            found_ids = [uid for uid in usuario_ids if uid in profiles]
+            missing_ids = [uid for uid in usuario_ids if uid not in profiles]
             
-            # Obtener carreras peruanas matcheadas para el top 5
-            top_ids = [occ['id'] for occ in top_occupations]
-            carreras_peru = PredictionsService.get_matched_careers_peru(top_ids)
+            model = PredictionsService.get_model()
+            engine = model.engine
+            model_version = model.version
             
-            # Agregar carreras peruanas a cada ocupación del top 5
-            for occ in top_occupations:
-                occ['carreras_peru'] = carreras_peru.get(occ['id'], [])
+            code_profiles = [
+                PredictionsService._to_code_profile(profiles[uid]) for uid in found_ids
+            ]
+            rules = [PredictionsService._scoring_rule(uid) for uid in found_ids]
+            cache_keys = [
+                prediction_cache.make_key(code_profile, f"{model_version}|{rule.key}")
+                for code_profile, rule in zip(code_profiles, rules)
+            ]
+            ranked = [prediction_cache.get(key) for key in cache_keys]
             
-            # La mejor ocupación es la primera del top 5
-            best_occupation = top_occupations[0]
+            # Calcular solo los perfiles distintos que no estaban en cache,
+            # agrupados por regla de puntaje (una pasada por grupo A/B)
+            pending = {}
+            for row, key in enumerate(cache_keys):
+                if ranked[row] is None:
+                    pending.setdefault(rules[row].name, {}).setdefault(key, []).append(row)
             
-            # Crear perfil escalado a 1-7 para mostrar en frontend
-            riasec_profile_scaled = {
-                cat: float((riasec_code_profile.get(cat, 3) * 1.5 - 0.5))
-                for cat in riasec_order
-            }
+            for rule_name, rule_pending in pending.items():
+                rule = _scoring_rules[rule_name]
+                pending_keys = list(rule_pending)
+                user_matrix = np.array([
+                    PredictionsService._to_user_vector(code_profiles[rule_pending[key][0]])
+                    for key in pending_keys
+                ])
+                top_indices, top_scores, metrics = PredictionsService._top_k(model, user_matrix, rule)
+                
+                # Carreras peruanas de todas las ocupaciones del lote desde el índice en memoria
+                unique_ids = [int(occ_id) for occ_id in np.unique(engine.ids[top_indices])]
+                carreras_peru = model.match_index.careers_for_many(unique_ids)
+                
+                for i, key in enumerate(pending_keys):
+                    ranking = PredictionsService._rank_occupations(
+                        model, top_indices[i], top_scores[i],
+                        {metric: values[i] for metric, values in metrics.items()}, carreras_peru
+                    )
+                    prediction_cache.put(key, ranking)
+                    for row in rule_pending[key]:
+                        ranked[row] = ranking
             
-            logger.info(f"Top 5 ocupaciones predichas:")
-            for i, occ in enumerate(top_occupations, 1):
-                logger.info(f"  {i}. {occ['name']} ({occ['similarity']:.4f})")
+            results = []
+            for row, uid in enumerate(found_ids):
+                prediction = PredictionsService._build_prediction(
+                    ranked[row], code_profiles[row], model_version, rules[row]
+                )
+                prediction.pop('success')
+                prediction.pop('model_version')
+                prediction['usuario_id'] = uid
+                results.append(prediction)
             
+            computed = sum(len(rule_pending) for rule_pending in pending.values())
+            logger.info(f"Predicción en lote: {len(results)} usuarios "
+                        f"({computed} perfiles calculados), {len(missing_ids)} sin respuestas")
             return {
                 'success': True,
-                'occupation': {
-                    'id': best_occupation['id'],
-                    'name': best_occupation['name'],
-                    'similarity': best_occupation['similarity']
-                },
-                'suggested_careers': best_occupation['carreras'],
-                'suggested_careers_peru': best_occupation['carreras_peru'],
-                'top_occupations': top_occupations,
-                'user_profile': riasec_code_profile,
-                'user_profile_scaled': riasec_profile_scaled
+                'model_version': model_version,
+                'total': len(results),
+                'results': results,
+                'missing': missing_ids
             }
             
         except DatabaseError as e:
-            logger.error(f"Error en predicción: {str(e)}")
+            logger.error(f"Error en predicción en lote: {str(e)}")
             return {
                 'success': False,
                 'message': str(e)
             }
 
+    @staticmethod
+    def predict_what_if(base_profile: dict, perturbations=None, grid=None) -> dict:
+        """
+        Simulación what-if: top-k del perfil base y de cada variante
+        (perturbaciones o grilla, ver services.what_if.build_variants) con un
+        solo producto matriz-matriz contra el modelo, sin consultas a la BD.
+        
+        Args:
+            base_profile: perfil {sigla: puntaje 1-5}
+            perturbations: lista de cambios relativos [{'S': 1}, ...]
+            grid: valores absolutos por dimensión {'S': [1, 2, 3, 4, 5]}
+            
+        Returns:
+            dict con 'base' (top-k del perfil base) y 'variants': por variante,
+            su top-k con la posición que tenía cada ocupación en el base
+            (base_rank), las que entran (entered) y las que salen del top-k
+            con su nueva posición (left)
+            
+        Raises:
+            ValidationError: si las variantes no son válidas
+        """
+        variants = what_if.build_variants(base_profile, perturbations, grid,
+                                          max_variants=WHAT_IF_MAX_VARIANTS)
+        
+        model = PredictionsService.get_model()
+        engine = model.engine
+        
+        # Fila 0: perfil base; filas 1..n: variantes
+        user_matrix = np.array([
+            PredictionsService._to_user_vector(profile)
+            for profile in [base_profile] + [variant['profile'] for variant in variants]
+        ])
+        # Puntaje de la regla principal (PREDICTION_SCORING) contra todo el modelo
+        rule = PredictionsService._scoring_rule()
+        scores = model.scorer.scores_batch(user_matrix, rule)
+        top_indices = engine.select_top_k(scores, TOP_K)
+        top_scores = np.take_along_axis(scores, top_indices, axis=-1)
+        
+        base_top = top_indices[0]
+        base_position = {int(idx): rank for rank, idx in enumerate(base_top, 1)}
+        # Posición de las ocupaciones del top base en cada variante
+        base_ranks = what_if.ranks_of(scores, base_top)
+        
+        def _occupation(idx, score) -> dict:
+            return {
+                'id': int(engine.ids[idx]),
+                'name': engine.names[idx],
+                'score': float(score)
+            }
+        
+        results = []
+        for row, variant in enumerate(variants, 1):
+            top = []
+            for idx, score in zip(top_indices[row], top_scores[row]):
+                occupation = _occupation(idx, score)
+                occupation['base_rank'] = base_position.get(int(idx))
+                top.append(occupation)
+            
+            in_top = set(int(idx) for idx in top_indices[row])
+            left = [
+                {'id': int(engine.ids[idx]), 'name': engine.names[idx], 'rank': int(rank)}
+                for idx, rank in zip(base_top, base_ranks[row]) if int(idx) not in in_top
+            ]
+            results.append({
+                'changes': variant['changes'],
+                'profile': variant['profile'],
+                'top_occupations': top,
+                'entered': [occ['id'] for occ in top if occ['base_rank'] is None],
+                'left': left,
+                'changed': not np.array_equal(top_indices[row], base_top)
+            })
+        
+        logger.info(f"Simulación what-if: {len(variants)} variantes sobre {engine.size} ocupaciones")
+        return {
+            'success': True,
+            'model_version': model.version,
+            'scoring': rule.to_dict(),
+            'base': {
+                'profile': base_profile,
+                'top_occupations': [
+                    _occupation(idx, score)
+                    for idx, score in zip(base_top, top_scores[0])
+                ]
+            },
+            'total': len(results),
+            'variants': results
+        }
+
+    @staticmethod
+    def get_occupation_catalog() -> OccupationCatalog:
+        """
+        Catálogo de ocupaciones del snapshot vigente (mismas listas ya
+        parseadas que usa el motor). Se arma una vez por versión del modelo,
+        junto con el cuerpo JSON y el ETag de /api/occupations.
+        """
+        engine = PredictionsService.get_model().engine
+        cached = PredictionsService._catalog
+        if cached is None or cached[0] is not engine:
+            cached = (engine, OccupationCatalog.from_engine(engine))
+            PredictionsService._catalog = cached
+        return cached[1]
+
     @staticmethod
     def get_all_occupations() -> list:
         """
         Obtiene todas las ocupaciones con sus posibles carreras
-        desde la tabla MODELO_CONVERSIONES.
+        desde el catálogo de MODELO_CONVERSIONES en memoria.
         
         Returns:
             list de dicts con {id, ocupacion, posibles_carreras}
         """
-        try:
-            with OracleConnection() as conn:
-                with conn.cursor() as cursor:
-                    query = f"""
-                    SELECT 
-                        ID,
-                        OCUPACION,
-                        CAST(POSIBLES_CARRERAS AS VARCHAR2(4000)) as POSIBLES_CARRERAS
-                    FROM {ORACLE_SCHEMA}.MODELO_CONVERSIONES
-                    ORDER BY ID
-                    """
-                    
-                    cursor.execute(query)
-                    results = cursor.fetchall()
-                    
-                    occupations = []
-                    for row in results:
-                        carreras_data = row[2]
-                        carreras_list = []
-                        
-                        if carreras_data is not None:
-                            if hasattr(carreras_data, 'read'):
-                                carreras_str = carreras_data.read()
-                            else:
-                                carreras_str = str(carreras_data)
-                            
-                            if carreras_str.strip():
-                                try:
-                                    carreras_list = ast.literal_eval(carreras_str)
-                                    if not isinstance(carreras_list, list):
-                                        carreras_list = [carreras_list]
-                                except (ValueError, SyntaxError):
-                                    carreras_list = [carreras_str]
-                        
-                        occupations.append({
-                            'id': row[0],
-                            'ocupacion': row[1],
-                            'posibles_carreras': carreras_list
-                        })
-                    
-                    return occupations
-                    
-        except Exception as e:
-            logger.error(f"Error obteniendo ocupaciones: {str(e)}")
-            raise DatabaseError(f"Error obteniendo ocupaciones: {str(e)}")
+        return PredictionsService.get_occupation_catalog().to_dicts()
+
+
+# Snapshot del modelo (bundle o Oracle) y catálogo de /api/occupations
+register_warmup('PredictionsService.get_occupation_catalog', PredictionsService.get_occupation_catalog)
@@ -0,0 +1,86 @@
+"""
+Cache de datos de referencia con refresco por TTL y servicio de datos viejos
+Reemplaza a lru_cache en las lecturas de carreras y afirmaciones:
+
+- Solo se cachean resultados exitosos (un error de BD ya no deja cacheada
+  una respuesta vacía hasta el próximo deploy).
+- Pasado REFERENCE_CACHE_TTL_SECONDS la entrada se vuelve a leer de la BD;
+  si la lectura falla (p.ej. circuito abierto, ver db/db_config.py) se sigue
+  sirviendo la última versión conocida y se reintenta en el próximo uso.
+- Sin versión conocida, se devuelve fallback(*args) o se propaga el error.
+- Con warmup=True la lectura sin argumentos se carga al iniciar cada worker
+  de gunicorn (ver services/warmup.py).
+"""
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from config import REFERENCE_CACHE_TTL_SECONDS
+from services.warmup import register_warmup
+
+logger = logging.getLogger(__name__)
+
+
+def reference_cache(maxsize: int = 128, fallback=None, ttl_seconds: int = REFERENCE_CACHE_TTL_SECONDS,
+                    warmup: bool = False):
+    """
+    Decorador de cache LRU para lecturas de referencia
+
+    Args:
+        maxsize: entradas (combinaciones de argumentos) retenidas
+        fallback: callable(*args, **kwargs) con la respuesta cuando la lectura
+                  falla y no hay versión cacheada (None = propagar el error)
+        ttl_seconds: antigüedad máxima antes de refrescar (0 = nunca)
+        warmup: precargar la llamada sin argumentos al iniciar cada worker
+
+    La función decorada expone cache_clear(), como lru_cache.
+    """
+    def decorator(func):
+        entries = OrderedDict()  # clave -> (valor, leído en)
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                entry = entries.get(key)
+                if entry is not None:
+                    entries.move_to_end(key)
+            if entry is not None and (ttl_seconds <= 0 or time.monotonic() - entry[1] < ttl_seconds):
+                return entry[0]
+
+            try:
+                value = func(*args, **kwargs)
+            except Exception as e:
+                if entry is not None:
+                    logger.warning(f"{func.__qualname__}: sirviendo datos de hace "
+                                   f"{time.monotonic() - entry[1]:.0f}s, la BD falló: {str(e)}")
+                    return entry[0]
+                logger.error(f"{func.__qualname__}: error sin datos en cache: {str(e)}")
+                if fallback is None:
+                    raise
+                return fallback(*args, **kwargs)
+
+            with lock:
+                entries[key] = (value, time.monotonic())
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        def warm():
+            wrapper()
+            if ((), ()) not in entries:
+                raise RuntimeError('sin datos en cache (se respondió el fallback)')
+
+        if warmup:
+            register_warmup(func.__qualname__, warm)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,172 @@
+"""
+Motor de similitud coseno sobre el modelo de ocupaciones
+Construye una sola vez la matriz float32 contigua con las normas de fila
+precalculadas, de modo que cada predicción cuesta un producto matriz-vector
+y un argpartition en lugar de reconstruir y renormalizar toda la matriz.
+"""
+import hashlib
+import json
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Orden de dimensiones RIASEC usado en MODELO_CONVERSIONES
+RIASEC_ORDER = ('R', 'I', 'A', 'S', 'E', 'C')
+
+
+class SimilarityEngine:
+    """
+    Matriz de ocupaciones pre-normalizada para consultas top-k por coseno
+
+    Atributos:
+        ids: np.ndarray con los IDs de MODELO_CONVERSIONES (mismo orden que la matriz)
+        names: tuple con el nombre de cada ocupación
+        carreras: tuple con las posibles carreras (USA) de cada ocupación
+        matrix: np.ndarray float32 (n, d) con los vectores originales
+        norms: np.ndarray float32 (n,) con la norma L2 de cada fila
+        unit_matrix: np.ndarray float32 (n, d) con las filas normalizadas
+        version: hash corto del contenido del modelo
+    """
+
+    def __init__(self, ids, names, carreras, matrix, norms=None, unit_matrix=None, version=None):
+        self.ids = np.asarray(ids)
+        self.names = tuple(names)
+        self.carreras = tuple(carreras)
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+        if norms is None:
+            norms = np.linalg.norm(self.matrix, axis=1)
+        self.norms = np.ascontiguousarray(norms, dtype=np.float32)
+
+        if unit_matrix is None:
+            # Filas con norma 0 quedan en 0 (mismo criterio que sklearn)
+            safe_norms = np.where(self.norms > 0, self.norms, 1.0).astype(np.float32)
+            unit_matrix = self.matrix / safe_norms[:, np.newaxis]
+        self.unit_matrix = np.ascontiguousarray(unit_matrix, dtype=np.float32)
+
+        self.version = version or self._compute_version()
+
+    @classmethod
+    def from_catalog(cls, catalog) -> 'SimilarityEngine':
+        """
+        Construye el motor desde el catálogo de ocupaciones (OccupationCatalog)
+        """
+        engine = cls(
+            ids=np.asarray(catalog.ids, dtype=np.int64),
+            names=catalog.names,
+            carreras=catalog.carreras,
+            matrix=catalog.matrix
+        )
+        logger.info(f"Motor de similitud construido: {engine.size} ocupaciones, versión {engine.version}")
+        return engine
+
+    @property
+    def size(self) -> int:
+        """Cantidad de ocupaciones en el modelo"""
+        return self.matrix.shape[0]
+
+    def _compute_version(self) -> str:
+        """
+        Hash corto del contenido (IDs, matriz, nombres y posibles carreras)
+        para identificar el modelo: cualquier cambio de datos da otra versión
+        (clave del cache de predicciones, ETag de /api/occupations y bundle)
+        """
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(self.ids).tobytes())
+        digest.update(self.matrix.tobytes())
+        digest.update(json.dumps([self.names, self.carreras], ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    @staticmethod
+    def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+        """Normaliza filas a norma 1 (filas en 0 quedan en 0)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def scores(self, user_vector) -> np.ndarray:
+        """
+        Similitud coseno del vector de usuario contra todas las ocupaciones
+
+        Returns:
+            np.ndarray float32 (n,) con la similitud de cada ocupación
+        """
+        return self.unit_matrix @ self._normalize_rows(user_vector)
+
+    def scores_batch(self, user_matrix) -> np.ndarray:
+        """
+        Similitud coseno de varios usuarios en un solo producto matriz-matriz
+
+        Args:
+            user_matrix: array (m, d) con un vector por usuario
+
+        Returns:
+            np.ndarray float32 (m, n)
+        """
+        return self._normalize_rows(user_matrix) @ self.unit_matrix.T
+
+    @staticmethod
+    def select_top_k(similarities: np.ndarray, k: int) -> np.ndarray:
+        """
+        Índices del top-k (orden descendente) usando argpartition
+        Funciona sobre un vector (n,) o una matriz (m, n) fila por fila
+        """
+        n = similarities.shape[-1]
+        k = min(k, n)
+        if k <= 0:
+            return np.empty(similarities.shape[:-1] + (0,), dtype=np.intp)
+
+        if k < n:
+            candidates = np.argpartition(-similarities, k - 1, axis=-1)[..., :k]
+        else:
+            candidates = np.broadcast_to(np.arange(n), similarities.shape).copy()
+
+        candidate_scores = np.take_along_axis(similarities, candidates, axis=-1)
+        order = np.argsort(-candidate_scores, axis=-1, kind='stable')
+        return np.take_along_axis(candidates, order, axis=-1)
+
+    def top_k(self, user_vector, k: int = 5) -> tuple:
+        """
+        Top-k ocupaciones más similares para un usuario
+
+        Returns:
+            tuple (indices, similarities) en orden descendente
+        """
+        similarities = self.scores(user_vector)
+        indices = self.select_top_k(similarities, k)
+        return indices, similarities[indices]
+
+    def top_k_batch(self, user_matrix, k: int = 5) -> tuple:
+        """
+        Top-k para varios usuarios a la vez
+
+        Returns:
+            tuple (indices (m, k), similarities (m, k))
+        """
+        similarities = self.scores_batch(user_matrix)
+        indices = self.select_top_k(similarities, k)
+        return indices, np.take_along_axis(similarities, indices, axis=-1)
+
+
+def recall_at_k(exact_indices, approx_indices) -> float:
+    """
+    Recall@k promedio de un top-k aproximado contra el top-k exacto
+
+    Args:
+        exact_indices: array (m, k) con el top-k exacto por consulta
+        approx_indices: array (m, k) con el top-k aproximado por consulta
+
+    Returns:
+        fracción promedio del top-k exacto recuperada (0-1)
+    """
+    exact_indices = np.atleast_2d(exact_indices)
+    approx_indices = np.atleast_2d(approx_indices)
+    if exact_indices.size == 0:
+        return 1.0
+
+    hits = [
+        len(np.intersect1d(exact, approx, assume_unique=True)) / len(exact)
+        for exact, approx in zip(exact_indices, approx_indices)
+    ]
+    return float(np.mean(hits))
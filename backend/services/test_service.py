@@ -4,8 +4,10 @@ Lógica de negocio para el test vocacional
 import json
 import logging
 from datetime import datetime
-from db.db_config import OracleConnection
-from config import ORACLE_SCHEMA
+from db import queries
+from db.db_config import get_connection
+from services.prediction_cache import prediction_cache
+from services.reference_cache import reference_cache
 from utils.errors import DatabaseError
 
 logger = logging.getLogger(__name__)
@@ -14,14 +16,104 @@ logger = logging.getLogger(__name__)
 class TestService:
     """Servicio para gestionar el test vocacional"""
     
+    @staticmethod
+    @reference_cache(maxsize=1, warmup=True)
+    def get_afirmacion_categories() -> dict:
+        """
+        Mapa afirmación -> categoría RIASEC (CATEGORY_NAME)
+        Cacheado: las afirmaciones del test son datos de referencia (con la BD
+        caída se sigue usando el último mapa leído)
+        
+        Returns:
+            dict {afirmacion_id: category_name}
+        """
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    queries.AFIRMACION_CATEGORIES.execute(cursor)
+                    return {row[0]: row[1] for row in cursor.fetchall()}
+        except Exception as e:
+            raise DatabaseError(f"Error obteniendo categorías de afirmaciones: {str(e)}")
+
+    @staticmethod
+    def _apply_answers(cursor, usuario_id: int, answers: list) -> dict:
+        """
+        Guarda respuestas y actualiza el perfil materializado en la transacción
+        abierta del cursor (el commit lo hace quien llama).
+        
+        Bloquea la fila del usuario (serializa escrituras concurrentes del mismo
+        usuario) y lee sus respuestas previas en un solo round trip, para sumar
+        al perfil solo la diferencia de cada respuesta.
+        
+        Args:
+            cursor: cursor de la conexión con la transacción en curso
+            usuario_id: ID del usuario
+            answers: Lista de dicts con 'afirmacion_id' y 'riasec_id'
+            
+        Returns:
+            dict {categoría: (suma, cantidad)} con el perfil completo del usuario
+            después de aplicar las respuestas (sin consultas adicionales)
+        """
+        categories = TestService.get_afirmacion_categories()
+        
+        queries.USER_ANSWERS_FOR_UPDATE.execute(cursor, {'usuario_id': usuario_id})
+        previous = {row[0]: row[1] for row in cursor.fetchall() if row[0] is not None}
+        
+        # La última respuesta a cada afirmación es la que queda guardada
+        latest = {}
+        for answer in answers:
+            latest[answer['afirmacion_id']] = answer['riasec_id']
+        
+        # Diferencias por categoría: respuestas nuevas suman valor y cantidad,
+        # respuestas modificadas solo la diferencia de valor
+        deltas = {}
+        for afirmacion_id, riasec_id in latest.items():
+            category = categories.get(afirmacion_id)
+            if category is None:
+                continue
+            delta = deltas.setdefault(category, [0, 0])
+            old_value = previous.get(afirmacion_id)
+            if old_value is None:
+                delta[0] += riasec_id
+                delta[1] += 1
+            else:
+                delta[0] += riasec_id - old_value
+        
+        queries.ANSWER_MERGE.executemany(cursor, [
+            {
+                'usuario_id': usuario_id,
+                'afirmacion_id': afirmacion_id,
+                'riasec_id': riasec_id
+            }
+            for afirmacion_id, riasec_id in latest.items()
+        ])
+        
+        profile_binds = [
+            {
+                'usuario_id': usuario_id,
+                'category_name': category,
+                'delta_suma': delta_suma,
+                'delta_cantidad': delta_cantidad
+            }
+            for category, (delta_suma, delta_cantidad) in deltas.items()
+            if delta_suma or delta_cantidad
+        ]
+        if profile_binds:
+            queries.PROFILE_MERGE.executemany(cursor, profile_binds)
+        
+        totals = {}
+        for afirmacion_id, riasec_id in {**previous, **latest}.items():
+            category = categories.get(afirmacion_id)
+            if category is not None:
+                suma, cantidad = totals.get(category, (0, 0))
+                totals[category] = (suma + riasec_id, cantidad + 1)
+        return totals
+    
     @staticmethod
     def get_afirmaciones():
-        with OracleConnection() as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(
-                    f"SELECT ID, AFIRMACION_DSC FROM {ORACLE_SCHEMA}.AFIRMACIONES ORDER BY ID"
-                )
-                rows = cursor.fetchall()
+                rows = queries.AFIRMACIONES.execute(cursor).fetchall()
                 result = tuple({
                     'id': row[0],
                     'text': row[1]
@@ -46,14 +138,15 @@ class TestService:
             DatabaseError: Si falla la BD
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute(
-                    f'INSERT INTO {ORACLE_SCHEMA}.test_results (name, email, result_career, scores) '
-                    'VALUES (:1, :2, :3, :4)',
-                    (name, email, career_name, json.dumps(scores))
-                )
+                queries.TEST_RESULT_INSERT.execute(cursor, {
+                    'name': name,
+                    'email': email,
+                    'result_career': career_name,
+                    'scores': json.dumps(scores)
+                })
                 
                 conn.commit()
                 cursor.close()
@@ -80,34 +173,21 @@ class TestService:
             DatabaseError: Si falla la BD
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Usar MERGE para hacer INSERT o UPDATE según corresponda
-                merge_sql = f"""
-                MERGE INTO {ORACLE_SCHEMA}.USUARIO_AFIRMACION_RPTA t
-                USING (SELECT :usuario_id as usuario_id, 
-                              :afirmacion_id as afirmacion_id,
-                              :riasec_id as riasec_id
-                       FROM dual) s
-                ON (t.usuario_id = s.usuario_id AND t.afirmacion_id = s.afirmacion_id)
-                WHEN MATCHED THEN
-                    UPDATE SET t.riasec_id = s.riasec_id,
-                               t.estampa = CURRENT_TIMESTAMP
-                WHEN NOT MATCHED THEN
-                    INSERT (usuario_id, afirmacion_id, riasec_id, estampa)
-                    VALUES (s.usuario_id, s.afirmacion_id, s.riasec_id, CURRENT_TIMESTAMP)
-                """
-                
-                cursor.execute(merge_sql, {
-                    'usuario_id': usuario_id,
+                # MERGE de la respuesta + perfil materializado en la misma transacción
+                TestService._apply_answers(cursor, usuario_id, [{
                     'afirmacion_id': afirmacion_id,
                     'riasec_id': riasec_id
-                })
+                }])
                 
                 conn.commit()
                 cursor.close()
                 
+                # El perfil RIASEC cambió: invalidar el perfil cacheado
+                prediction_cache.invalidate_user(usuario_id)
+                
                 logger.info(f"Respuesta guardada: usuario={usuario_id}, afirmacion={afirmacion_id}, riasec={riasec_id}")
                 return True
                 
@@ -116,7 +196,7 @@ class TestService:
             raise DatabaseError(f"Error guardando respuesta: {str(e)}")
     
     @staticmethod
-    def save_answers_batch(usuario_id: int, answers: list) -> bool:
+    def save_answers_batch(usuario_id: int, answers: list) -> dict:
         """
         Guarda múltiples respuestas en una transacción
         
@@ -126,47 +206,33 @@ class TestService:
                     Ej: [{'afirmacion_id': 1, 'riasec_id': 5}, ...]
             
         Returns:
-            True si se guardaron exitosamente
+            dict con 'success', 'saved' (respuestas recibidas) y 'totals':
+            {categoría: (suma, cantidad)} con el perfil completo del usuario
+            después de guardar (vacío si no respondió nada)
             
         Raises:
             DatabaseError: Si falla la BD
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # OPTIMIZADO: executemany envía el statement una sola vez
-                # y itera sobre los bind values, reduciendo round-trips a Oracle
-                merge_sql = f"""
-                MERGE INTO {ORACLE_SCHEMA}.USUARIO_AFIRMACION_RPTA t
-                USING (SELECT :usuario_id as usuario_id, 
-                              :afirmacion_id as afirmacion_id,
-                              :riasec_id as riasec_id
-                       FROM dual) s
-                ON (t.usuario_id = s.usuario_id AND t.afirmacion_id = s.afirmacion_id)
-                WHEN MATCHED THEN
-                    UPDATE SET t.riasec_id = s.riasec_id,
-                               t.estampa = CURRENT_TIMESTAMP
-                WHEN NOT MATCHED THEN
-                    INSERT (usuario_id, afirmacion_id, riasec_id, estampa)
-                    VALUES (s.usuario_id, s.afirmacion_id, s.riasec_id, CURRENT_TIMESTAMP)
-                """
-                
-                bind_values = [
-                    {
-                        'usuario_id': usuario_id,
-                        'afirmacion_id': answer['afirmacion_id'],
-                        'riasec_id': answer['riasec_id']
-                    }
-                    for answer in answers
-                ]
-                
-                cursor.executemany(merge_sql, bind_values)
+                # y itera sobre los bind values, reduciendo round-trips a Oracle.
+                # El perfil materializado se actualiza en la misma transacción.
+                totals = TestService._apply_answers(cursor, usuario_id, answers)
                 conn.commit()
                 cursor.close()
                 
+                # El perfil RIASEC cambió: invalidar el perfil cacheado
+                prediction_cache.invalidate_user(usuario_id)
+                
                 logger.info(f"Lote de {len(answers)} respuestas guardadas para usuario={usuario_id}")
-                return True
+                return {
+                    'success': True,
+                    'saved': len(answers),
+                    'totals': totals
+                }
                 
         except Exception as e:
             logger.error(f"Error guardando lote de respuestas: {str(e)}")
@@ -184,20 +250,10 @@ class TestService:
             - answers: dict con respuestas {question_id: riasec_id}
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Contar respuestas del usuario
-                    query = f"""
-                    SELECT 
-                        uar.AFIRMACION_ID,
-                        uar.RIASEC_ID
-                    FROM {ORACLE_SCHEMA}.USUARIO_AFIRMACION_RPTA uar
-                    WHERE uar.USUARIO_ID = :usuario_id
-                    ORDER BY uar.AFIRMACION_ID
-                    """
-                    
-                    cursor.execute(query, {'usuario_id': usuario_id})
-                    results = cursor.fetchall()
+                    results = queries.USER_ANSWERS.execute(cursor, {'usuario_id': usuario_id}).fetchall()
                     
                     total_questions = 42
                     answered = len(results)
@@ -205,7 +261,7 @@ class TestService:
                     # Mapear respuestas
                     answers = {}
                     for row in results:
-                        answers[str(row[0])] = int(row[1])
+                        answers[str(row[0])] = row[1]
                     
                     # Determinar estado
                     if answered == 0:
@@ -241,17 +297,17 @@ class TestService:
             bool indicando si fue exitoso
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    delete_query = f"""
-                    DELETE FROM {ORACLE_SCHEMA}.USUARIO_AFIRMACION_RPTA
-                    WHERE USUARIO_ID = :usuario_id
-                    """
-                    
-                    cursor.execute(delete_query, {'usuario_id': usuario_id})
+                    queries.USER_ANSWERS_DELETE.execute(cursor, {'usuario_id': usuario_id})
                     deleted_count = cursor.rowcount
+                    
+                    # El perfil materializado se borra en la misma transacción
+                    queries.USER_PROFILE_DELETE.execute(cursor, {'usuario_id': usuario_id})
                     conn.commit()
                     
+                    prediction_cache.invalidate_user(usuario_id)
+                    
                     logger.info(f"Se eliminaron {deleted_count} respuestas del usuario {usuario_id}")
                     
                     return True
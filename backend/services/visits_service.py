@@ -4,8 +4,8 @@ Almacena datos de visitantes basado en visitor_id (cookie UUID)
 """
 import logging
 from datetime import datetime
-from db.db_config import OracleConnection
-from config import ORACLE_SCHEMA
+from db import queries
+from db.db_config import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -29,34 +29,16 @@ class VisitsService:
             dict con {success: bool, message: str, visitor_data: dict}
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Primero, verificar si el visitante ya existe
-                    check_query = f"""
-                    SELECT CANTIDAD_VISITAS, ULTIMA_VISITA 
-                    FROM {ORACLE_SCHEMA}.VISITAS
-                    WHERE VISITOR_ID = :visitor_id
-                    """
-                    
-                    cursor.execute(check_query, {'visitor_id': visitor_id})
-                    existing = cursor.fetchone()
+                    existing = queries.VISIT_BY_VISITOR.execute(cursor, {'visitor_id': visitor_id}).fetchone()
                     
                     if existing:
                         # Actualizar visita existente
                         cantidad_visitas = existing[0] + 1
                         
-                        update_query = f"""
-                        UPDATE {ORACLE_SCHEMA}.VISITAS
-                        SET ULTIMA_VISITA = SYSDATE,
-                            CANTIDAD_VISITAS = :cantidad_visitas,
-                            PAGINA = :pagina,
-                            USER_AGENT = :user_agent,
-                            IP_ADDRESS = :ip_address,
-                            DEVICE_TYPE = :device_type
-                        WHERE VISITOR_ID = :visitor_id
-                        """
-                        
-                        cursor.execute(update_query, {
+                        queries.VISIT_UPDATE.execute(cursor, {
                             'visitor_id': visitor_id,
                             'cantidad_visitas': cantidad_visitas,
                             'pagina': page,
@@ -79,13 +61,7 @@ class VisitsService:
                         }
                     else:
                         # Crear nueva visita
-                        insert_query = f"""
-                        INSERT INTO {ORACLE_SCHEMA}.VISITAS 
-                        (VISITOR_ID, PAGINA, USER_AGENT, IP_ADDRESS, DEVICE_TYPE, PRIMERA_VISITA, ULTIMA_VISITA, CANTIDAD_VISITAS)
-                        VALUES (:visitor_id, :pagina, :user_agent, :ip_address, :device_type, SYSDATE, SYSDATE, 1)
-                        """
-                        
-                        cursor.execute(insert_query, {
+                        queries.VISIT_INSERT.execute(cursor, {
                             'visitor_id': visitor_id,
                             'pagina': page,
                             'user_agent': user_agent,
@@ -126,16 +102,9 @@ class VisitsService:
             dict con información del visitante o None
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    query = f"""
-                    SELECT VISITOR_ID, PRIMEIRA_VISITA, ULTIMA_VISITA, CANTIDAD_VISITAS, PAGINA, DEVICE_TYPE
-                    FROM {ORACLE_SCHEMA}.VISITAS
-                    WHERE VISITOR_ID = :visitor_id
-                    """
-                    
-                    cursor.execute(query, {'visitor_id': visitor_id})
-                    result = cursor.fetchone()
+                    result = queries.VISITOR_INFO.execute(cursor, {'visitor_id': visitor_id}).fetchone()
                     
                     if result:
                         return {
@@ -161,31 +130,20 @@ class VisitsService:
             dict con estadísticas de visitas
         """
         try:
-            with OracleConnection() as conn:
+            with get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Total de visitantes únicos
-                    cursor.execute(f"SELECT COUNT(DISTINCT VISITOR_ID) FROM {ORACLE_SCHEMA}.VISITAS")
-                    total_visitors = cursor.fetchone()[0]
+                    total_visitors = queries.VISITS_UNIQUE_VISITORS.execute(cursor).fetchone()[0]
                     
                     # Total de visitas registradas
-                    cursor.execute(f"SELECT SUM(CANTIDAD_VISITAS) FROM {ORACLE_SCHEMA}.VISITAS")
-                    total_visits = cursor.fetchone()[0] or 0
+                    total_visits = queries.VISITS_TOTAL.execute(cursor).fetchone()[0] or 0
                     
                     # Visitantes por dispositivo
-                    cursor.execute(f"""
-                    SELECT DEVICE_TYPE, COUNT(DISTINCT VISITOR_ID) as count
-                    FROM {ORACLE_SCHEMA}.VISITAS
-                    GROUP BY DEVICE_TYPE
-                    """)
+                    queries.VISITS_BY_DEVICE.execute(cursor)
                     devices = {row[0]: row[1] for row in cursor.fetchall()}
                     
                     # Páginas más visitadas
-                    cursor.execute(f"""
-                    SELECT PAGINA, COUNT(DISTINCT VISITOR_ID) as visitor_count, SUM(CANTIDAD_VISITAS) as total_visits
-                    FROM {ORACLE_SCHEMA}.VISITAS
-                    GROUP BY PAGINA
-                    ORDER BY visitor_count DESC
-                    """)
+                    queries.VISITS_BY_PAGE.execute(cursor)
                     top_pages = [
                         {'page': row[0], 'unique_visitors': row[1], 'total_visits': row[2]}
                         for row in cursor.fetchall()
@@ -0,0 +1,74 @@
+"""
+Calentamiento de cada worker antes de recibir tráfico
+Gunicorn lo ejecuta en post_fork (gunicorn.conf.py): un worker nuevo o
+reciclado (--max-requests) abre y verifica sus conexiones del pool y carga
+los caches de referencia registrados, en lugar de pagarlo el primer request.
+
+Registro: reference_cache(..., warmup=True) registra las lecturas sin
+argumentos; otros caches se registran con register_warmup(nombre, función).
+Cada tarea se mide por separado y un error no detiene a las demás (el
+request que la necesite volverá a intentarlo).
+"""
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Nombre -> callable sin argumentos, en orden de registro
+_TASKS = {}
+_last_report = None
+
+
+def register_warmup(name: str, func):
+    """Registra una carga a ejecutar al iniciar cada worker; devuelve func"""
+    _TASKS[name] = func
+    return func
+
+
+def warm_up_worker(notify=None) -> dict:
+    """
+    Abre las conexiones mínimas del pool y ejecuta las cargas registradas
+
+    Args:
+        notify: callable invocado tras cada tarea (worker.notify de gunicorn:
+                el arbiter no cuenta el warm-up completo contra --timeout)
+
+    Returns:
+        dict con pid, total_ms y tasks [{'name', 'ms', 'ok', 'error'?}]
+    """
+    global _last_report
+    from db.db_config import warm_pool
+
+    started = time.perf_counter()
+    tasks = []
+    for name, func in (('db.pool', warm_pool), *_TASKS.items()):
+        task_started = time.perf_counter()
+        task = {'name': name}
+        try:
+            func()
+            task['ok'] = True
+        except Exception as e:
+            task['ok'] = False
+            task['error'] = str(e)
+            logger.warning(f"Warm-up {name} falló: {str(e)}")
+        task['ms'] = round((time.perf_counter() - task_started) * 1000, 1)
+        tasks.append(task)
+        if notify is not None:
+            notify()
+
+    report = {
+        'pid': os.getpid(),
+        'total_ms': round((time.perf_counter() - started) * 1000, 1),
+        'tasks': tasks
+    }
+    _last_report = report
+    logger.info(f"🔥 Worker {report['pid']} listo en {report['total_ms']:.0f} ms ("
+                + ', '.join(f"{task['name']}={task['ms']:.0f}ms{'' if task['ok'] else ' ✗'}" for task in tasks)
+                + ")")
+    return report
+
+
+def last_warmup() -> dict:
+    """Reporte del último warm-up de este proceso (None si no se ejecutó)"""
+    return _last_report
@@ -0,0 +1,174 @@
+"""
+Simulación what-if del perfil RIASEC
+Arma variantes de un perfil base (perturbaciones puntuales o una grilla sobre
+una o dos dimensiones) y compara el top-k de cada variante contra el del
+perfil base. PredictionsService.predict_what_if evalúa todas las variantes
+con un solo producto matriz-matriz contra el modelo de ocupaciones.
+"""
+import itertools
+import math
+import numpy as np
+from services.similarity_engine import RIASEC_ORDER
+from utils.errors import ValidationError
+
+# Escala de los puntajes del perfil (promedio de respuestas 1-5)
+SCORE_MIN = 1.0
+SCORE_MAX = 5.0
+
+# Dimensiones que puede recorrer una grilla
+MAX_GRID_DIMENSIONS = 2
+# Valores por dimensión de la grilla (además del tope de variantes de quien llama)
+MAX_GRID_AXIS_VALUES = 1000
+
+
+def _to_number(value, field: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValidationError(f"{field} debe ser numérico")
+    # El JSON de Python acepta NaN e Infinity
+    if not math.isfinite(value):
+        raise ValidationError(f"{field} debe ser un número finito")
+    return float(value)
+
+
+def _check_codes(values: dict, field: str) -> None:
+    unknown = [code for code in values if code not in RIASEC_ORDER]
+    if unknown:
+        raise ValidationError(f"{field}: dimensiones desconocidas {', '.join(map(str, unknown))} "
+                              f"(opciones: {', '.join(RIASEC_ORDER)})")
+
+
+def _clip(score: float) -> float:
+    return min(max(score, SCORE_MIN), SCORE_MAX)
+
+
+def parse_profile(raw) -> dict:
+    """
+    Valida un perfil {sigla RIASEC: puntaje 1-5} enviado por el cliente
+    (las dimensiones faltantes se asumen neutras, como en la predicción)
+
+    Raises:
+        ValidationError: si el perfil no es un dict válido
+    """
+    if not isinstance(raw, dict) or not raw:
+        raise ValidationError("El perfil debe ser un objeto {R, I, A, S, E, C} con puntajes 1-5")
+    _check_codes(raw, 'profile')
+
+    profile = {}
+    for code, value in raw.items():
+        score = _to_number(value, f'profile.{code}')
+        if not SCORE_MIN <= score <= SCORE_MAX:
+            raise ValidationError(f"profile.{code} debe estar entre {SCORE_MIN:g} y {SCORE_MAX:g}")
+        profile[code] = score
+    return profile
+
+
+def _grid_values(code: str, spec, limit: int = MAX_GRID_AXIS_VALUES) -> list:
+    """
+    Valores absolutos de una dimensión de la grilla (lista o {min, max, step})
+    Se rechaza antes de armar la lista si tendría más de `limit` valores.
+    """
+    too_many = f"grid.{code}: más de {limit} valores"
+    if isinstance(spec, list):
+        if len(spec) > limit:
+            raise ValidationError(too_many)
+        values = [_clip(_to_number(value, f'grid.{code}')) for value in spec]
+    elif isinstance(spec, dict):
+        low = _to_number(spec.get('min', SCORE_MIN), f'grid.{code}.min')
+        high = _to_number(spec.get('max', SCORE_MAX), f'grid.{code}.max')
+        step = _to_number(spec.get('step', 0.5), f'grid.{code}.step')
+        if step <= 0 or high < low:
+            raise ValidationError(f"grid.{code}: se requiere min <= max y step > 0")
+        span = (high - low) / step
+        if span + 1 > limit:
+            raise ValidationError(too_many)
+        # Redondeo para que 1 + 0.1 * n no acumule error de punto flotante
+        count = int(np.floor(span + 1e-9)) + 1
+        values = [_clip(round(low + step * i, 6)) for i in range(count)]
+    else:
+        raise ValidationError(f"grid.{code} debe ser una lista de puntajes o {{min, max, step}}")
+
+    if not values:
+        raise ValidationError(f"grid.{code} no tiene valores")
+    return list(dict.fromkeys(values))
+
+
+def build_variants(base_profile: dict, perturbations=None, grid=None, max_variants: int = None) -> list:
+    """
+    Variantes del perfil base
+
+    Args:
+        base_profile: perfil {sigla: puntaje 1-5}
+        perturbations: lista de cambios relativos [{'S': 1}, {'A': -0.5, 'E': 0.5}, ...]
+        grid: valores absolutos por dimensión (máximo dos), p.ej.
+              {'S': [1, 2, 3, 4, 5]} o {'S': {'min': 1, 'max': 5, 'step': 0.5}, 'A': [2, 4]}
+        max_variants: tope de variantes (producto cartesiano de la grilla + perturbaciones)
+
+    Returns:
+        list de dicts {'changes': {...}, 'profile': {...}}; en perturbaciones
+        'changes' son deltas y en la grilla, valores absolutos. Los puntajes
+        resultantes se recortan a la escala 1-5.
+
+    Raises:
+        ValidationError: si las variantes no son válidas o superan max_variants
+    """
+    if perturbations is None and grid is None:
+        raise ValidationError("Se requiere 'perturbations' o 'grid'")
+
+    variants = []
+
+    if perturbations is not None:
+        if not isinstance(perturbations, list):
+            raise ValidationError("'perturbations' debe ser una lista de objetos {dimensión: delta}")
+        for position, deltas in enumerate(perturbations):
+            if not isinstance(deltas, dict) or not deltas:
+                raise ValidationError(f"perturbations[{position}] debe ser un objeto {{dimensión: delta}}")
+            _check_codes(deltas, f'perturbations[{position}]')
+            changes = {code: _to_number(delta, f'perturbations[{position}].{code}')
+                       for code, delta in deltas.items()}
+            profile = dict(base_profile)
+            for code, delta in changes.items():
+                profile[code] = _clip(base_profile.get(code, 3) + delta)
+            variants.append({'changes': changes, 'profile': profile})
+
+    if grid is not None:
+        if not isinstance(grid, dict) or not grid:
+            raise ValidationError("'grid' debe ser un objeto {dimensión: valores}")
+        if len(grid) > MAX_GRID_DIMENSIONS:
+            raise ValidationError(f"La grilla admite hasta {MAX_GRID_DIMENSIONS} dimensiones")
+        _check_codes(grid, 'grid')
+
+        codes = list(grid)
+        # Ningún eje puede superar por sí solo las variantes que quedan
+        limit = MAX_GRID_AXIS_VALUES
+        if max_variants is not None:
+            limit = min(limit, max(max_variants - len(variants), 0))
+        axes = [_grid_values(code, grid[code], limit) for code in codes]
+        total = int(np.prod([len(axis) for axis in axes]))
+        if max_variants is not None and len(variants) + total > max_variants:
+            raise ValidationError(f"Máximo {max_variants} variantes por simulación")
+
+        for values in itertools.product(*axes):
+            changes = dict(zip(codes, values))
+            variants.append({'changes': changes, 'profile': {**base_profile, **changes}})
+
+    if max_variants is not None and len(variants) > max_variants:
+        raise ValidationError(f"Máximo {max_variants} variantes por simulación")
+    return variants
+
+
+def ranks_of(similarities: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """
+    Posición (1 = mejor) de las ocupaciones `columns` en cada fila de similitudes
+
+    Args:
+        similarities: np.ndarray (n, m) con una fila por variante
+        columns: índices (k,) de las ocupaciones a ubicar
+
+    Returns:
+        np.ndarray int (n, k)
+    """
+    ranks = np.empty((similarities.shape[0], len(columns)), dtype=np.int64)
+    for j, column in enumerate(columns):
+        # Una columna a la vez: memoria (n, m) en lugar de (n, k, m)
+        ranks[:, j] = (similarities > similarities[:, column:column + 1]).sum(axis=1) + 1
+    return ranks
@@ -0,0 +1,72 @@
+"""
+Configuración común de los tests: backend SQLite en un archivo temporal
+(DB_BACKEND=sqlite), así no se necesita Oracle para correrlos.
+
+    cd backend && python -m pytest -q tests
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# config.py lee el entorno al importarse: definirlo antes que cualquier módulo del backend
+_tmp_dir = tempfile.mkdtemp(prefix='vocational_test_')
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['DATABASE_PATH'] = str(Path(_tmp_dir) / 'vocational_test.db')
+os.environ['MODEL_BUNDLE_DIR'] = str(Path(_tmp_dir) / 'model_bundle')
+os.environ['DB_REQUEST_SCOPE'] = 'true'
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Nombres reales de CATEGORIAS_RIASEC (los que conoce predictions_service.NAME_TO_CODE), en orden RIASEC
+CATEGORIES = ('Realista', 'Investigativo', 'Artístico', 'Social', 'Emprendedor', 'Convencional')
+AFIRMACIONES = 42
+
+# Tablas de datos de la aplicación que cada test deja vacías
+APP_TABLES = ('USUARIO', 'USUARIO_AFIRMACION_RPTA', 'USUARIO_PERFIL_RIASEC', 'VISITAS')
+
+
+def query_rows(sql: str, params=()) -> list:
+    """Lee con una conexión aparte: solo ve lo que quedó confirmado"""
+    conn = sqlite3.connect(os.environ['DATABASE_PATH'])
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope='session')
+def sqlite_db():
+    """Base SQLite con el esquema y las afirmaciones (7 por categoría RIASEC)"""
+    from db.sqlite_backend import SQLiteConnection
+    from services.test_service import TestService
+
+    with SQLiteConnection() as conn:
+        with conn.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO CATEGORIAS_RIASEC (ID, CATEGORY_NAME) VALUES (?, ?)",
+                list(enumerate(CATEGORIES, start=1))
+            )
+            cursor.executemany(
+                "INSERT INTO AFIRMACIONES (ID, AFIRMACION_DSC, FK_RIASEC) VALUES (?, ?, ?)",
+                [(i, f'Afirmación {i}', (i - 1) % len(CATEGORIES) + 1) for i in range(1, AFIRMACIONES + 1)]
+            )
+        conn.commit()
+    TestService.get_afirmacion_categories.cache_clear()
+    return os.environ['DATABASE_PATH']
+
+
+@pytest.fixture
+def db(sqlite_db):
+    """Base limpia para cada test"""
+    from db.sqlite_backend import SQLiteConnection
+
+    with SQLiteConnection() as conn:
+        with conn.cursor() as cursor:
+            for table in APP_TABLES:
+                cursor.execute(f"DELETE FROM {table}")
+        conn.commit()
+    return sqlite_db
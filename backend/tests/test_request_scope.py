@@ -0,0 +1,143 @@
+"""
+Unit of work por request (db/request_scope.py) sobre el backend SQLite
+"""
+import pytest
+
+pytest.importorskip('oracledb')  # db_config lo importa aunque DB_BACKEND=sqlite
+
+from flask import Flask, jsonify
+
+from conftest import query_rows
+from db import request_scope
+from db.db_config import get_connection
+from db.request_scope import init_request_scope
+from db.request_stats import init_request_stats
+
+INSERT_VISIT = "INSERT INTO VISITAS (VISITOR_ID, PAGINA, CANTIDAD_VISITAS) VALUES (:visitor_id, '/', 1)"
+
+
+def _insert_visit(conn, visitor_id: str) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute(INSERT_VISIT, {'visitor_id': visitor_id})
+
+
+def _visitors() -> list:
+    return [row[0] for row in query_rows("SELECT VISITOR_ID FROM VISITAS ORDER BY VISITOR_ID")]
+
+
+@pytest.fixture
+def app(db):
+    app = Flask(__name__)
+    app.testing = True
+    # Mismo orden que app.py
+    init_request_stats(app)
+    init_request_scope(app)
+    return app
+
+
+def test_service_commit_survives_later_failing_block(app):
+    @app.route('/partial')
+    def partial():
+        with get_connection() as conn:
+            _insert_visit(conn, 'a')
+            conn.commit()
+        try:
+            with get_connection() as conn:
+                _insert_visit(conn, 'b')
+                raise RuntimeError('falla del segundo servicio')
+        except RuntimeError:
+            pass
+        return jsonify({'success': True})
+
+    response = app.test_client().get('/partial')
+
+    assert response.status_code == 200
+    assert _visitors() == ['a']
+
+
+def test_failed_request_commit_returns_500(app):
+    # Clave foránea diferida: la violación recién se detecta en el COMMIT del final del request
+    query_rows("CREATE TABLE IF NOT EXISTS T_PADRE (ID INTEGER PRIMARY KEY)")
+    query_rows("""
+        CREATE TABLE IF NOT EXISTS T_HIJO (
+            ID INTEGER PRIMARY KEY,
+            PADRE_ID INTEGER REFERENCES T_PADRE (ID) DEFERRABLE INITIALLY DEFERRED
+        )
+    """)
+
+    @app.route('/orphan')
+    def orphan():
+        with get_connection() as conn:
+            _insert_visit(conn, 'a')
+            with conn.cursor() as cursor:
+                cursor.execute("INSERT INTO T_HIJO (ID, PADRE_ID) VALUES (1, 99)")
+            conn.commit()
+        return jsonify({'success': True})
+
+    response = app.test_client().get('/orphan')
+
+    assert response.status_code == 500
+    assert response.get_json() == {'success': False, 'message': 'Error guardando los cambios'}
+    assert _visitors() == []
+    assert query_rows("SELECT COUNT(*) FROM T_HIJO") == [(0,)]
+
+
+def test_nested_get_connection_shares_one_connection(app, monkeypatch):
+    opened = []
+    backend_connection = request_scope.backend_connection
+
+    def counting_backend_connection():
+        opened.append(1)
+        return backend_connection()
+
+    monkeypatch.setattr(request_scope, 'backend_connection', counting_backend_connection)
+
+    @app.route('/nested')
+    def nested():
+        with get_connection() as outer:
+            _insert_visit(outer, 'a')
+            with get_connection() as inner:
+                _insert_visit(inner, 'b')
+                inner.commit()
+            outer.commit()
+        with get_connection() as conn:
+            _insert_visit(conn, 'c')
+            conn.commit()
+        return jsonify({'success': True})
+
+    response = app.test_client().get('/nested')
+
+    assert response.status_code == 200
+    assert len(opened) == 1
+    assert _visitors() == ['a', 'b', 'c']
+
+
+def test_teardown_rolls_back_uncommitted_work(app):
+    @app.route('/uncommitted')
+    def uncommitted():
+        with get_connection() as conn:
+            _insert_visit(conn, 'a')
+            conn.commit()
+        with get_connection() as conn:
+            # Sin commit(): no debe quedar guardado
+            _insert_visit(conn, 'b')
+        return jsonify({'success': True})
+
+    response = app.test_client().get('/uncommitted')
+
+    assert response.status_code == 200
+    assert _visitors() == ['a']
+
+
+def test_teardown_rolls_back_when_view_raises(app):
+    @app.route('/boom')
+    def boom():
+        with get_connection() as conn:
+            _insert_visit(conn, 'a')
+            conn.commit()
+        raise RuntimeError('error no manejado')
+
+    with pytest.raises(RuntimeError):
+        app.test_client().get('/boom')
+
+    assert _visitors() == []
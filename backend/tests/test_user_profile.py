@@ -0,0 +1,105 @@
+"""
+Perfil RIASEC materializado (USUARIO_PERFIL_RIASEC) sobre el backend SQLite
+
+TestService lo mantiene por diferencias; debe coincidir siempre con el
+GROUP BY sobre las respuestas que usa la carga inicial de la migración
+(db/migrations/2026.10.16/001_crear_usuario_perfil_riasec.sql).
+"""
+import pytest
+
+pytest.importorskip('oracledb')  # db_config lo importa aunque DB_BACKEND=sqlite
+
+from conftest import AFIRMACIONES, CATEGORIES, query_rows
+from db.sqlite_backend import SQLiteConnection
+from services.predictions_service import NAME_TO_CODE
+from services.test_service import TestService
+
+PROFILE_FROM_ANSWERS = """
+    SELECT uar.USUARIO_ID,
+           cr.CATEGORY_NAME,
+           SUM(uar.RIASEC_ID),
+           COUNT(*)
+    FROM USUARIO_AFIRMACION_RPTA uar
+    JOIN AFIRMACIONES af ON uar.AFIRMACION_ID = af.ID
+    JOIN CATEGORIAS_RIASEC cr ON af.FK_RIASEC = cr.ID
+    GROUP BY uar.USUARIO_ID, cr.CATEGORY_NAME
+    ORDER BY 1, 2
+"""
+
+MATERIALIZED_PROFILE = """
+    SELECT USUARIO_ID, CATEGORY_NAME, SUMA, CANTIDAD
+    FROM USUARIO_PERFIL_RIASEC
+    ORDER BY 1, 2
+"""
+
+
+@pytest.fixture
+def users(db):
+    """Usuarios 1 y 2: las respuestas previas se leen bloqueando su fila de USUARIO"""
+    with SQLiteConnection() as conn:
+        with conn.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO USUARIO (ID, NOMBRE, APELLIDO, CORREO, PASSWORD) VALUES (?, ?, ?, ?, ?)",
+                [(1, 'Ana', 'Pérez', 'ana@example.com', 'x'), (2, 'Luis', 'Rojas', 'luis@example.com', 'x')]
+            )
+        conn.commit()
+    return (1, 2)
+
+
+def _answers(values: dict) -> list:
+    return [{'afirmacion_id': afirmacion_id, 'riasec_id': riasec_id}
+            for afirmacion_id, riasec_id in values.items()]
+
+
+def _assert_profile_in_sync() -> None:
+    assert query_rows(MATERIALIZED_PROFILE) == query_rows(PROFILE_FROM_ANSWERS)
+
+
+def test_profile_follows_save_overwrite_and_reset(users):
+    # Respuestas parciales de dos usuarios
+    TestService.save_answers_batch(1, _answers({i: i % 5 + 1 for i in range(1, 20)}))
+    TestService.save_answers_batch(2, _answers({i: 3 for i in range(1, AFIRMACIONES + 1)}))
+    _assert_profile_in_sync()
+
+    # Respuestas nuevas mezcladas con modificadas
+    TestService.save_answers_batch(1, _answers({i: 5 - i % 5 for i in range(10, AFIRMACIONES + 1)}))
+    _assert_profile_in_sync()
+
+    # Respuesta individual: modificada y nueva
+    TestService.save_answer(2, 7, 1)
+    TestService.save_answer(1, 1, 4)
+    _assert_profile_in_sync()
+
+    # Reset del usuario 1: su perfil desaparece, el del usuario 2 no cambia
+    TestService.reset_user_answers(1)
+    _assert_profile_in_sync()
+    assert query_rows("SELECT COUNT(*) FROM USUARIO_PERFIL_RIASEC WHERE USUARIO_ID = 1") == [(0,)]
+
+    # Volver a responder después del reset
+    TestService.save_answers_batch(1, _answers({1: 2, 2: 2}))
+    _assert_profile_in_sync()
+
+
+def test_fixture_uses_the_real_category_names():
+    # Con otros nombres las predicciones tratarían esas categorías como neutras
+    assert set(CATEGORIES) == set(NAME_TO_CODE)
+
+
+def test_repeated_afirmacion_in_one_batch_counts_once(users):
+    answers = [
+        {'afirmacion_id': 1, 'riasec_id': 2},
+        {'afirmacion_id': 1, 'riasec_id': 5},
+        {'afirmacion_id': 7, 'riasec_id': 3},
+        {'afirmacion_id': 7, 'riasec_id': 1},
+    ]
+    saved = TestService.save_answers_batch(1, answers)
+    _assert_profile_in_sync()
+
+    # La última respuesta a cada afirmación es la que queda (1 y 7 son Realista)
+    assert query_rows(MATERIALIZED_PROFILE) == [(1, 'Realista', 6, 2)]
+    assert saved['totals'] == {'Realista': (6, 2)}
+
+    # Repetida otra vez, ahora sobre respuestas ya guardadas
+    TestService.save_answers_batch(1, answers[::-1])
+    _assert_profile_in_sync()
+    assert query_rows(MATERIALIZED_PROFILE) == [(1, 'Realista', 5, 2)]
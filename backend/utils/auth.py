@@ -0,0 +1,12 @@
+"""
+Helpers de autorización basados en la sesión de Flask
+"""
+from config import ADMIN_EMAILS
+
+
+def is_admin(usuario: dict) -> bool:
+    """Verificar si el usuario de la sesión es administrador (ADMIN_EMAILS)"""
+    if not usuario:
+        return False
+    correo = (usuario.get('correo') or '').strip().lower()
+    return bool(correo) and correo in ADMIN_EMAILS
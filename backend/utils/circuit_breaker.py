@@ -0,0 +1,112 @@
+"""
+Circuit breaker thread-safe (uno por proceso y dependencia)
+
+    closed     las llamadas pasan; se registra el resultado de las últimas
+               `window`. Con al menos `min_calls` y una tasa de fallas
+               >= failure_rate, se abre.
+    open       las llamadas fallan de inmediato (sin esperar a la
+               dependencia) durante open_seconds.
+    half_open  pasado ese tiempo, una sola llamada de prueba a la vez: si
+               funciona se cierra (ventana limpia), si falla vuelve a open.
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Breaker por tasa de fallas en una ventana de las últimas llamadas"""
+
+    def __init__(self, name: str, window: int, min_calls: int, failure_rate: float, open_seconds: float):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True = falla
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    def allow(self) -> bool:
+        """Si la llamada puede intentarse; en half_open reserva la prueba"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self._rejected += 1
+                    return False
+                self._state = HALF_OPEN
+            if self._probe_in_flight:
+                self._rejected += 1
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def retry_in(self) -> float:
+        """Segundos hasta la próxima llamada de prueba (0 si no está abierto)"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+            self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(True)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def release_probe(self) -> None:
+        """La llamada de prueba terminó sin veredicto (p.ej. no llegó a la dependencia)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._outcomes.clear()
+        self._times_opened += 1
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict con state, failure_rate y calls de la ventana actual,
+            times_opened, rejected y retry_in_seconds
+        """
+        with self._lock:
+            calls = len(self._outcomes)
+            failures = sum(self._outcomes)
+            state = self._state
+            retry_in = max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0) if state == OPEN else 0.0
+            return {
+                'state': state,
+                'calls': calls,
+                'failure_rate': round(failures / calls, 3) if calls else 0.0,
+                'times_opened': self._times_opened,
+                'rejected': self._rejected,
+                'retry_in_seconds': round(retry_in, 1)
+            }
@@ -12,6 +12,11 @@ class DatabaseError(VocationalTestError):
     pass
 
 
+class DatabaseUnavailableError(DatabaseError):
+    """Base de datos no disponible: circuito abierto, sin conexión libre o sin respuesta"""
+    pass
+
+
 class ValidationError(VocationalTestError):
     """Error de validación"""
     pass
@@ -0,0 +1,91 @@
+"""
+Métricas en memoria del proceso (histogramas y contadores thread-safe)
+Cada worker de gunicorn tiene las suyas: /api/metrics informa las del
+worker que atiende el request (campo 'pid').
+"""
+import bisect
+import threading
+
+# Límites superiores (ms) de los buckets de latencia
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """
+    Histograma de buckets fijos (límite superior inclusivo, más un bucket +Inf)
+
+    Los percentiles se estiman con el límite superior del bucket que contiene
+    la posición pedida (cota conservadora; el bucket +Inf usa el máximo visto).
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = None
+
+    def observe(self, value: float) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[position] += 1
+            self._count += 1
+            self._sum += value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def _percentile(self, counts: list, count: int, maximum: float, q: float):
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        for position, bucket_count in enumerate(counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if position == len(self.buckets):
+                    return maximum
+                return min(self.buckets[position], maximum)
+        return maximum
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict con count, sum, mean, max, p50/p95/p99 y buckets acumulados
+            [{'le': límite, 'count': observaciones <= límite}, ...]
+        """
+        with self._lock:
+            counts = list(self._counts)
+            count, total, maximum = self._count, self._sum, self._max
+
+        buckets, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+            cumulative += bucket_count
+            buckets.append({'le': bound, 'count': cumulative})
+
+        return {
+            'count': count,
+            'sum': round(total, 3),
+            'mean': round(total / count, 3) if count else None,
+            'max': maximum,
+            'p50': self._percentile(counts, count, maximum, 0.50),
+            'p95': self._percentile(counts, count, maximum, 0.95),
+            'p99': self._percentile(counts, count, maximum, 0.99),
+            'buckets': buckets
+        }
+
+
+class Counter:
+    """Contador entero thread-safe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
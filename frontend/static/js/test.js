@@ -32,6 +32,10 @@ const SKILLS_SCORE_LABELS = {
     5: "Creo que puedo hacer esto con facilidad"
 };
 
+// Test adaptativo (?adaptive=true): el backend indica cuándo el top de
+// ocupaciones ya no puede cambiar y el test termina antes
+const ADAPTIVE_MODE = new URLSearchParams(window.location.search).get('adaptive') === 'true';
+
 // Configuración de preguntas por test
 const RIASEC_QUESTIONS_PER_PAGE = 6;
 const SKILLS_QUESTIONS_PER_PAGE = 5;
@@ -399,7 +403,11 @@ function updateSliderLabel(questionId, value) {
 async function nextPage() {
     if (currentPage < TOTAL_PAGES) {
         // Autoguardar respuestas antes de cambiar página
-        await saveAnswersForCurrentPage();
+        const saved = await saveAnswersForCurrentPage();
+        if (shouldStopEarly(saved)) {
+            finishTest();
+            return;
+        }
         loadPage(currentPage + 1);
     }
 }
@@ -418,6 +426,7 @@ async function previousPage() {
 /**
  * Guarda las respuestas actuales al servidor
  * Se ejecuta automáticamente al cambiar de página o completar un test
+ * @returns {object|null} Respuesta del backend (incluye 'adaptive' en modo adaptativo)
  */
 async function saveAnswersForCurrentPage() {
     // Obtener respuestas según el test actual
@@ -435,7 +444,7 @@ async function saveAnswersForCurrentPage() {
     }));
     
     if (answersToSave.length === 0) {
-        return; // No hay respuestas para guardar
+        return null; // No hay respuestas para guardar
     }
     
     try {
@@ -447,7 +456,7 @@ async function saveAnswersForCurrentPage() {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ answers: answersToSave })
+            body: JSON.stringify({ answers: answersToSave, adaptive: ADAPTIVE_MODE })
         });
         
         const data = await response.json();
@@ -457,9 +466,23 @@ async function saveAnswersForCurrentPage() {
         } else {
             console.warn('⚠ Error al guardar respuestas:', data.message);
         }
+        return data;
     } catch (error) {
         console.error('Error guardando respuestas:', error);
+        return null;
+    }
+}
+
+/**
+ * En modo adaptativo, indica si el backend confirmó que el top de
+ * ocupaciones ya no cambia con las preguntas pendientes
+ */
+function shouldStopEarly(saved) {
+    if (!ADAPTIVE_MODE || !saved || !saved.adaptive || !saved.adaptive.stop) {
+        return false;
     }
+    console.log(`✓ Test adaptativo: resultado estable con ${saved.adaptive.answered}/${saved.adaptive.total} respuestas`);
+    return true;
 }
 
 
@@ -473,7 +496,11 @@ function updateProgressBar() {
  */
 async function proceedToNextTest() {
     // Guardar respuestas del RIASEC
-    await saveAnswersForCurrentPage();
+    const saved = await saveAnswersForCurrentPage();
+    if (shouldStopEarly(saved)) {
+        finishTest();
+        return;
+    }
     
     // Cambiar a prueba de Habilidades
     currentTest = TEST_STATES.SKILLS;
@@ -494,7 +521,14 @@ async function proceedToNextTest() {
 async function completeAllTests() {
     // Guardar respuestas finales
     await saveAnswersForCurrentPage();
-    
+    finishTest();
+}
+
+/**
+ * Calcula el perfil RIASEC y redirige a predicciones
+ * (al completar todas las pruebas o al cortar el test adaptativo)
+ */
+function finishTest() {
     console.log('✓ Todas las pruebas completadas');
     console.log('Respuestas RIASEC:', riasecAnswers);
     console.log('Respuestas Habilidades:', skillsAnswers);